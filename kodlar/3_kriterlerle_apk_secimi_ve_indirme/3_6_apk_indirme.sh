@@ -50,6 +50,24 @@ if [ ! -f "$OUTPUT_CSV" ]; then
     echo "SHA256,SIZE,PERMISSIONS_LIST,api_DEVICEID,api_EXEC,api_CIPHER,api_SMSMANAGER,api_DYN_LOAD,int_BOOT,LABEL" > "$OUTPUT_CSV"
 fi
 
+# Resume: işlenmiş SHA256'lar bir kez okunur (her satırda CSV'yi baştan grep'lemek yerine)
+declare -A DONE
+mapfile -t done_list < <(tail -n +2 "$OUTPUT_CSV" | cut -d, -f1)
+for sha in "${done_list[@]}"; do
+    [ -n "$sha" ] && DONE["$sha"]=1
+done
+unset done_list
+echo "Daha önce işlenmiş: ${#DONE[@]} APK"
+
+# Satırlar BATCH_SIZE'a ulaştıkça toplu eklenir
+BATCH_SIZE=20
+pending_rows=()
+flush_rows() {
+    [ ${#pending_rows[@]} -eq 0 ] && return
+    printf '%s\n' "${pending_rows[@]}" >> "$OUTPUT_CSV"
+    pending_rows=()
+}
+
 # --- FONKSİYON: İndir ve Analiz Et ---
 process_list() {
     input_file=$1
@@ -62,7 +80,8 @@ process_list() {
 
     echo "Başlıyor: $type_name Seti ($total_lines uygulama)"
 
-    tail -n +2 "$input_file" | while IFS=, read -r sha256 sha1 md5 date size pkg_name vercode vt_detect vt_date dex_size markets; do
+    # Süreç ikamesi: döngü alt kabukta çalışmaz, DONE ve pending_rows korunur
+    while IFS=, read -r sha256 sha1 md5 date size pkg_name vercode vt_detect vt_date dex_size markets; do
         ((current++))
         [ -z "$sha256" ] && continue
 
@@ -72,9 +91,7 @@ process_list() {
         echo -ne "[$current/$total_lines] İşleniyor: $sha256 ($type_name) \r"
 
         # Resume özelliği (Daha önce işlendiyse atla)
-        if grep -q "$sha256" "$OUTPUT_CSV"; then
-            continue
-        fi
+        [ -n "${DONE[$sha256]}" ] && continue
 
         # 1. İNDİRME (Disk üzerinde yoksa indir)
         if [ ! -f "$apk_path" ]; then
@@ -120,9 +137,12 @@ process_list() {
 
         # 3. KAYDETME
         # perm_list değişkenini CSV'ye ekliyoruz.
-        echo "$sha256,$f_size,$perm_list,$api_id,$api_exec,$api_cipher,$api_sms_mgr,$api_dyn,$int_boot,$label" >> "$OUTPUT_CSV"
+        pending_rows+=("$sha256,$f_size,$perm_list,$api_id,$api_exec,$api_cipher,$api_sms_mgr,$api_dyn,$int_boot,$label")
+        DONE["$sha256"]=1
+        [ ${#pending_rows[@]} -ge $BATCH_SIZE ] && flush_rows
 
-    done
+    done < <(tail -n +2 "$input_file")
+    flush_rows
     echo "" 
     echo "$type_name Seti Tamamlandı!"
 }
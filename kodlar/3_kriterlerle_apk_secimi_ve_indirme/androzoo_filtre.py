@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+import os
+import sys
+import json
+import time
+import argparse
+
+import pandas as pd             #pandas: parça parça (chunk) CSV okuma ve vektörel filtre
+import pyarrow as pa            #pyarrow: filtrelenmiş satırların Parquet önbelleği
+import pyarrow.parquet as pq
+
+# =========================
+# CONFIG
+# 3_2_sayac.sh (market sayımı) ve 3_3_1_apk_secici.sh (dengeli seçim) ile aynı kriterler
+# (3_1_*_secme_kriterleri.csv). latest.csv(.gz) tek geçişte okunur, filtreden geçen satırlar
+# Parquet önbelleğine yazılır; sayım ve örnekleme önbellekten yapılır.
+# =========================
+INPUT_FILE = "latest.csv.gz"
+CACHE_FILE = "latest_filtered.parquet"
+OUT_BENIGN = "balanced_benign.csv"
+OUT_MALWARE = "balanced_malware.csv"
+
+TARGET_DATE = "2022-01-01"                      #dex_date >= (metin karşılaştırması, awk ile aynı)
+MIN_APK_SIZE = 5242880                          #5 MB  < apk_size
+MAX_APK_SIZE = 209715200                        #200 MB >= apk_size
+MIN_DEX_SIZE = 1048576                          #1 MB  < dex_size
+MALWARE_MIN_VT = 4                              #vt_detection == 0 -> BENIGN, >= 4 -> MALWARE, 1-3 gri alan
+PLAY_MARKET = "play.google.com"
+PER_GROUP = 500                                 #Tür × (Play / diğer) başına seçilecek APK
+TOP_MARKETS = 20
+CHUNK_ROWS = 1_000_000
+
+COLUMNS = ["sha256", "sha1", "md5", "dex_date", "apk_size", "pkg_name", "vercode",
+           "vt_detection", "vt_scan_date", "dex_size", "markets"]
+QUOTED_COLUMNS = {"pkg_name"}                   #latest.csv’de pkg_name her zaman tırnaklıdır
+
+# =========================
+# FILTER
+# Sütunlar metin olarak okunur (çıktı satırları latest.csv’dekiyle birebir aynı kalır); yalnızca
+# filtrelenen sütunlar sayıya çevrilir. Tırnaklı alanlar CSV ayrıştırıcısıyla doğru bölünür
+# (awk -F, bunlarda sütun kaydırabiliyordu).
+# =========================
+def filter_params() -> dict:
+    return {"target_date": TARGET_DATE, "min_apk_size": MIN_APK_SIZE, "max_apk_size": MAX_APK_SIZE,
+            "min_dex_size": MIN_DEX_SIZE, "malware_min_vt": MALWARE_MIN_VT}
+
+
+def filter_chunk(chunk: pd.DataFrame) -> pd.DataFrame:
+    """Kriterlere uyan satırlar + type (BENIGN/MALWARE) ve is_play sütunları."""
+    apk_size = pd.to_numeric(chunk["apk_size"], errors="coerce")
+    dex_size = pd.to_numeric(chunk["dex_size"], errors="coerce")
+    vt = pd.to_numeric(chunk["vt_detection"], errors="coerce")
+
+    mask = ((chunk["sha256"] != "") & (chunk["pkg_name"] != "")
+            & (chunk["dex_date"] >= TARGET_DATE)
+            & (apk_size > MIN_APK_SIZE) & (apk_size <= MAX_APK_SIZE)
+            & (dex_size > MIN_DEX_SIZE)
+            & ((vt == 0) | (vt >= MALWARE_MIN_VT)))
+
+    selected = chunk[mask].copy()
+    selected["type"] = (vt[mask] == 0).map({True: "BENIGN", False: "MALWARE"})
+    selected["is_play"] = selected["markets"].str.contains(PLAY_MARKET, regex=False)
+    return selected
+
+
+def build_cache(input_file: str, cache_file: str, chunk_rows: int = CHUNK_ROWS) -> int:
+    """latest.csv(.gz)’yi tek geçişte filtreler ve Parquet önbelleğine yazar; okunan satır sayısını döner."""
+    source = os.stat(input_file)
+    metadata = {"source": os.path.abspath(input_file), "source_size": source.st_size,
+                "source_mtime": int(source.st_mtime), "filters": filter_params()}
+    tmp_path = f"{cache_file}.{os.getpid()}.tmp"
+    total = 0
+    writer = None
+    try:
+        reader = pd.read_csv(input_file, usecols=COLUMNS, dtype=str, keep_default_na=False,
+                             chunksize=chunk_rows, compression="infer")
+        for chunk in reader:
+            total += len(chunk)
+            table = pa.Table.from_pandas(filter_chunk(chunk)[COLUMNS + ["type", "is_play"]], preserve_index=False)
+            if writer is None:
+                schema = table.schema.with_metadata({b"androzoo_filtre": json.dumps(metadata).encode()})
+                writer = pq.ParquetWriter(tmp_path, schema, compression="zstd")
+            writer.write_table(table.cast(writer.schema))
+            print(f"[*] {total:,} satır okundu \r", end="", flush=True)
+        if writer is None:
+            raise ValueError(f"{input_file} boş")
+        writer.close()
+        writer = None
+        os.replace(tmp_path, cache_file)
+    finally:
+        if writer is not None:
+            writer.close()
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    print()
+    return total
+
+
+def cache_is_fresh(input_file: str, cache_file: str) -> bool:
+    """Önbellek aynı kaynak dosyadan (boyut + mtime) ve aynı eşiklerle mi üretilmiş?"""
+    try:
+        raw = pq.read_schema(cache_file).metadata or {}
+        metadata = json.loads(raw[b"androzoo_filtre"])
+    except (OSError, KeyError, ValueError, pa.ArrowInvalid):
+        return False
+    if metadata.get("filters") != filter_params():
+        return False
+    try:
+        source = os.stat(input_file)
+    except OSError:
+        return True                                 #Kaynak yoksa (ör. silinmiş 7 GB’lık dosya) önbellek kullanılır
+    return metadata.get("source_size") == source.st_size and metadata.get("source_mtime") == int(source.st_mtime)
+
+
+def load_filtered(input_file: str, cache_file: str, rebuild: bool = False, chunk_rows: int = CHUNK_ROWS) -> pd.DataFrame:
+    if rebuild or not cache_is_fresh(input_file, cache_file):
+        if not os.path.exists(input_file):
+            raise OSError(f"{input_file} bulunamadı ve geçerli önbellek yok")
+        start = time.time()
+        total = build_cache(input_file, cache_file, chunk_rows)
+        print(f"[✓] {total:,} satır filtrelendi ({time.time() - start:.1f} sn) -> {cache_file}")
+    else:
+        print(f"[*] Önbellek kullanılıyor: {cache_file}")
+    return pq.read_table(cache_file).to_pandas()
+
+# =========================
+# MARKET COUNTS (3_2_sayac.sh)
+# markets "play.google.com|anzhi" biçimindedir; her market ayrı sayılır.
+# =========================
+def market_counts(df: pd.DataFrame) -> pd.DataFrame:
+    markets = df[["type", "markets"]].assign(market=df["markets"].str.split("|")).explode("market")
+    markets = markets[markets["market"].notna() & (markets["market"] != "")]
+    table = markets.groupby(["market", "type"]).size().unstack(fill_value=0)
+    table = table.reindex(columns=["BENIGN", "MALWARE"], fill_value=0)
+    table.insert(0, "TOPLAM", table["BENIGN"] + table["MALWARE"])
+    return table.sort_values("TOPLAM", ascending=False)
+
+
+def print_market_counts(df: pd.DataFrame, top: int = TOP_MARKETS):
+    print("\n--- GENEL ÖZET ---")
+    print(f"Toplam Temiz (Benign)   : {(df['type'] == 'BENIGN').sum()}")
+    print(f"Toplam Zararlı (Malware): {(df['type'] == 'MALWARE').sum()}")
+    print("------------------------\n")
+    print(f"{'MARKET_ADI':<30} {'TOPLAM':<15} {'BENIGN':<15} {'MALWARE':<15}")
+    for market, row in market_counts(df).head(top).iterrows():
+        print(f"{market:<30} {row['TOPLAM']:<15d} {row['BENIGN']:<15d} {row['MALWARE']:<15d}")
+
+# =========================
+# BALANCED SAMPLES (3_3_1_apk_secici.sh)
+# Her tür için PER_GROUP Google Play + PER_GROUP diğer market; aday azsa hepsi alınır.
+# =========================
+def balanced_sample(df: pd.DataFrame, kind: str, per_group: int = PER_GROUP, seed: int = None) -> pd.DataFrame:
+    parts = []
+    for is_play, name in ((True, "Google Play"), (False, "Diğer Marketler")):
+        group = df[(df["type"] == kind) & (df["is_play"] == is_play)]
+        n = min(per_group, len(group))
+        if not len(group):
+            print(f"   UYARI: {kind.title()} ({name}) için hiç uygun aday bulunamadı!")
+            continue
+        print(f"   -> {kind.title()} ({name}): {len(group)} aday bulundu. {n} adet seçiliyor.")
+        parts.append(group.sample(n=n, random_state=seed))
+    return pd.concat(parts) if parts else df.iloc[0:0]
+
+
+def _csv_field(column: str, value: str) -> str:
+    if column in QUOTED_COLUMNS or any(c in value for c in ',"\n'):
+        return '"' + value.replace('"', '""') + '"'
+    return value
+
+
+def write_sample(df: pd.DataFrame, path: str):
+    """latest.csv ile aynı başlık ve alan biçimiyle yazar."""
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        f.write(",".join(COLUMNS) + "\n")
+        for row in df[COLUMNS].itertuples(index=False):
+            f.write(",".join(_csv_field(c, v) for c, v in zip(COLUMNS, row)) + "\n")
+
+# =========================
+# MAIN
+# =========================
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="AndroZoo latest.csv(.gz) filtreleme: market sayımı + dengeli seçim (tek geçiş, Parquet önbellekli)")
+    parser.add_argument("--input", default=INPUT_FILE, help="latest.csv veya latest.csv.gz")
+    parser.add_argument("--cache", default=CACHE_FILE, help="Filtrelenmiş satırların Parquet önbelleği")
+    parser.add_argument("--rebuild", action="store_true", help="Önbellek güncel olsa da kaynağı yeniden tara")
+    parser.add_argument("--chunk-rows", type=int, default=CHUNK_ROWS)
+    parser.add_argument("--counts-only", action="store_true", help="Yalnızca market sayımı (3_2_sayac.sh)")
+    parser.add_argument("--top", type=int, default=TOP_MARKETS, help="Gösterilecek market sayısı")
+    parser.add_argument("--per-group", type=int, default=PER_GROUP, help="Tür × (Play / diğer) başına APK")
+    parser.add_argument("--seed", type=int, default=None, help="Tekrarlanabilir seçim için rastgelelik tohumu")
+    parser.add_argument("--benign-out", default=OUT_BENIGN)
+    parser.add_argument("--malware-out", default=OUT_MALWARE)
+    args = parser.parse_args(argv)
+
+    print(f"Kriterler: Tarih >= {TARGET_DATE}, Boyut: 5-200MB, Dex > 1MB, Benign (0) / Malware (>={MALWARE_MIN_VT})")
+    try:
+        df = load_filtered(args.input, args.cache, args.rebuild, args.chunk_rows)
+    except (OSError, ValueError) as e:
+        print(f"[!] {e}")
+        sys.exit(1)
+
+    print_market_counts(df, args.top)
+    if args.counts_only:
+        return
+
+    print("\n----------------------------------------------------")
+    for kind, path in (("BENIGN", args.benign_out), ("MALWARE", args.malware_out)):
+        sample = balanced_sample(df, kind, args.per_group, args.seed)
+        write_sample(sample, path)
+        print(f"[✓] {path}: {len(sample)} satır")
+        if len(sample) < 2 * args.per_group:
+            print(f"!!! UYARI: Hedeflenen {2 * args.per_group} sayıya ulaşılamadı. Filtreler çok sıkı olabilir.")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,388 @@
+#!/usr/bin/env python3
+import os
+import sys
+import csv
+import time
+import hashlib
+import argparse
+import threading
+import http.client
+from urllib.parse import urlsplit, urlencode
+from concurrent.futures import ThreadPoolExecutor, as_completed   #İndirmeler G/Ç bekler: iş parçacığı havuzu yeterli
+
+# =========================
+# CONFIG
+# 3_6_apk_indirme.sh’nin indirme kısmının Python karşılığı. API anahtarı koda yazılmaz:
+# --api-key veya ANDROZOO_API_KEY ortam değişkeninden okunur.
+# =========================
+BASE_URL = "https://androzoo.uni.lu/api/download"
+API_KEY_ENV = "ANDROZOO_API_KEY"
+APK_STORAGE_DIR = "/run/media/yigit/DISK 1/apks_repo"
+ERROR_LOG = "errors.log"
+
+SELECTION_DIR = os.path.dirname(os.path.abspath(__file__))
+LISTS = [
+    os.path.join(SELECTION_DIR, "3_3_balanced_benign.csv"),
+    os.path.join(SELECTION_DIR, "3_3_balanced_malware.csv"),
+]
+
+WORKERS = 8                                     #Eşzamanlı indirme sayısı (AndroZoo anahtar başına eşzamanlılığı sınırlar)
+RATE = 2.0                                      #Saniyede başlatılan en fazla istek (yeniden denemeler dahil)
+BURST = 4                                       #Hız sınırlayıcının biriktirebileceği istek hakkı
+TIMEOUT = 60                                    #Soket zaman aşımı (sn); tüm indirme için değil, her okuma için
+RETRIES = 5                                     #Dosya başına deneme; .part korunur, sonraki deneme kaldığı yerden sürer
+BACKOFF = 2.0                                   #Yeniden deneme beklemesi: BACKOFF × 2^deneme (sn)
+THROTTLE_RETRIES = 20                           #429/503 deneme hakkı harcamaz; dosya başına üst sınır (sonsuz döngüye karşı)
+THROTTLE_FACTOR = 0.5                           #429/503’te istek hızı bu oranla düşürülür ...
+MIN_RATE_RATIO = 0.05                           #... ama RATE’in bu oranının altına inmez
+RECOVERY_FACTOR = 1.1                           #Her başarılı indirmede hız RATE’e doğru geri artar
+MAX_REDIRECTS = 5
+READ_CHUNK = 1 << 20                            #Akış okuma / hash parçası (1 MB)
+PART_SUFFIX = ".part"
+
+# =========================
+# RATE LIMITER
+# Token bucket: saniyede RATE hak birikir (en fazla BURST); her istek bir hak harcar.
+# 429 / 503 yanıtlarında Retry-After süresince tüm worker’lar bekletilir ve hız yarıya iner;
+# başarılı indirmelerle hız yavaşça ayarlanan değere geri döner.
+# =========================
+class RateLimiter:
+    def __init__(self, rate: float = RATE, burst: int = BURST):
+        self.rate = rate
+        self.max_rate = rate
+        self.burst = max(1, burst)
+        self.tokens = float(self.burst)
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                if self.rate > 0:
+                    self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                wait = self.paused_until - now      #rate <= 0 (sınırsız) olsa da Retry-After beklenir
+                if wait <= 0:
+                    if self.rate <= 0:
+                        return
+                    if self.tokens >= 1:
+                        self.tokens -= 1
+                        return
+                    wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+    def pause(self, seconds: float):
+        with self.lock:
+            self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+
+    def throttle(self, seconds: float):
+        """Sunucu yavaşlamamızı istedi: seconds kadar bekletir ve hızı düşürür."""
+        with self.lock:
+            self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+            if self.rate > 0:
+                self.rate = max(self.max_rate * MIN_RATE_RATIO, self.rate * THROTTLE_FACTOR)
+
+    def recover(self):
+        with self.lock:
+            if self.rate > 0:
+                self.rate = min(self.max_rate, self.rate * RECOVERY_FACTOR)
+
+
+class DownloadError(Exception):
+    def __init__(self, message: str, retry: bool = True):
+        super().__init__(message)
+        self.retry = retry                      #False: yeniden denemek sonucu değiştirmez (ör. 404, 401)
+
+
+class Throttled(DownloadError):
+    """429 / 503: deneme hakkı harcamadan, hız sınırlayıcı bekledikten sonra yeniden denenir."""
+
+# =========================
+# DOWNLOADER
+# Her worker iş parçacığı host başına tek bir HTTP/1.1 bağlantısını (keep-alive) yeniden kullanır.
+# Akış:
+#   1) <sha256>.apk varsa ve boyutu listedeki apk_size ile uyuşuyorsa atlanır (verify_existing ile
+#      ayrıca hash’lenir); boyut uyuşmuyorsa (eski curl’den kalan yarım dosya) .part’a çevrilir.
+#   2) .part varsa Range: bytes=<boyut>- ile kalan kısım istenir; sunucu 200 dönerse baştan yazılır.
+#   3) İndirilen baytlar yazılırken hash’lenir; SHA-256 listedeki sha256 ile aynıysa .part -> .apk.
+#      Uyuşmazsa .part silinir ve dosya baştan indirilir.
+# =========================
+class Downloader:
+    def __init__(self, api_key: str, out_dir: str = APK_STORAGE_DIR, base_url: str = BASE_URL,
+                 limiter: RateLimiter = None, timeout: float = TIMEOUT, retries: int = RETRIES,
+                 verify_existing: bool = False):
+        if not api_key:
+            raise ValueError(f"API anahtarı yok (--api-key veya {API_KEY_ENV})")
+        self.api_key = api_key
+        self.out_dir = out_dir
+        self.base_url = base_url
+        self.limiter = limiter or RateLimiter()
+        self.timeout = timeout
+        self.retries = max(1, retries)
+        self.verify_existing = verify_existing
+        self.local = threading.local()
+
+    # ---------- HTTP ----------
+    def _connection(self, scheme: str, netloc: str):
+        connections = getattr(self.local, "connections", None)
+        if connections is None:
+            connections = self.local.connections = {}
+        conn = connections.get((scheme, netloc))
+        if conn is None:
+            cls = http.client.HTTPSConnection if scheme == "https" else http.client.HTTPConnection
+            conn = connections[(scheme, netloc)] = cls(netloc, timeout=self.timeout)
+        return conn
+
+    def _drop_connection(self, scheme: str, netloc: str):
+        conn = getattr(self.local, "connections", {}).pop((scheme, netloc), None)
+        if conn is not None:
+            conn.close()
+
+    def close(self):
+        for conn in getattr(self.local, "connections", {}).values():
+            conn.close()
+        self.local.connections = {}
+
+    def url(self, sha256: str) -> str:
+        return f"{self.base_url}?{urlencode({'apikey': self.api_key, 'sha256': sha256})}"
+
+    def _request(self, url: str, offset: int):
+        """(yanıt, bağlantı anahtarı); yönlendirmeler izlenir, gövde okunmadan döner."""
+        for _ in range(MAX_REDIRECTS + 1):
+            parts = urlsplit(url)
+            key = (parts.scheme, parts.netloc)
+            target = parts.path + (f"?{parts.query}" if parts.query else "")
+            headers = {"Range": f"bytes={offset}-"} if offset else {}
+
+            self.limiter.acquire()
+            conn = self._connection(*key)
+            try:
+                conn.request("GET", target, headers=headers)
+                response = conn.getresponse()
+            except (http.client.HTTPException, OSError):
+                self._drop_connection(*key)     #Sunucu boşta bağlantıyı kapatmış olabilir: yeni bağlantıyla bir kez daha
+                conn = self._connection(*key)
+                conn.request("GET", target, headers=headers)
+                response = conn.getresponse()
+
+            if response.status in (301, 302, 303, 307, 308) and response.getheader("Location"):
+                location = response.getheader("Location")
+                response.read()
+                url = location if urlsplit(location).scheme else f"{parts.scheme}://{parts.netloc}{location}"
+                continue
+            return response, key
+        raise DownloadError("çok fazla yönlendirme")
+
+    # ---------- FILES ----------
+    def paths(self, sha256: str):
+        final_path = os.path.join(self.out_dir, f"{sha256}.apk")
+        return final_path, final_path + PART_SUFFIX
+
+    @staticmethod
+    def _hash_file(path: str, digest=None):
+        digest = digest or hashlib.sha256()
+        with open(path, "rb") as f:
+            while True:
+                chunk = f.read(READ_CHUNK)
+                if not chunk:
+                    break
+                digest.update(chunk)
+        return digest
+
+    def _existing(self, sha256: str, expected_size: int = None) -> bool:
+        """Tamamlanmış dosya geçerliyse True; geçersizse .part’a çevrilir (kaldığı yerden sürdürülür)."""
+        final_path, part_path = self.paths(sha256)
+        try:
+            size = os.path.getsize(final_path)
+        except OSError:
+            return False
+        if expected_size and size != expected_size:
+            ok = False
+        elif self.verify_existing or not expected_size:
+            ok = self._hash_file(final_path).hexdigest().lower() == sha256.lower()
+        else:
+            ok = True
+        if ok:
+            if os.path.exists(part_path):
+                os.remove(part_path)                #Tamamlanmış dosyanın yanında kalmış eski .part
+            return True
+        if expected_size and size < expected_size and not os.path.exists(part_path):
+            os.replace(final_path, part_path)
+        else:
+            os.remove(final_path)
+        return False
+
+    def _attempt(self, sha256: str, expected_size: int = None) -> int:
+        """Tek deneme; indirilen bayt sayısını döner, hata durumunda DownloadError/OSError fırlatır."""
+        final_path, part_path = self.paths(sha256)
+        offset = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+        if expected_size and offset > expected_size:
+            os.remove(part_path)
+            offset = 0
+        digest = self._hash_file(part_path) if offset else hashlib.sha256()
+
+        response, key = self._request(self.url(sha256), offset)
+        received = 0
+        try:
+            if response.status in (429, 503):
+                response.read()
+                retry_after = response.getheader("Retry-After", "")
+                self.limiter.throttle(float(retry_after) if retry_after.isdigit() else BACKOFF * 4)
+                raise Throttled(f"HTTP {response.status}")
+            if response.status == 416 and offset:
+                response.read()                     #.part zaten tam: yalnızca doğrulanır
+            elif response.status in (200, 206):
+                if response.status == 200 and offset:
+                    offset = 0                      #Sunucu Range desteklemedi
+                    digest = hashlib.sha256()
+                with open(part_path, "ab" if offset else "wb") as f:
+                    while True:
+                        chunk = response.read(READ_CHUNK)
+                        if not chunk:
+                            break
+                        f.write(chunk)
+                        digest.update(chunk)
+                        received += len(chunk)
+                    f.flush()
+                    os.fsync(f.fileno())
+                if response.length:                 #Content-Length’ten eksik geldiyse bağlantı kopmuştur
+                    self._drop_connection(*key)
+                    raise DownloadError("bağlantı yarıda kesildi")
+            else:
+                response.read()
+                raise DownloadError(f"HTTP {response.status}", retry=response.status >= 500 or response.status == 408)
+        except BaseException:
+            if not response.isclosed():         #Yanıt yarıda kaldı: bağlantı yeniden kullanılamaz
+                self._drop_connection(*key)
+            raise
+        if response.will_close:
+            self._drop_connection(*key)
+
+        if digest.hexdigest().lower() != sha256.lower():
+            os.remove(part_path)
+            raise DownloadError("SHA-256 uyuşmuyor")
+        os.replace(part_path, final_path)
+        return received
+
+    def fetch(self, sha256: str, expected_size: int = None):
+        """(durum, indirilen bayt, hata) — durum: "ok", "exists" veya "failed"."""
+        if self._existing(sha256, expected_size):
+            return "exists", 0, None
+        error = None
+        received = 0
+        attempt = throttled = 0
+        while attempt < self.retries:
+            try:
+                received += self._attempt(sha256, expected_size)
+                self.limiter.recover()
+                return "ok", received, None
+            except (DownloadError, http.client.HTTPException, OSError) as e:
+                error = str(e) or type(e).__name__
+                if isinstance(e, Throttled):
+                    throttled += 1
+                    if throttled >= THROTTLE_RETRIES:
+                        break
+                    continue                        #Bekleme limiter.acquire’da (Retry-After)
+                if isinstance(e, DownloadError) and not e.retry:
+                    break                           #AndroZoo’da yok / anahtar geçersiz
+                attempt += 1
+                if attempt < self.retries:
+                    time.sleep(BACKOFF * 2 ** (attempt - 1))
+        return "failed", received, error
+
+# =========================
+# LIST INPUT
+# =========================
+def read_list(list_file: str):
+    """(sha256, apk_size) satırları; apk_size okunamazsa None."""
+    rows = []
+    with open(list_file, newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            sha256 = (row.get("sha256") or "").strip()
+            if not sha256:
+                continue
+            try:
+                size = int(row.get("apk_size") or 0) or None
+            except ValueError:
+                size = None
+            rows.append((sha256, size))
+    return rows
+
+
+def download_all(downloader: Downloader, rows, workers: int = WORKERS):
+    """Tamamlanan her dosya için (sha256, yol, durum, bayt, hata) üretir (tamamlanma sırasıyla)."""
+    def task(sha256, size):
+        return downloader.fetch(sha256, size)
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(task, sha256, size): sha256 for sha256, size in rows}
+        try:
+            for future in as_completed(futures):
+                sha256 = futures[future]
+                status, received, error = future.result()
+                yield sha256, downloader.paths(sha256)[0], status, received, error
+        finally:
+            for future in futures:
+                future.cancel()
+
+
+def log_error(error_log: str, sha256: str, error: str):
+    with open(error_log, "a", encoding="utf-8") as f:
+        f.write(f"İndirme Başarısız: {sha256} ({error})\n")
+
+# =========================
+# MAIN
+# =========================
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="AndroZoo’dan eşzamanlı, kaldığı yerden devam eden ve SHA-256 doğrulamalı APK indirme")
+    parser.add_argument("lists", nargs="*", default=LISTS, help="sha256 (ve apk_size) sütunlu CSV listeleri")
+    parser.add_argument("--out-dir", default=APK_STORAGE_DIR, help="APK’lerin indirileceği dizin")
+    parser.add_argument("--api-key", default=os.environ.get(API_KEY_ENV), help=f"AndroZoo API anahtarı (varsayılan: ${API_KEY_ENV})")
+    parser.add_argument("--base-url", default=BASE_URL, help="İndirme uç noktası (test için yerel sunucu verilebilir)")
+    parser.add_argument("--workers", type=int, default=WORKERS)
+    parser.add_argument("--rate", type=float, default=RATE, help="Saniyede en fazla istek (0: sınırsız)")
+    parser.add_argument("--burst", type=int, default=BURST)
+    parser.add_argument("--retries", type=int, default=RETRIES)
+    parser.add_argument("--timeout", type=float, default=TIMEOUT)
+    parser.add_argument("--verify-existing", action="store_true", help="Mevcut .apk dosyalarını da hash’le")
+    parser.add_argument("--error-log", default=ERROR_LOG)
+    args = parser.parse_args(argv)
+
+    try:
+        downloader = Downloader(args.api_key, args.out_dir, args.base_url, RateLimiter(args.rate, args.burst),
+                                args.timeout, args.retries, args.verify_existing)
+    except ValueError as e:
+        print(f"[!] {e}")
+        sys.exit(1)
+    os.makedirs(args.out_dir, exist_ok=True)
+
+    rows, seen = [], set()
+    for list_file in args.lists:
+        if not os.path.exists(list_file):
+            print(f"[!] {list_file} bulunamadı, bu liste atlanıyor.")
+            continue
+        for sha256, size in read_list(list_file):
+            if sha256 not in seen:
+                seen.add(sha256)
+                rows.append((sha256, size))
+    print(f"[*] {len(rows)} APK, {args.workers} worker, {args.rate:g} istek/sn -> {args.out_dir}")
+
+    counts = {"ok": 0, "exists": 0, "failed": 0}
+    total_bytes = 0
+    start = time.time()
+    for i, (sha256, _, status, received, error) in enumerate(download_all(downloader, rows, max(1, args.workers)), 1):
+        counts[status] += 1
+        total_bytes += received
+        if status == "failed":
+            log_error(args.error_log, sha256, error)
+            print(f"\n[!] {sha256}: {error}")
+        print(f"[{i}/{len(rows)}] indirilen: {counts['ok']}, mevcut: {counts['exists']}, hatalı: {counts['failed']} \r",
+              end="", flush=True)
+
+    elapsed = max(time.time() - start, 1e-9)
+    print(f"\n[✓] {total_bytes / 1024 ** 2:.1f} MB, {elapsed:.1f} sn ({total_bytes / 1024 ** 2 / elapsed:.1f} MB/sn)")
+
+if __name__ == "__main__":
+    main()
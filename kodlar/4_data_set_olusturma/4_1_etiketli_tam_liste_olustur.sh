@@ -14,11 +14,52 @@ MALWARE_LIST="balanced_malware.csv"
 MILITARY_LIST="Military.csv"
 POPULAR_LIST="Popular.csv"
 
+# Satırlar bu sayıya ulaştıkça CSV'ye toplu eklenir
+BATCH_SIZE=50
+
+# Depo index'i (sha256 -> yol, boyut); $BASE_REPO/apk_index.tsv, yalnızca değişen klasörler yeniden taranır
+SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
+APK_INDEX_PY="$SCRIPT_DIR/6.adim_jadx_analizi/apk_deposu.py"
+
 # Başlık satırı yoksa oluştur
 if [ ! -f "$OUTPUT_CSV" ]; then
     echo "SHA256,SIZE,MARKET,PERMISSIONS_LIST,api_DEVICEID,api_EXEC,api_CIPHER,api_SMSMANAGER,api_DYN_LOAD,int_BOOT,LABEL" > "$OUTPUT_CSV"
 fi
 
+# İşlenmiş SHA256'lar bir kez okunur (her satırda CSV'yi baştan grep'lemek yerine)
+declare -A DONE
+mapfile -t done_list < <(tail -n +2 "$OUTPUT_CSV" | cut -d, -f1)
+for sha in "${done_list[@]}"; do
+    [ -n "$sha" ] && DONE["$sha"]=1
+done
+unset done_list
+echo "Daha önce işlenmiş: ${#DONE[@]} APK"
+
+# APK'ler her SHA için 4 klasörde stat edilmek yerine index'ten bulunur (ilk klasör önceliklidir)
+declare -A APK_PATH APK_SIZE APK_FOLDER
+tmp=$(mktemp) || exit 1
+trap 'rm -f "$tmp"' EXIT
+if python3 "$APK_INDEX_PY" "$BASE_REPO" --dump > "$tmp"; then
+    while IFS=$'\t' read -r sha folder path size mtime; do
+        [ -n "${APK_PATH[$sha]}" ] && continue
+        APK_PATH["$sha"]="$path"
+        APK_SIZE["$sha"]="$size"
+        APK_FOLDER["$sha"]="$folder"
+    done < "$tmp"
+    USE_INDEX=1
+    echo "Depo index'i: ${#APK_PATH[@]} APK"
+else
+    USE_INDEX=0
+    echo "UYARI: Depo index'i okunamadı (hata yukarıda), klasörler tek tek aranacak; bu yavaş olabilir."
+fi
+
+pending_rows=()
+flush_rows() {
+    [ ${#pending_rows[@]} -eq 0 ] && return
+    printf '%s\n' "${pending_rows[@]}" >> "$OUTPUT_CSV"
+    pending_rows=()
+}
+
 find_and_process() {
     list_file=$1
     label=$2
@@ -32,28 +73,34 @@ find_and_process() {
     echo "$type_name listesi işleniyor (Etiket: $label)..."
     
     # AndroZoo formatına göre (sha256 ve en sondaki markets) oku
-    tail -n +2 "$list_file" | while IFS=, read -r sha256 sha1 md5 date size pkg ver vt_det vt_date dex_sz markets; do
+    # Döngü alt kabukta çalışmasın diye süreç ikamesi: DONE ve pending_rows listeler arasında korunur
+    while IFS=, read -r sha256 sha1 md5 date size pkg ver vt_det vt_date dex_sz markets; do
         [ -z "$sha256" ] && continue
 
         # Zaten CSV'de varsa atla (Eski verileri korur, hızı artırır)
-        if grep -q "$sha256" "$OUTPUT_CSV"; then
-            continue
-        fi
+        [ -n "${DONE[$sha256]}" ] && continue
 
-        # APK'yı 4 alt klasörde de ara
+        # APK'yı index'te, index yoksa 4 alt klasörde ara
         apk_path=""
-        for folder in "Benign" "Malware" "Military" "Popular"; do
-            temp_path="$BASE_REPO/$folder/$sha256.apk"
-            if [ -f "$temp_path" ]; then
-                apk_path="$temp_path"
-                break
-            fi
-        done
+        f_size=""
+        if [ "$USE_INDEX" -eq 1 ]; then
+            apk_path="${APK_PATH[$sha256]}"
+            f_size="${APK_SIZE[$sha256]}"
+            folder="${APK_FOLDER[$sha256]}"
+        else
+            for folder in "Benign" "Malware" "Military" "Popular"; do
+                temp_path="$BASE_REPO/$folder/$sha256.apk"
+                if [ -f "$temp_path" ]; then
+                    apk_path="$temp_path"
+                    break
+                fi
+            done
+        fi
 
         if [ -n "$apk_path" ]; then
             echo -ne "Analiz ediliyor: $sha256 ($folder) \r"
             
-            f_size=$(stat -c%s "$apk_path" 2>/dev/null || echo 0)
+            [ -z "$f_size" ] && f_size=$(stat -c%s "$apk_path" 2>/dev/null || echo 0)
             
             # İzinlerin Çıkarılması
             manifest_raw=$(aapt dump permissions "$apk_path" 2>/dev/null)
@@ -76,9 +123,12 @@ find_and_process() {
             clean_market=$(echo "$markets" | tr ',' ' ')
             
             # CSV'ye yaz (Label sütununa özel değerler gelecek)
-            echo "$sha256,$f_size,$clean_market,$perm_list,$api_id,$api_exec,$api_cipher,$api_sms_mgr,$api_dyn,$int_boot,$label" >> "$OUTPUT_CSV"
+            pending_rows+=("$sha256,$f_size,$clean_market,$perm_list,$api_id,$api_exec,$api_cipher,$api_sms_mgr,$api_dyn,$int_boot,$label")
+            DONE["$sha256"]=1
+            [ ${#pending_rows[@]} -ge $BATCH_SIZE ] && flush_rows
         fi
-    done
+    done < <(tail -n +2 "$list_file")
+    flush_rows
     echo -e "\n$type_name işlemi tamamlandı."
 }
 
@@ -1,22 +1,35 @@
 #!/usr/bin/env python3
 import os               #os: dosya/dizin işlemleri, batch gezinme
+import sys
 import hashlib          #hashlib: APK kimliklendirme (SHA-256)
 import zipfile          #zipfile: APK’nin ZIP bütünlüğü ve içerik analizi
+import zlib             #zlib: bozuk sıkıştırılmış girdilerin hatası
 import json             #json: standartlaştırılmış çıktı üretimi
 import shutil           #shutil: geçici dizin temizliği
 import subprocess       #subprocess: JADX çağırma
 import time             #time: performans ve süre ölçümü
-
-# =========================
-# ANDROGUARD IMPORT (SAFE)
-# =========================
-try:
-    from androguard.core.apk import APK
-except ImportError:
-    from androguard.core.bytecodes.apk import APK  #Androguard’ın farklı sürümleriyle uyumluluk sağlar.
+import re               #re: AST öncesi hızlı metin ön-filtresi
+import argparse         #argparse: komut satırı parametreleri (worker sayısı, dizinler)
+from functools import partial
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED   #Çoklu APK için süreç havuzu
 
 import javalang    #Java kaynak kodunu AST (Abstract Syntax Tree) olarak parse etmek için kullanılır.     
 
+from ast_onbellek import AstCache, content_key   #Korpus genelinde tekrar eden sınıflar için AST önbelleği
+from kutuphane_onekleri import PREFIX_FILE, LibraryIndex, load_prefixes   #Kütüphane kodu tespiti
+from dex_tarayici import scan_apk_bytecode     #JADX’siz, dex seviyesinde API taraması
+from metot_indeksi import build_method_index, write_method_index   #Yeniden hesaplama için metot indeksi
+from kaynak_arsivi import SourceArchive, archive_path, write_archive   #Decompile çıktısının kalıcı arşivi
+from maliyet_tahmini import (SIZE_CSVS, JADX_TIMEOUT, MIN_HISTORY,   #APK boyutuna göre süre/zaman aşımı tahmini
+                             CostModel, history_samples, load_size_hints)
+from jadx_istemcisi import get_service          #Kalıcı JADX servisi (JVM açılışı APK başına ödenmez)
+from ham_ozellik import write_raw_features      #raw_features.json / kompakt raw_features.json.gz
+from manifest_okuyucu import MANIFEST_NAME, manifest_metadata    #Yalnızca AndroidManifest.xml (androguard yedekli)
+from izin_seviyeleri import add_permission_levels, protection_levels   #İzin koruma seviyeleri (resmi izin sözlüğünden)
+from apk_deposu import list_apks               #Etiket klasörlerinde APK listesi depo index’inden
+from sonuc_deposu import (append_manifest, completed_apks, load_manifest, manifest_record,   #Atomik yazım ve manifest
+                          read_json, write_json_atomic)
+
 # =========================
 # CONFIG
 # =========================
@@ -30,7 +43,29 @@ JADX_OPTS = [
     "--no-debug-info"                           #Resource’ları ve debug bilgilerini çıkartmaz, Sadece kod analizi odaklı decompile
 ]
 
-os.makedirs(OUT_DIR, exist_ok=True)             #Çıktı dizini yoksa oluşturur.
+# =========================
+# JADX PROFILES
+# threads / heap_gb = 0 -> çekirdek ve RAM eşzamanlı JADX süreçleri arasında paylaştırılır.
+# Heap JAVA_OPTS (-Xmx) ile verilir; jadx başlatıcı betiği bu değişkeni JVM’e iletir.
+# =========================
+JADX_PROFILES = {
+    "default": {"threads": 0, "heap_gb": 0, "opts": JADX_OPTS},
+    #Eski jadx_analize.py davranışı: APK başına tek thread, çok sayıda eşzamanlı APK
+    "single": {"threads": 1, "heap_gb": 2, "opts": JADX_OPTS},
+    #Daha az dönüşüm: metot/anonim sınıf inline yok, iç sınıflar ayrı dosyaya yazılır
+    "light": {"threads": 0, "heap_gb": 0, "opts": JADX_OPTS + [
+        "--no-inline-methods", "--no-inline-anonymous", "--no-move-inner-classes"]},
+    #Büyük APK’ler (OOM riskine karşı geniş heap)
+    "large": {"threads": 0, "heap_gb": 8, "opts": JADX_OPTS},
+}
+JVM_HEAP_RATIO = 0.75                           #Heap / JADX sürecinin toplam RAM’i (metaspace, thread stack’leri vb. için pay)
+
+# =========================
+# WORKER POOL
+# Paralel çalışmada her worker kendi geçici dizinini kullanır (TEMP_WORK_DIR/worker_<pid>).
+# =========================
+JADX_MEM_PER_WORKER = 4 * 1024 ** 3            #Bir JADX sürecinin ihtiyaç duyduğu tahmini RAM (byte)
+SCHEDULER_POLL_SEC = 5                          #RAM yetersizken yeni iş vermeden önce bekleme süresi
 
 # =========================
 # AST TARGET METHODS
@@ -62,129 +97,427 @@ AST_TARGETS = {
     ]
 }
 
+def build_ast_index(targets: dict) -> dict:
+    """Ters indeks: metot adı -> kategoriler. Her çağrı için tek sözlük araması yeterli olur."""
+    index = {}
+    for cat, methods in targets.items():
+        for method in methods:
+            index.setdefault(method, []).append(cat)
+    return index
+
+AST_INDEX = build_ast_index(AST_TARGETS)
+
+# Hedef setin sürümü: AST_TARGETS değişince önbellekteki eski sonuçlar geçersiz olur.
+AST_TARGETS_VERSION = hashlib.sha256(json.dumps(AST_TARGETS, sort_keys=True).encode()).hexdigest()[:16]
+
+# Ön-filtre: hedef isimlerden hiçbirini içermeyen dosyalar hiç parse edilmez.
+AST_PREFILTER = re.compile(r"\b(?:" + "|".join(map(re.escape, sorted(AST_INDEX))) + r")\b")
+
+# Metot indeksi modunda önbellek kayıtları hedef setten bağımsızdır.
+METHOD_CACHE_VERSION = "methods"
+
+def scan_java_source(source: str, collect_methods: bool = False) -> dict:
+    """Tek bir Java dosyasındaki hedef çağrıları kategori bazında sayar.
+
+    Hedef isim geçmeyen dosyalar için parse yapılmadan boş sonuç döner;
+    parse hatası javalang istisnası olarak çağırana iletilir.
+    collect_methods ile ön-filtre atlanır ve çağrılan tüm metot adları
+    ({metot: sayı}) döndürülür.
+    """
+    hits = {}
+    if not collect_methods and not AST_PREFILTER.search(source):
+        return hits
+
+    tree = javalang.parse.parse(source)
+    for _, node in tree.filter(javalang.tree.MethodInvocation):
+        for cat in ((node.member,) if collect_methods else AST_INDEX.get(node.member, ())):
+            hits[cat] = hits.get(cat, 0) + 1
+    return hits
+
+
+def hits_from_methods(methods: dict, ast_index: dict = AST_INDEX) -> dict:
+    """{metot: sayı} -> {kategori: sayı}"""
+    hits = {}
+    for name, count in methods.items():
+        for cat in ast_index.get(name, ()):
+            hits[cat] = hits.get(cat, 0) + count
+    return hits
+
+# =========================
+# SOURCE SCAN
+# JADX çıktısındaki .java dosyalarını (isteğe bağlı olarak paralel) tarar.
+# =========================
+PARSE_CHUNKSIZE = 64                            #Worker’a tek seferde gönderilen dosya sayısı
+
+def _scan_java_file(path: str, collect_methods: bool = False):
+    #Java dosyasını AST’ye dönüştürür ve gerçek API çağrılarını yakalar.
+    try:
+        with open(path, "r", errors="ignore") as f:
+            return scan_java_source(f.read(), collect_methods)
+    except Exception:
+        return {}
+
+
+def _file_key(path: str):
+    try:
+        with open(path, "rb") as f:
+            return content_key(f.read())
+    except OSError:
+        return None
+
+
+_OPEN_ARCHIVES = {}                             #Süreç başına açık kaynak arşivleri (yol -> SourceArchive)
+
+def _archive(path: str) -> SourceArchive:
+    if path not in _OPEN_ARCHIVES:
+        _OPEN_ARCHIVES[path] = SourceArchive(path)
+    return _OPEN_ARCHIVES[path]
+
+
+def _scan_archive_member(name: str, archive: str, collect_methods: bool = False):
+    #Arşivdeki sınıfı diske açmadan parse eder.
+    try:
+        return scan_java_source(_archive(archive).read(name), collect_methods)
+    except Exception:
+        return {}
+
+
+def _scan_files(java_files, items, key_of, scan, parse_workers: int, cache: AstCache,
+                library_index: LibraryIndex, skip_library: bool):
+    #scan_sources ve scan_archive’ın ortak gövdesi: items[i] java_files[i]’nin okunacağı kaynaktır.
+    results = [{}] * len(items)
+    todo = list(range(len(items)))
+
+    is_library = None
+    if library_index is not None:
+        is_library = [library_index.is_library(rel_path) for rel_path in java_files]
+        if skip_library:
+            todo = [i for i in todo if not is_library[i]]
+
+    if cache is not None:
+        keys = {i: key_of(items[i]) for i in todo}
+        cached = cache.get_many(k for k in keys.values() if k is not None)
+        misses = []
+        for i in todo:
+            if keys[i] in cached:
+                results[i] = cached[keys[i]]
+            else:
+                misses.append(i)
+        cache.hits += len(todo) - len(misses)
+        cache.misses += len(misses)
+        todo = misses
+
+    todo_items = [items[i] for i in todo]
+    if parse_workers > 1 and len(todo_items) > PARSE_CHUNKSIZE:
+        with ProcessPoolExecutor(max_workers=parse_workers) as pool:
+            parsed = list(pool.map(scan, todo_items, chunksize=PARSE_CHUNKSIZE))
+    else:
+        parsed = map(scan, todo_items)
+
+    for i, hits in zip(todo, parsed):
+        results[i] = hits
+
+    if cache is not None:
+        cache.put_many({keys[i]: results[i] for i in todo if keys[i] is not None})
+
+    return java_files, results, is_library
+
+
+def scan_sources(sources_dir: str, parse_workers: int = 1, cache: AstCache = None,
+                 library_index: LibraryIndex = None, skip_library: bool = False,
+                 collect_methods: bool = False):
+    """sources/ altındaki tüm .java dosyalarını tarar.
+
+    (java_files, results, is_library) döner. Dosyalar göreli yola göre
+    sıralanır ve sonuçlar bu sırayla üretilir; böylece çıktı worker
+    sayısından bağımsız olarak aynıdır. Önbellek verilirse yalnızca içeriği
+    daha önce görülmemiş dosyalar parse edilir.
+
+    Kütüphane indeksi verilirse is_library dosya bazında doldurulur;
+    skip_library ile kütüphane dosyaları hiç parse edilmez.
+    """
+    java_files = []
+    for root, _, files in os.walk(sources_dir):
+        for fname in files:
+            if fname.endswith(".java"):
+                java_files.append(os.path.relpath(os.path.join(root, fname), sources_dir))
+    java_files.sort()
+
+    paths = [os.path.join(sources_dir, rel_path) for rel_path in java_files]
+    scan = partial(_scan_java_file, collect_methods=collect_methods)
+    return _scan_files(java_files, paths, _file_key, scan, parse_workers, cache,
+                       library_index, skip_library)
+
+
+def scan_archive(path: str, parse_workers: int = 1, cache: AstCache = None,
+                 library_index: LibraryIndex = None, skip_library: bool = False,
+                 collect_methods: bool = False):
+    """scan_sources ile aynı sonucu kalıcı kaynak arşivinden (JADX çalıştırmadan) üretir."""
+    arc = _archive(path)
+    try:
+        java_files = arc.names()
+        scan = partial(_scan_archive_member, archive=path, collect_methods=collect_methods)
+        return _scan_files(java_files, java_files, lambda name: content_key(arc.read_bytes(name)),
+                           scan, parse_workers, cache, library_index, skip_library)
+    finally:
+        _OPEN_ARCHIVES.pop(path).close()
+
+
+def merge_hits(java_files, results, is_library=None, skip_library: bool = False):
+    """Dosya bazlı isabetleri ast_analysis / ast_hits_by_file şemasında birleştirir.
+
+    (java_files, ast_summary, ast_files, by_origin) döner; by_origin yalnızca
+    kütüphane bilgisi (is_library) verildiğinde doludur.
+    """
+    ast_summary = {k: 0 for k in AST_TARGETS}
+    ast_files = {k: [] for k in AST_TARGETS}
+    by_origin = {"app": dict(ast_summary), "library": dict(ast_summary)}
+    for rel_path, hits, library in zip(java_files, results, is_library or [False] * len(java_files)):
+        origin = by_origin["library" if library else "app"]
+        for cat, count in hits.items():
+            ast_summary[cat] += count
+            ast_files[cat].extend([rel_path] * count)
+            origin[cat] += count
+
+    if is_library is None:
+        return java_files, ast_summary, ast_files, None
+
+    by_origin["library_file_count"] = sum(is_library)
+    by_origin["library_skipped"] = skip_library
+    return java_files, ast_summary, ast_files, by_origin
+
+# =========================
+# JADX INVOCATION
+# =========================
+def jadx_command(profile: str, threads: int, work_dir: str, apk_path: str):
+    cmd = [JADX_BIN] + JADX_PROFILES[profile]["opts"]
+    if threads > 0:
+        cmd += ["--threads-count", str(threads)]
+    return cmd + ["-d", work_dir, apk_path]
+
+
+def jadx_env(heap_mb: int):
+    """heap_mb > 0 ise JVM heap sınırını JAVA_OPTS’a ekler (mevcut JAVA_OPTS korunur)."""
+    if heap_mb <= 0:
+        return None
+    env = dict(os.environ)
+    env["JAVA_OPTS"] = f"{env.get('JAVA_OPTS', '')} -Xmx{heap_mb}m".strip()
+    return env
+
+def decompile_with_service(profile: str, threads: int, heap_mb: int, work_dir: str,
+                           apk_path: str, timeout: int) -> str:
+    """APK’yi süreç başına açık tutulan JadxServisi ile decompile eder ("ok" / "timeout" / "error").
+
+    JVM’in RSS’i heap + JVM payını aşarsa servis bir sonraki APK’den önce yeniden açılır.
+    """
+    heap_mb = heap_mb or int(JADX_MEM_PER_WORKER * JVM_HEAP_RATIO) // 1024 ** 2
+    max_rss = int(heap_mb * 1024 ** 2 / JVM_HEAP_RATIO)
+    service = get_service(heap_mb, JADX_PROFILES[profile]["opts"], max_rss, JADX_BIN)
+    return service.decompile(apk_path, work_dir, threads, timeout)
+
+# =========================
+# APK OPEN
+# Dosya bir kez açılır: SHA-256 sabit boyutlu parçalarla hesaplanır ve ZIP merkez
+# dizini ile AndroidManifest.xml aynı tanıtıcı üzerinden okunur. Doğrulama, ZIP istatistikleri ve
+# metadata bu okumayı paylaşır; APK ikinci kez açılmaz.
+# =========================
+HASH_CHUNK = 1024 * 1024                        #Hash için okuma parçası (byte); bellek kullanımı APK boyutundan bağımsızdır
+
+def open_apk(apk_path: str):
+    """(sha256, infos, manifest) döner; dosya okunamazsa sha256, geçerli ZIP değilse infos None olur.
+
+    manifest: aynı tanıtıcıdan okunan AndroidManifest.xml baytları (yoksa veya okunamazsa None).
+    """
+    manifest = None
+    try:
+        with open(apk_path, "rb") as f:
+            digest = hashlib.sha256()
+            buf = bytearray(HASH_CHUNK)
+            view = memoryview(buf)
+            while True:
+                n = f.readinto(buf)
+                if not n:
+                    break
+                digest.update(view[:n])
+
+            try:
+                with zipfile.ZipFile(f) as z:
+                    infos = z.infolist()
+                    try:
+                        manifest = z.read(MANIFEST_NAME)
+                    except (KeyError, zipfile.BadZipFile, zlib.error, NotImplementedError, RuntimeError, EOFError):
+                        pass                    #manifest_metadata APK yolundan okumayı dener (androguard yedekli)
+            except (zipfile.BadZipFile, ValueError):
+                infos = None
+        return digest.hexdigest(), infos, manifest
+    except OSError:
+        return None, None, None
+
 # =========================
 # APK ANALYSIS
 # =========================
-def analyze_apk(apk_path: str):
+def analyze_apk(apk_path: str, out_dir: str = OUT_DIR, work_dir: str = TEMP_WORK_DIR,
+                parse_workers: int = 1, cache_path: str = None,
+                library_mode: str = "off", library_prefixes: str = PREFIX_FILE,
+                engine: str = "jadx", method_index: bool = False,
+                source_archive: str = None, jadx_timeout: int = JADX_TIMEOUT,
+                jadx_profile: str = "default", jadx_threads: int = 0, jadx_heap_mb: int = 0,
+                jadx_service: bool = False, raw_format: str = "json"):
     apk_name = os.path.basename(apk_path).replace(".apk", "")
-    output_dir = os.path.join(OUT_DIR, apk_name)                    #Her APK için izole bir çıktı klasörü oluşturur.
+    output_dir = os.path.join(out_dir, apk_name)                    #Her APK için izole bir çıktı klasörü oluşturur.
     summary_file = os.path.join(output_dir, "summary.json")
-    raw_file = os.path.join(output_dir, "raw_features.json")
 
-    if os.path.exists(summary_file):
-        print(f"[-] Skipped: {apk_name}")                           #Daha önce analiz edilmiş APK’yi atlar.
+    summary = read_json(summary_file)
+    if summary is not None:
+        print(f"[-] Skipped: {apk_name}")                           #Daha önce analiz edilmiş APK’yi atlar (bozuk JSON yeniden analiz edilir).
+        #summary.json yazılıp manifest’e eklenmeden çökülmüşse kayıt tamamlanır; aksi halde
+        #pending_apks bu APK’yi her çalıştırmada yeniden kuyruğa alır.
+        if apk_name not in load_manifest(out_dir):
+            append_manifest(out_dir, manifest_record(summary))
         return
 
     print(f"[*] Analyzing: {apk_name}")
     os.makedirs(output_dir, exist_ok=True)
 
     # ---------- HASH ----------
-    #APK’ye benzersiz kimlik atar.
-    try:
-        with open(apk_path, "rb") as f:
-            sha256 = hashlib.sha256(f.read()).hexdigest()
-    except Exception:
-        sha256 = None
+    #APK’ye benzersiz kimlik atar (ZIP içerik listesi aynı okumada alınır).
+    sha256, zip_infos, manifest_data = open_apk(apk_path)
 
     # ---------- ZIP VALIDATION ----------
     #Bozuk / sahte APK’leri ayıklar.
     
-    if not zipfile.is_zipfile(apk_path):
+    if zip_infos is None:
         summary = {
             "apk_name": apk_name,
             "sha256": sha256,
             "analysis_state": "invalid_apk",
             "error": "File is not a valid ZIP/APK"
         }
-        with open(summary_file, "w") as f:
-            json.dump(summary, f, indent=4)
+        write_json_atomic(summary_file, summary)
+        append_manifest(out_dir, manifest_record(summary))
         print(f"[!] Invalid APK: {apk_name}")
         return
 
     # ---------- METADATA ----------
-    # Paket bilgileri, SDK seviyeleri, İzinler, Component listeleri
+    # Paket bilgileri, SDK seviyeleri, İzinler (koruma seviyeleriyle), Component listeleri
 
-    
     metadata = {}
     try:
-        a = APK(apk_path)
-        metadata = {
-            "package_name": a.get_package(),
-            "version_code": a.get_androidversion_code(),
-            "version_name": a.get_androidversion_name(),
-            "min_sdk": a.get_min_sdk_version(),
-            "target_sdk": a.get_target_sdk_version(),
-            "permissions": sorted(a.get_permissions()),
-            "activities": sorted(a.get_activities()),
-            "services": sorted(a.get_services()),
-            "receivers": sorted(a.get_receivers())
-        }
+        metadata = manifest_metadata(apk_path, manifest_data)   #İkili AXML doğrudan çözülür; paketlenmiş manifestte androguard APK
     except Exception as e:
         metadata["error"] = str(e)
+    #permission_details + risk_counts. Tablo yüklenemezse hata yutulmaz: summary.json yazılmaz,
+    #APK manifest’e girmez ve sonraki çalıştırmada yeniden analiz edilir.
+    add_permission_levels(metadata)
 
     # ---------- ZIP STATS ----------
     # Dex sayısı, Native kod varlığı
     
     dex_count = 0
+    dex_size = 0
     native_libs = []
 
-    with zipfile.ZipFile(apk_path, "r") as z:
-        for name in z.namelist():
-            if name.endswith(".dex"):
-                dex_count += 1
-            elif name.endswith(".so"):
-                native_libs.append(name)
+    for info in zip_infos:
+        if info.filename.endswith(".dex"):
+            dex_count += 1
+            dex_size += info.file_size
+        elif info.filename.endswith(".so"):
+            native_libs.append(info.filename)
+
+    # ---------- AST + RAW FEATURE COLLECTION ----------
+    ast_summary = {k: 0 for k in AST_TARGETS}
+    ast_files = {k: [] for k in AST_TARGETS}
+    java_files = []
+    ast_by_origin = None
+    ast_engine = None
+    results = []
+    is_library = None
+
+    library_index = LibraryIndex(load_prefixes(library_prefixes)) if library_mode != "off" else None
+    skip_library = library_index is not None and library_mode == "skip"
+
+    # ---------- BYTECODE ----------
+    #Dex içindeki metot referanslarını doğrudan tarar (decompile yok).
+    jadx_status = "skipped"
+    duration = 0.0
+
+    if engine in ("bytecode", "auto"):
+        start_time = time.time()
+        skip = library_index.is_library if skip_library else None
+        try:
+            java_files, results = scan_apk_bytecode(apk_path, AST_INDEX, skip, method_index)
+            is_library = [library_index.is_library(p) for p in java_files] if library_index else None
+            ast_engine = "bytecode"
+        except Exception as e:
+            print(f"[!] Bytecode scan failed ({apk_name}): {e}")
+            if engine == "bytecode":
+                jadx_status = "error"
+        duration = round(time.time() - start_time, 2)
 
     # ---------- JADX ----------
-    #APK’yi Java kaynak koda çevirir.
-    shutil.rmtree(TEMP_WORK_DIR, ignore_errors=True)
-    os.makedirs(TEMP_WORK_DIR, exist_ok=True)
+    #APK’yi Java kaynak koda çevirir (bytecode motoru kullanılmadıysa veya başarısız olduysa).
+    #Kaynak arşivi açıksa decompile çıktısı saklanır; arşivi olan APK yeniden decompile edilmez.
+    cache = None
+    archive = archive_path(source_archive, sha256) if source_archive and sha256 else None
+    archive_reused = False
 
-    jadx_status = "ok"
-    start_time = time.time()
+    if ast_engine is None and engine != "bytecode":
+        ast_engine = "jadx"
+        cache_version = METHOD_CACHE_VERSION if method_index else AST_TARGETS_VERSION
+        cache = AstCache(cache_path, cache_version) if cache_path else None
 
-    try:
-        subprocess.run(
-            [JADX_BIN] + JADX_OPTS + ["-d", TEMP_WORK_DIR, apk_path],
-            timeout=600,
-            stdout=subprocess.DEVNULL,
-            stderr=subprocess.DEVNULL
-        )
-    except subprocess.TimeoutExpired:
-        jadx_status = "timeout"
-    except Exception:
-        jadx_status = "error"
+        if archive and os.path.exists(archive):
+            jadx_status = "ok"
+            archive_reused = True
+            java_files, results, is_library = scan_archive(
+                archive, parse_workers, cache, library_index, skip_library, method_index)
+        else:
+            shutil.rmtree(work_dir, ignore_errors=True)
+            os.makedirs(work_dir, exist_ok=True)
 
-    duration = round(time.time() - start_time, 2)
+            jadx_status = "ok"
+            start_time = time.time()
 
-    # ---------- AST + RAW FEATURE COLLECTION ----------
-    ast_summary = {k: 0 for k in AST_TARGETS}
-    ast_files = {k: [] for k in AST_TARGETS}
-    java_files = []
+            try:
+                if jadx_service:
+                    jadx_status = decompile_with_service(jadx_profile, jadx_threads, jadx_heap_mb,
+                                                         work_dir, apk_path, jadx_timeout)
+                else:
+                    subprocess.run(
+                        jadx_command(jadx_profile, jadx_threads, work_dir, apk_path),
+                        env=jadx_env(jadx_heap_mb),
+                        timeout=jadx_timeout,
+                        stdout=subprocess.DEVNULL,
+                        stderr=subprocess.DEVNULL
+                    )
+            except subprocess.TimeoutExpired:
+                jadx_status = "timeout"
+            except Exception:
+                jadx_status = "error"
 
-    sources_dir = os.path.join(TEMP_WORK_DIR, "sources")
+            duration = round(time.time() - start_time, 2)
 
-    if jadx_status == "ok" and os.path.isdir(sources_dir):
-        for root, _, files in os.walk(sources_dir):
-            for fname in files:
-                if fname.endswith(".java"):
-                    rel_path = os.path.relpath(os.path.join(root, fname), sources_dir)
-                    java_files.append(rel_path)
-        #Java dosyasını AST’ye dönüştürür.            
-                    try:
-                        with open(os.path.join(root, fname), "r", errors="ignore") as f:
-                            tree = javalang.parse.parse(f.read())
-        #Gerçek API çağrılarını yakalar.                            
+            #Zaman aşımında o ana kadar yazılmış kaynaklar da taranır (arşive yalnızca tam çıktı girer).
+            sources_dir = os.path.join(work_dir, "sources")
+            if jadx_status in ("ok", "timeout") and os.path.isdir(sources_dir):
+                java_files, results, is_library = scan_sources(
+                    sources_dir, parse_workers, cache, library_index, skip_library, method_index)
+                if archive and jadx_status == "ok":
+                    write_archive(sources_dir, archive)
 
-                        for _, node in tree.filter(javalang.tree.MethodInvocation):
-                            for cat, methods in AST_TARGETS.items():
-                                if node.member in methods:
-                                    ast_summary[cat] += 1
-                                    ast_files[cat].append(rel_path)
-                    except Exception:
-                        continue
+            shutil.rmtree(work_dir, ignore_errors=True)
 
-    shutil.rmtree(TEMP_WORK_DIR, ignore_errors=True)
+        if cache:
+            cache.close()
+
+    # ---------- AST MERGE ----------
+    #Metot indeksi modunda dosya sonuçları {metot: sayı} olarak gelir ve kategoriye burada çevrilir.
+    if method_index and ast_engine is not None:
+        write_method_index(output_dir, build_method_index(java_files, results, ast_engine))
+        results = [hits_from_methods(methods) for methods in results]
+
+    java_files, ast_summary, ast_files, ast_by_origin = merge_hits(
+        java_files, results, is_library, skip_library)
 
     # ---------- RAW FEATURES ----------
     # Ham, geri dönülebilir, dosya bazlı veri üretir.
@@ -200,8 +533,7 @@ def analyze_apk(apk_path: str):
         }
     }
 
-    with open(raw_file, "w") as f:
-        json.dump(raw_features, f, indent=4, ensure_ascii=False)
+    write_raw_features(output_dir, raw_features, compact=raw_format == "compact")
 
     # ---------- SUMMARY ----------
     # Toplu analiz için sadeleştirilmiş veri üretir.
@@ -211,32 +543,279 @@ def analyze_apk(apk_path: str):
         "metadata": metadata,
         "stats": {
             "dex_count": dex_count,
-            "native_lib_count": len(native_libs)
+            "native_lib_count": len(native_libs),
+            "apk_size": os.path.getsize(apk_path),
+            "dex_size": dex_size
         },
         
         "jadx": {
             "status": jadx_status,
             "duration_sec": duration,
-            "sources_present": len(java_files) > 0,
-            "java_file_count": len(java_files)
+            **({"timeout_sec": jadx_timeout, "profile": jadx_profile,
+                "threads": jadx_threads, "heap_mb": jadx_heap_mb, "service": jadx_service}
+               if ast_engine == "jadx" and not archive_reused else {}),
+            "sources_present": ast_engine == "jadx" and len(java_files) > 0,
+            "java_file_count": len(java_files),
+            "ast_engine": ast_engine,
+            **({"source_archive": archive, "archive_reused": archive_reused}
+               if archive and ast_engine == "jadx" and os.path.exists(archive) else {}),
+            **(cache.stats() if cache else {})
         },
         "ast_analysis": ast_summary,
-        "analysis_state": "complete" if jadx_status == "ok" else "partial"
+        "ast_targets_version": AST_TARGETS_VERSION,
+        **({"ast_analysis_by_origin": ast_by_origin} if ast_by_origin else {}),
+        "analysis_state": "complete" if jadx_status == "ok" or ast_engine == "bytecode" else "partial"
     }
 
-    with open(summary_file, "w") as f:
-        json.dump(summary, f, indent=4, ensure_ascii=False)
+    #summary.json en son ve atomik yazılır; manifest kaydı APK’nin tamamlandığını gösterir.
+    write_json_atomic(summary_file, summary)
+    append_manifest(out_dir, manifest_record(summary))
 
     print(f"[✓] Done: {apk_name}")
 
+# =========================
+# SCHEDULER
+# CPU ve RAM durumuna göre worker sayısını belirler, RAM azaldığında yeni iş vermeyi bekletir.
+# =========================
+def available_memory() -> int:
+    """Kullanılabilir RAM miktarını byte cinsinden döndürür."""
+    try:
+        with open("/proc/meminfo") as f:
+            for line in f:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return os.sysconf("SC_AVPHYS_PAGES") * os.sysconf("SC_PAGE_SIZE")
+
+
+def plan_workers(requested: int = 0, mem_per_worker: int = JADX_MEM_PER_WORKER) -> int:
+    """İstenen worker sayısını çekirdek ve RAM sınırına göre kırpar (0 = otomatik)."""
+    cpu = os.cpu_count() or 1
+    by_mem = max(1, available_memory() // mem_per_worker)
+    limit = min(cpu, by_mem)
+    return max(1, min(requested, limit) if requested > 0 else limit)
+
+
+def pending_apks(apk_dir: str, out_dir: str):
+    """Manifest’te kaydı olmayan APK’leri deterministik sırayla döndürür (resume)."""
+    done = completed_apks(out_dir)
+    skipped = 0
+    for apk_path in list_apks(apk_dir):
+        if os.path.basename(apk_path).replace(".apk", "") in done:
+            skipped += 1
+            continue
+        yield apk_path
+    if skipped:
+        print(f"[-] Skipped: {skipped} APK (manifest)")
+
+
+def schedule_tasks(tasks, order: str = "size", size_csvs=SIZE_CSVS, jadx_timeout: int = 0):
+    """(apk_path, out_dir) çiftlerini (apk_path, out_dir, timeout) üçlülerine çevirir.
+
+    order="size" ile tahmini maliyeti en yüksek APK’ler önce verilir; böylece
+    kuyruğun sonunda tek bir büyük APK’nin yalnız çalışması önlenir.
+    jadx_timeout > 0 ise tüm APK’lere sabit zaman aşımı uygulanır, aksi halde
+    zaman aşımı geçmiş jadx.duration_sec değerlerinden öğrenilen modelle belirlenir.
+    """
+    tasks = list(tasks)
+    hints = load_size_hints(size_csvs)
+    model = CostModel(hints, history_samples(sorted({out_dir for _, out_dir in tasks}), hints))
+    if model.slope is None:
+        print(f"[*] Cost model: {model.samples}/{MIN_HISTORY} örnek, sabit zaman aşımı {JADX_TIMEOUT} sn")
+    else:
+        print(f"[*] Cost model: {model.samples} örnek, süre ≈ {model.intercept:.1f} + "
+              f"{model.slope * 1024 ** 2:.2f} × dex_MB sn")
+
+    if order == "size":
+        tasks.sort(key=lambda task: model.dex_size(task[0]), reverse=True)
+    return [(apk_path, out_dir, jadx_timeout or model.timeout(apk_path)) for apk_path, out_dir in tasks]
+
+
+def plan_jadx_resources(profile: str, workers: int, threads: int = 0, heap_gb: float = 0):
+    """(jadx_threads, jadx_heap_mb) — profil/CLI değeri yoksa çekirdek ve RAM worker’lar arasında bölünür."""
+    spec = JADX_PROFILES[profile]
+    threads = threads or spec["threads"] or max(1, (os.cpu_count() or 1) // max(1, workers))
+    heap_gb = heap_gb or spec["heap_gb"]
+    if heap_gb:
+        heap_mb = int(heap_gb * 1024)
+    else:
+        share = min(JADX_MEM_PER_WORKER, available_memory() // max(1, workers))
+        heap_mb = max(1024, int(share * JVM_HEAP_RATIO) // 1024 ** 2)
+    return threads, heap_mb
+
+
+def job_memory(options: dict) -> int:
+    """Bir APK işinin RAM ihtiyacı (byte): JADX heap’i + JVM payı."""
+    heap_mb = (options or {}).get("jadx_heap_mb", 0)
+    return int(heap_mb * 1024 ** 2 / JVM_HEAP_RATIO) if heap_mb else JADX_MEM_PER_WORKER
+
+
+def plan_parse_workers(requested: int, workers: int) -> int:
+    """APK başına parse worker sayısı (0 = çekirdekleri APK worker’ları arasında paylaştır)."""
+    if requested > 0:
+        return requested
+    return max(1, (os.cpu_count() or 1) // max(1, workers))
+
+
+_WORKER_WORK_DIR = None
+_WORKER_OPTIONS = {}
+
+
+def _init_worker(base_work_dir: str, options: dict):
+    #Her süreç kendi JADX çıktı alanına sahip olur; iki worker birbirinin dosyalarını silemez.
+    global _WORKER_WORK_DIR, _WORKER_OPTIONS
+    _WORKER_WORK_DIR = os.path.join(base_work_dir, f"worker_{os.getpid()}")
+    _WORKER_OPTIONS = options
+
+
+def _analyze_in_worker(apk_path: str, out_dir: str, jadx_timeout: int = JADX_TIMEOUT):
+    analyze_apk(apk_path, out_dir, _WORKER_WORK_DIR, **_WORKER_OPTIONS, jadx_timeout=jadx_timeout)
+    return apk_path
+
+
+def analysis_pool(work_dir: str, workers: int, options: dict = None):
+    """Her worker’ı kendi çalışma alanı ve analiz seçenekleriyle başlatan süreç havuzu."""
+    return ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                               initargs=(work_dir, options or {}))
+
+
+def submit_analysis(pool, apk_path: str, out_dir: str, jadx_timeout: int = JADX_TIMEOUT):
+    """analysis_pool’a tek APK gönderir; future sonucu apk_path’tir."""
+    return pool.submit(_analyze_in_worker, apk_path, out_dir, jadx_timeout)
+
+
+def run_pool(tasks, work_dir: str, workers: int, options: dict = None):
+    """(apk_path, out_dir[, timeout]) görevlerini süreç havuzunda analiz eder.
+
+    Aynı anda en fazla `workers` iş çalışır; yeni bir iş vermeden önce
+    RAM’in bir JADX süreci için yeterli olması beklenir.
+    """
+    tasks = iter(tasks)
+    running = set()
+    mem_needed = job_memory(options)
+
+    with analysis_pool(work_dir, workers, options) as pool:
+        while True:
+            while len(running) < workers:
+                if running and available_memory() < mem_needed:
+                    break
+                task = next(tasks, None)
+                if task is None:
+                    break
+                running.add(submit_analysis(pool, *task))
+
+            if not running:
+                break
+
+            done, running = wait(running, timeout=SCHEDULER_POLL_SEC, return_when=FIRST_COMPLETED)
+            for fut in done:
+                try:
+                    fut.result()
+                except Exception as e:
+                    print(f"[!] Worker error: {e}")
+
+
+def run_tasks(tasks, work_dir: str, workers: int, options: dict):
+    """Tek worker’da sıralı, aksi halde süreç havuzunda analiz eder."""
+    if workers == 1:
+        work_dir = os.path.join(work_dir, f"worker_{os.getpid()}")
+        for apk_path, out_dir, *timeout in tasks:
+            analyze_apk(apk_path, out_dir, work_dir, **options, jadx_timeout=timeout[0] if timeout else JADX_TIMEOUT)
+        return
+
+    print(f"[*] Workers: {workers} (parse workers / APK: {options['parse_workers']}, "
+          f"JADX: {options['jadx_profile']}, {options['jadx_threads']} thread, {options['jadx_heap_mb']} MB heap)")
+    run_pool(tasks, work_dir, workers, options)
+
+
+def add_analysis_args(parser, default_workers: int = 1):
+    """Analiz CLI’larının ortak parametreleri."""
+    parser.add_argument("--work-dir", default=TEMP_WORK_DIR, help="Geçici decompile alanı")
+    parser.add_argument("--workers", type=int, default=default_workers,
+                        help="Paralel APK sayısı (0 = CPU/RAM’e göre otomatik, 1 = sıralı)")
+    parser.add_argument("--parse-workers", type=int, default=0,
+                        help="APK başına paralel Java parse süreci (0 = çekirdek / worker)")
+    parser.add_argument("--cache", default=None,
+                        help="İçerik hash’li AST önbelleği (SQLite dosyası, verilmezse kapalı)")
+    parser.add_argument("--library-mode", choices=["off", "count", "skip"], default="off",
+                        help="Kütüphane kodu: off = ayrım yok, count = ayrı say, skip = parse etme")
+    parser.add_argument("--library-prefixes", default=PREFIX_FILE, help="Kütüphane paket öneki dosyası")
+    parser.add_argument("--engine", choices=["jadx", "bytecode", "auto"], default="jadx",
+                        help="jadx = decompile + AST, bytecode = dex metot referansları, "
+                             "auto = bytecode, başarısız olursa jadx")
+    parser.add_argument("--method-index", action="store_true",
+                        help="Çağrılan tüm metot adlarını method_index.json.gz olarak sakla "
+                             "(ön-filtre kapanır; önbellek dosyası bu moda özel olmalı)")
+    parser.add_argument("--source-archive", default=None,
+                        help="JADX çıktısını sha256 anahtarıyla bu dizinde ZIP olarak sakla; "
+                             "arşivi olan APK yeniden decompile edilmez")
+    parser.add_argument("--order", choices=["size", "name"], default="size",
+                        help="size = tahmini maliyeti en yüksek APK önce, name = dosya adı sırası")
+    parser.add_argument("--size-csv", action="append", default=None,
+                        help="apk_size/dex_size içeren AndroZoo CSV’si (tekrarlanabilir)")
+    parser.add_argument("--jadx-timeout", type=int, default=0,
+                        help="Sabit JADX zaman aşımı (sn); 0 = geçmiş sürelerden APK başına hesapla")
+    parser.add_argument("--jadx-profile", choices=sorted(JADX_PROFILES), default="default",
+                        help="JADX seçenek/kaynak profili")
+    parser.add_argument("--jadx-threads", type=int, default=0,
+                        help="JADX süreci başına thread (0 = profil, o da 0 ise çekirdek / worker)")
+    parser.add_argument("--jadx-heap-gb", type=float, default=0,
+                        help="JADX süreci başına JVM heap (0 = profil, o da 0 ise RAM / worker)")
+    parser.add_argument("--raw-format", choices=["json", "compact"], default="json",
+                        help="raw_features biçimi: json = raw_features.json, "
+                             "compact = ön ek kodlamalı raw_features.json.gz (ham_ozellik.py)")
+    parser.add_argument("--jadx-service", action="store_true",
+                        help="APK başına jadx başlatmak yerine worker başına kalıcı JadxServisi kullan "
+                             "(önce jadx_servisi/derle.sh)")
+
+
+def analysis_options(args):
+    """CLI parametrelerinden (worker sayısı, analyze_apk seçenekleri) üretir."""
+    heap_gb = args.jadx_heap_gb or JADX_PROFILES[args.jadx_profile]["heap_gb"]
+    mem_per_worker = int(heap_gb * 1024 ** 3 / JVM_HEAP_RATIO) if heap_gb else JADX_MEM_PER_WORKER
+    workers = plan_workers(args.workers, mem_per_worker) if args.workers != 1 else 1
+    jadx_threads, jadx_heap_mb = plan_jadx_resources(args.jadx_profile, workers, args.jadx_threads, heap_gb)
+    try:
+        protection_levels()                 #Ana süreçte bir kez kurulur (worker’lara fork ile geçer); eksik ortamda baştan durulur
+    except (OSError, ValueError) as e:
+        sys.exit(f"[!] İzin koruma seviyesi tablosu yüklenemedi: {e}")
+    options = {
+        "parse_workers": plan_parse_workers(args.parse_workers, workers),
+        "cache_path": args.cache,
+        "library_mode": args.library_mode,
+        "library_prefixes": args.library_prefixes,
+        "engine": args.engine,
+        "method_index": args.method_index,
+        "source_archive": args.source_archive,
+        "jadx_profile": args.jadx_profile,
+        "jadx_threads": jadx_threads,
+        "jadx_heap_mb": jadx_heap_mb,
+        "jadx_service": args.jadx_service,
+        "raw_format": args.raw_format,
+    }
+    return workers, options
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="JADX + AST tabanlı APK davranış analizi")
+    parser.add_argument("--apk-dir", default=APK_DIR, help="Girdi APK dizini")
+    parser.add_argument("--out-dir", default=OUT_DIR, help="Çıktı dataset dizini")
+    add_analysis_args(parser)
+    return parser.parse_args(argv)
+
 # =========================
 # MAIN
 #Tüm APK’leri deterministik sırayla analiz eder.
 # =========================
-def main():
-    for fname in sorted(os.listdir(APK_DIR)):
-        if fname.endswith(".apk"):
-            analyze_apk(os.path.join(APK_DIR, fname))
+def main(argv=None):
+    args = parse_args(argv)
+    os.makedirs(args.out_dir, exist_ok=True)             #Çıktı dizini yoksa oluşturur.
+
+    workers, options = analysis_options(args)
+    tasks = ((apk_path, args.out_dir) for apk_path in pending_apks(args.apk_dir, args.out_dir))
+    tasks = schedule_tasks(tasks, args.order, args.size_csv or SIZE_CSVS, args.jadx_timeout)
+    run_tasks(tasks, args.work_dir, workers, options)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+import os
+import sys
+import time
+import argparse
+
+from sonuc_deposu import atomic_path
+
+# =========================
+# CONFIG
+# APK deposu: <root>/<Etiket>/<sha256>.apk (harici USB disk). Depo bir kez taranır,
+# sonuç <root>/apk_index.tsv’ye yazılır; sonraki açılışlarda yalnızca değişen klasörler okunur.
+# =========================
+INDEX_FILE = "apk_index.tsv"
+INDEX_HEADER = "# apk_index v1"
+LABEL_FOLDERS = ["Benign", "Malware", "Military", "Popular"]   #Aynı SHA birden fazla klasördeyse ilk klasör geçerlidir
+MTIME_SLACK_NS = 2 * 10 ** 9                    #FAT/exFAT’ta klasör mtime çözünürlüğü 2 sn
+
+# =========================
+# INDEX
+# Dosya biçimi (TSV, kabuk betiklerinden de okunabilir):
+#   #dir   <etiket>  <klasör mtime_ns>
+#   <etiket>  <sha256>  <boyut>  <mtime_ns>
+# Yenileme: klasörün mtime’ı değişmediyse klasör hiç listelenmez (ekleme/silme/yeniden
+# adlandırma klasör mtime’ını değiştirir). Değişen klasörde yalnızca yeni dosyalar stat edilir;
+# yerinde üzerine yazılan dosyalar için full=True gerekir. Tarama anına çok yakın bir klasör
+# mtime’ı kaydedilmez, böylece aynı zaman diliminde eklenen dosyalar sonraki yenilemede görülür.
+# =========================
+class ApkRepository:
+    def __init__(self, root: str, index_path: str = None, folders=LABEL_FOLDERS):
+        self.root = root
+        self.index_path = index_path or os.path.join(root, INDEX_FILE)
+        self.folders = list(folders)
+        self.entries = {label: {} for label in self.folders}    #{etiket: {sha256: (boyut, mtime_ns)}}
+        self.dir_mtimes = {}
+        self.dirty = False
+
+    def load(self):
+        """Index dosyasını okur; yoksa veya bozuksa boş başlar (ilk yenilemede taranır)."""
+        try:
+            with open(self.index_path, encoding="utf-8") as f:
+                for line in f:
+                    parts = line.rstrip("\n").split("\t")
+                    try:
+                        if parts[0] == "#dir":
+                            self.dir_mtimes[parts[1]] = int(parts[2])
+                        elif not parts[0].startswith("#") and parts[0] in self.entries:
+                            self.entries[parts[0]][parts[1]] = (int(parts[2]), int(parts[3]))
+                    except (IndexError, ValueError):
+                        continue                    #Yarım kalmış satır
+        except OSError:
+            pass
+        return self
+
+    def refresh(self, full: bool = False):
+        """(eklenen, silinen) sayıları; full=True tüm klasörleri listeler ve her dosyayı stat eder."""
+        added = removed = 0
+        now = time.time_ns()
+        for label in self.folders:
+            folder = os.path.join(self.root, label)
+            try:
+                dir_mtime = os.stat(folder).st_mtime_ns
+            except OSError:
+                removed += len(self.entries[label])
+                if self.entries[label] or label in self.dir_mtimes:
+                    self.entries[label] = {}
+                    self.dir_mtimes.pop(label, None)
+                    self.dirty = True
+                continue
+            if not full and self.dir_mtimes.get(label) == dir_mtime:
+                continue
+
+            old = self.entries[label]
+            new = {}
+            with os.scandir(folder) as it:
+                for entry in it:
+                    if not entry.name.endswith(".apk"):
+                        continue
+                    sha256 = entry.name[:-len(".apk")]
+                    if not full and sha256 in old:
+                        new[sha256] = old[sha256]
+                        continue
+                    try:
+                        if not entry.is_file():
+                            continue
+                        st = entry.stat()
+                    except OSError:
+                        continue
+                    new[sha256] = (st.st_size, st.st_mtime_ns)
+                    if sha256 not in old:
+                        added += 1
+            removed += len(old.keys() - new.keys())
+
+            self.entries[label] = new
+            self.dir_mtimes[label] = dir_mtime if now - dir_mtime > MTIME_SLACK_NS else 0
+            self.dirty = True
+        return added, removed
+
+    def save(self):
+        if not self.dirty:
+            return
+        with atomic_path(self.index_path) as tmp_path:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(INDEX_HEADER + "\n")
+                for label in self.folders:
+                    if label in self.dir_mtimes:
+                        f.write(f"#dir\t{label}\t{self.dir_mtimes[label]}\n")
+                for label in self.folders:
+                    for sha256, (size, mtime) in sorted(self.entries[label].items()):
+                        f.write(f"{label}\t{sha256}\t{size}\t{mtime}\n")
+        self.dirty = False
+
+    def __len__(self):
+        return sum(len(entries) for entries in self.entries.values())
+
+    def lookup(self, sha256: str):
+        """(etiket, yol, boyut, mtime_ns) veya None — klasörler LABEL_FOLDERS sırasıyla denenir."""
+        for label in self.folders:
+            entry = self.entries[label].get(sha256)
+            if entry is not None:
+                return label, os.path.join(self.root, label, f"{sha256}.apk"), entry[0], entry[1]
+        return None
+
+    def path(self, sha256: str):
+        found = self.lookup(sha256)
+        return found[1] if found else None
+
+    def apk_paths(self, label: str):
+        """Etiket klasöründeki APK yolları (ad sırasıyla)."""
+        folder = os.path.join(self.root, label)
+        return [os.path.join(folder, f"{sha256}.apk") for sha256 in sorted(self.entries.get(label, {}))]
+
+    def rows(self):
+        """(sha256, etiket, yol, boyut, mtime_ns) satırları; yinelenen SHA’lar için her klasör ayrı satırdır."""
+        for label in self.folders:
+            for sha256, (size, mtime) in sorted(self.entries[label].items()):
+                yield sha256, label, os.path.join(self.root, label, f"{sha256}.apk"), size, mtime
+
+
+def open_repository(root: str, index_path: str = None, folders=LABEL_FOLDERS, full: bool = False):
+    """Index’i yükler, değişen klasörleri yeniler ve (gerekirse) geri yazar."""
+    repository = ApkRepository(root, index_path, folders).load()
+    repository.refresh(full)
+    try:
+        repository.save()
+    except OSError as e:
+        print(f"[!] {repository.index_path} yazılamadı: {e}", file=sys.stderr)   #Salt okunur disk: bellekte kullanılır
+    return repository
+
+
+def list_apks(apk_dir: str):
+    """apk_dir içindeki .apk yolları (ad sırasıyla).
+
+    apk_dir bir deponun etiket klasörüyse (üst dizinde apk_index.tsv var) liste index’ten gelir;
+    aksi halde klasör doğrudan listelenir.
+    """
+    root, label = os.path.split(os.path.abspath(apk_dir))
+    if label in LABEL_FOLDERS and os.path.exists(os.path.join(root, INDEX_FILE)):
+        return open_repository(root).apk_paths(label)
+    return [os.path.join(apk_dir, name) for name in sorted(os.listdir(apk_dir)) if name.endswith(".apk")]
+
+# =========================
+# MAIN
+# =========================
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="APK deposu index’i (sha256 -> yol, boyut, mtime, etiket)")
+    parser.add_argument("root", help="Benign/Malware/Military/Popular klasörlerinin kökü")
+    parser.add_argument("--index", default=None, help=f"Index dosyası (varsayılan: <root>/{INDEX_FILE})")
+    parser.add_argument("--folders", nargs="+", default=LABEL_FOLDERS, help="Etiket klasörleri (öncelik sırasıyla)")
+    parser.add_argument("--full", action="store_true", help="Tüm klasörleri yeniden tara, her dosyayı stat et")
+    parser.add_argument("--dump", action="store_true",
+                        help="sha256<TAB>etiket<TAB>yol<TAB>boyut<TAB>mtime_ns satırlarını stdout’a yaz")
+    args = parser.parse_args(argv)
+
+    if args.dump:
+        repository = open_repository(args.root, args.index, args.folders, args.full)
+        for row in repository.rows():
+            sys.stdout.write("\t".join(str(v) for v in row) + "\n")
+        return
+
+    start = time.time()
+    repository = ApkRepository(args.root, args.index, args.folders).load()
+    added, removed = repository.refresh(args.full)
+    repository.save()
+    counts = ", ".join(f"{label}: {len(repository.entries[label])}" for label in repository.folders)
+    print(f"[✓] {len(repository)} APK ({counts}) — +{added} / -{removed}, {time.time() - start:.2f} sn")
+    print(f"[*] Index: {repository.index_path}")
+
+if __name__ == "__main__":
+    main()
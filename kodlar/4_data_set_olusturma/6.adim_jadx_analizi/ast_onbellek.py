@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+import sqlite3          #sqlite3: süreçler arası paylaşılabilen disk üstü önbellek
+import time             #time: LRU için son kullanım zamanı
+import hashlib          #hashlib: dosya içeriğinden anahtar üretimi
+import json             #json: hit vektörlerinin saklanması
+
+# =========================
+# CONFIG
+# =========================
+CACHE_MAX_ENTRIES = 2_000_000                   #Önbellekte tutulacak en fazla sınıf sayısı
+CACHE_EVICT_RATIO = 0.9                         #Sınır aşılınca kapasitenin bu oranına kadar temizlenir
+SQLITE_BATCH = 500                              #Tek IN (...) sorgusundaki anahtar sayısı
+
+# =========================
+# CONTENT-ADDRESSED AST CACHE
+# Aynı içerikli .java dosyası (ör. androidx, com/qq/e/ads) korpus boyunca bir kez parse edilir.
+# Anahtar: dosya içeriğinin hash’i, değer: {kategori: çağrı sayısı}.
+# =========================
+def content_key(data: bytes) -> str:
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+class AstCache:
+    """Dosya içeriği hash’ine göre AST hit vektörlerini saklayan LRU önbellek.
+
+    Hedef set sürümü (targets_version) değişirse eski kayıtlar geçersiz
+    sayılıp silinir. Aynı veritabanını birden fazla süreç paylaşabilir.
+    """
+
+    def __init__(self, path: str, targets_version: str, max_entries: int = CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+
+        self.db = sqlite3.connect(path, timeout=60)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        with self.db:
+            self.db.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+            self.db.execute("CREATE TABLE IF NOT EXISTS entries "
+                            "(key TEXT PRIMARY KEY, hits TEXT NOT NULL, last_used REAL NOT NULL)")
+            self.db.execute("CREATE INDEX IF NOT EXISTS entries_lru ON entries (last_used)")
+
+            row = self.db.execute("SELECT value FROM meta WHERE key = 'targets_version'").fetchone()
+            if row is None or row[0] != targets_version:
+                self.db.execute("DELETE FROM entries")
+                self.db.execute("INSERT OR REPLACE INTO meta VALUES ('targets_version', ?)",
+                                (targets_version,))
+
+    def get_many(self, keys) -> dict:
+        """Önbellekte bulunan anahtarların hit vektörlerini döndürür ve LRU zamanını günceller."""
+        keys = list(set(keys))
+        found = {}
+        for i in range(0, len(keys), SQLITE_BATCH):
+            batch = keys[i:i + SQLITE_BATCH]
+            marks = ",".join("?" * len(batch))
+            for key, hits in self.db.execute(
+                    f"SELECT key, hits FROM entries WHERE key IN ({marks})", batch):
+                found[key] = json.loads(hits)
+
+        if found:
+            now = time.time()
+            with self.db:
+                self.db.executemany("UPDATE entries SET last_used = ? WHERE key = ?",
+                                    [(now, key) for key in found])
+        return found
+
+    def put_many(self, items: dict):
+        """{anahtar: hit vektörü} kayıtlarını ekler, kapasite aşılırsa en eski kayıtları siler."""
+        if not items:
+            return
+        now = time.time()
+        with self.db:
+            self.db.executemany("INSERT OR REPLACE INTO entries VALUES (?, ?, ?)",
+                                [(key, json.dumps(hits), now) for key, hits in items.items()])
+            self._evict()
+
+    def _evict(self):
+        count = self.db.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+        if count <= self.max_entries:
+            return
+        excess = count - int(self.max_entries * CACHE_EVICT_RATIO)
+        self.db.execute("DELETE FROM entries WHERE key IN "
+                        "(SELECT key FROM entries ORDER BY last_used LIMIT ?)", (excess,))
+
+    def stats(self) -> dict:
+        return {"cache_hits": self.hits, "cache_misses": self.misses}
+
+    def close(self):
+        self.db.close()
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+import os
+import argparse
+from itertools import zip_longest
+
+from APK_inceleme_aciklamali import (
+    SIZE_CSVS,
+    add_analysis_args,
+    analysis_options,
+    pending_apks,
+    run_tasks,
+    schedule_tasks,
+)
+
+# =========================
+# CONFIG
+# Etiketli setlerin varsayılan yerleşimi: <DATASET_ROOT>/<Etiket> -> <DATASET_ROOT>/<Etiket>_result
+# =========================
+DATASET_ROOT = "/home/azureuser/dataset"
+DEFAULT_SETS = ["Benign", "Malware", "Military", "Popular"]
+
+# =========================
+# SET TANIMLARI
+# "Military" -> varsayılan dizinler, "Military=/apks" veya "Military=/apks:/out" -> özel dizinler
+# =========================
+def parse_set(spec: str):
+    label, _, paths = spec.partition("=")
+    if not paths:
+        return label, os.path.join(DATASET_ROOT, label), os.path.join(DATASET_ROOT, f"{label}_result")
+
+    apk_dir, _, out_dir = paths.partition(":")
+    return label, apk_dir, out_dir or f"{apk_dir.rstrip(os.sep)}_result"
+
+
+def interleave(queues):
+    """Setlerin APK’lerini sırayla (round-robin) tek bir kuyrukta birleştirir."""
+    for row in zip_longest(*queues):
+        for task in row:
+            if task is not None:
+                yield task
+
+# =========================
+# MAIN
+# =========================
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Etiketli APK setlerini tek bir worker havuzunda analiz eder")
+    parser.add_argument("sets", nargs="*", default=DEFAULT_SETS,
+                        help="Etiket veya Etiket=apk_dir[:out_dir] (varsayılan: tüm setler)")
+    add_analysis_args(parser, default_workers=0)
+    args = parser.parse_args(argv)
+
+    queues = []
+    for spec in args.sets:
+        label, apk_dir, out_dir = parse_set(spec)
+        if not os.path.isdir(apk_dir):
+            print(f"[!] {label}: APK dizini bulunamadı ({apk_dir}), atlanıyor.")
+            continue
+
+        os.makedirs(out_dir, exist_ok=True)
+        tasks = [(apk_path, out_dir) for apk_path in pending_apks(apk_dir, out_dir)]
+        print(f"[*] {label}: {len(tasks)} APK kuyrukta ({apk_dir} -> {out_dir})")
+        queues.append(tasks)
+
+    workers, options = analysis_options(args)
+    tasks = schedule_tasks(interleave(queues), args.order, args.size_csv or SIZE_CSVS, args.jadx_timeout)
+    run_tasks(tasks, args.work_dir, workers, options)
+
+if __name__ == "__main__":
+    main()
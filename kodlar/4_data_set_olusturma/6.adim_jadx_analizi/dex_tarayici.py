@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+import re               #re: classes*.dex girdilerini seçmek için
+import zipfile          #zipfile: APK içinden dex dosyalarını okumak için
+
+# =========================
+# ANDROGUARD IMPORT (SAFE)
+# =========================
+try:
+    from androguard.core.dex import DEX
+except ImportError:
+    from androguard.core.bytecodes.dvm import DalvikVMFormat as DEX  #Androguard 3.x uyumluluğu
+
+# =========================
+# BYTECODE ENGINE
+# JADX ile decompile etmeden, dex içindeki invoke-* komutlarının hedef metotlarından
+# ast_analysis / ast_hits_by_file ile aynı şemayı üretir.
+# =========================
+DEX_ENTRY = re.compile(r"^classes\d*\.dex$")
+
+# invoke-virtual/super/direct/static/interface ve /range sürümleri
+INVOKE_OPS = frozenset(range(0x6e, 0x73)) | frozenset(range(0x74, 0x79))
+
+
+def class_source_path(class_name: str) -> str:
+    """'Lcom/foo/Bar$1;' -> 'com/foo/Bar.java' (JADX iç sınıfları dış sınıfın dosyasına yazar)."""
+    return class_name[1:-1].split("$", 1)[0] + ".java"
+
+
+def _method_names(dex):
+    """method_id tablosundaki çağrı adları (indeks sırasıyla); yapıcılar (<init>, <clinit>) için None.
+
+    JADX motoru yalnızca javalang MethodInvocation düğümlerini sayar: `new X(...)` ve `super(...)`
+    sayılmaz. Yapıcı çağrıları burada da hedeflerle ve metot indeksiyle eşleşmez, iki motorun
+    sayıları aynı kalır.
+    """
+    names = []
+    for method_id in dex.get_methods_id_item().gets():
+        name = method_id.get_name()
+        names.append(None if name.startswith("<") else name)
+    return names
+
+
+def scan_dex(data: bytes, ast_index: dict, hits_by_file: dict, skip=None, collect_methods: bool = False):
+    """Tek bir dex dosyasını tarar; sınıf dosyalarını ve isabetleri hits_by_file’a ekler.
+
+    collect_methods ile kategori yerine çağrılan tüm metot adları sayılır.
+    """
+    dex = DEX(data)
+    for class_name in dex.get_classes_names():
+        hits_by_file.setdefault(class_source_path(class_name), {})
+
+    names = _method_names(dex)
+    if collect_methods:
+        targets = {idx: (name,) for idx, name in enumerate(names) if name is not None}
+    else:
+        targets = {idx: ast_index[name] for idx, name in enumerate(names) if name in ast_index}
+    if not targets:
+        return                                  #Hedef metot referansı yoksa kod taranmaz.
+
+    for method in dex.get_methods():
+        if method.get_code() is None:
+            continue
+        path = class_source_path(method.get_class_name())
+        if skip is not None and skip(path):
+            continue
+
+        hits = hits_by_file.setdefault(path, {})
+        for ins in method.get_instructions():
+            if ins.get_op_value() in INVOKE_OPS:
+                for cat in targets.get(ins.get_ref_kind(), ()):
+                    hits[cat] = hits.get(cat, 0) + 1
+
+
+def scan_apk_bytecode(apk_path: str, ast_index: dict, skip=None, collect_methods: bool = False):
+    """APK’deki tüm classes*.dex dosyalarını tarar.
+
+    (java_files, results) döner: java_files sıralı sınıf dosyası listesi,
+    results aynı sırada {kategori: sayı} (collect_methods ile {metot: sayı})
+    sözlükleri. `skip(path)` True dönen sınıfların kodu taranmaz.
+    """
+    hits_by_file = {}
+    with zipfile.ZipFile(apk_path, "r") as z:
+        for name in sorted(z.namelist()):
+            if DEX_ENTRY.match(name):
+                scan_dex(z.read(name), ast_index, hits_by_file, skip, collect_methods)
+
+    java_files = sorted(hits_by_file)
+    return java_files, [hits_by_file[path] for path in java_files]
@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+import os
+import re
+import csv
+import time
+import struct
+import zipfile
+import argparse
+from concurrent.futures import ProcessPoolExecutor   #Çoklu APK için süreç havuzu
+
+from manifest_okuyucu import MANIFEST_NAME, ANDROID_NS, iter_elements
+from apk_deposu import LABEL_FOLDERS, open_repository
+from maliyet_tahmini import SELECTION_DIR
+
+# =========================
+# CONFIG
+# 4_1_etiketli_tam_liste_olustur.sh’nin Python karşılığı: aapt / unzip / strings / stat
+# süreçleri açılmaz, APK başına tek ZIP açılışıyla tüm sütunlar üretilir.
+# =========================
+OUTPUT_CSV = "final_dataset_full.csv"
+BASE_REPO = "/run/media/yigit/DISK/dataset"     #<BASE_REPO>/<klasör>/<sha256>.apk
+APK_FOLDERS = LABEL_FOLDERS                     #Depo index’i (apk_deposu) üzerinden aranır
+
+#(liste, etiket, ad) — .sh ile aynı etiketler
+LISTS = [
+    (os.path.join(SELECTION_DIR, "3_3_balanced_benign.csv"), 0, "BENIGN"),
+    (os.path.join(SELECTION_DIR, "3_3_balanced_malware.csv"), 1, "MALWARE"),
+    (os.path.join(SELECTION_DIR, "3_4_popular_uygulamalar.csv"), 2, "POPULAR"),
+    (os.path.join(SELECTION_DIR, "3_5_4_askeri_uygulama_APKları.csv"), 3, "MILITARY"),
+]
+
+COLUMNS = ["SHA256", "SIZE", "MARKET", "PERMISSIONS_LIST", "api_DEVICEID", "api_EXEC",
+           "api_CIPHER", "api_SMSMANAGER", "api_DYN_LOAD", "int_BOOT", "LABEL"]
+
+#Sütun -> dex içinde aranan bayt dizileri (.sh’deki `strings | =~` kontrolleri)
+DEX_PATTERNS = {
+    "api_DEVICEID": [b"getDeviceId"],
+    "api_EXEC": [b"Runtime;->exec"],
+    "api_CIPHER": [b"javax/crypto"],
+    "api_SMSMANAGER": [b"android/telephony/SmsManager"],
+    "api_DYN_LOAD": [b"DexClassLoader", b"loadClass"],
+}
+BOOT_MARKER = "BOOT_COMPLETED"
+PERMISSION_TAGS = {"uses-permission", "uses-permission-sdk-23", "uses-permission-sdk-m"}   #aapt dump permissions
+
+DEX_NAME = re.compile(r"^classes\d*\.dex$")
+READ_CHUNK = 1 << 20                            #dex akış okuma parçası (1 MB)
+CHUNKSIZE = 8                                   #Havuzda worker başına gönderilen APK grubu
+BATCH_SIZE = 50                                 #Bu kadar satırda bir çıktı diske aktarılır
+
+# =========================
+# DEX PATTERN SEARCH
+# `strings` çıktısında aranan desenlerin hepsi ≥4 yazdırılabilir ASCII karakter olduğundan,
+# ham baytlarda aramak aynı sonucu verir. Tüm desenler tek bir regex alternasyonunda birleşir:
+# her dex (classes.dex, classes2.dex, ...) bir kez, parça parça taranır; parçalar arasında
+# en uzun desen kadar örtüşme bırakılır. Tüm desenler bulununca tarama erken biter.
+# =========================
+_PATTERN_COLUMN = {p: col for col, patterns in DEX_PATTERNS.items() for p in patterns}
+_DEX_REGEX = re.compile(b"|".join(re.escape(p) for p in sorted(_PATTERN_COLUMN, key=len, reverse=True)))
+_OVERLAP = max(len(p) for p in _PATTERN_COLUMN) - 1
+
+
+def scan_dex_stream(stream, found: set) -> set:
+    """Akıştaki desenleri found kümesine ekler (sütun adları)."""
+    tail = b""
+    while len(found) < len(DEX_PATTERNS):
+        chunk = stream.read(READ_CHUNK)
+        if not chunk:
+            break
+        data = tail + chunk
+        for match in _DEX_REGEX.finditer(data):
+            found.add(_PATTERN_COLUMN[match.group()])
+        tail = data[-_OVERLAP:]
+    return found
+
+# =========================
+# MANIFEST
+# PERMISSIONS_LIST: aapt dump permissions’taki name='...' satırları (uses-permission ve
+# uses-permission-sdk-23; adlar paketle tamamlanmaz), yinelenenler çıkarılır.
+# int_BOOT: aapt dump xmltree çıktısında BOOT_COMPLETED geçmesi -> herhangi bir öznitelik
+# değerinde (eylem adı veya RECEIVE_BOOT_COMPLETED izni). Manifest çözülemezse ham baytlarda
+# (UTF-8 / UTF-16) aranır, izinler için androguard kullanılır.
+# =========================
+def _permission_sort_key(name: str):
+    #Mevcut CSV’ler en_US yereliyle `sort` edilmiş: noktalama yok sayılır, büyük/küçük harf ikincil.
+    return re.sub(r"[^0-9a-z]", "", name.lower()), name.swapcase()
+
+
+def manifest_features(data: bytes):
+    """(izin listesi, boot) — izinler sıralı ve tekil."""
+    permissions = set()
+    boot = False
+    try:
+        for _, tag, attrs in iter_elements(data):
+            if tag.startswith(ANDROID_NS):
+                tag = tag[len(ANDROID_NS):]
+            if tag in PERMISSION_TAGS:
+                name = attrs.get(ANDROID_NS + "name") or attrs.get("name")
+                if name:
+                    permissions.add(name)
+            if not boot and any(BOOT_MARKER in value for value in attrs.values()):
+                boot = True
+    except (ValueError, IndexError, struct.error) as e:
+        raise ValueError(f"manifest çözülemedi: {e}")
+    return sorted(permissions, key=_permission_sort_key), boot
+
+
+def _fallback_manifest(apk_path: str, data: bytes):
+    try:
+        from androguard.core.apk import APK
+    except ImportError:
+        from androguard.core.bytecodes.apk import APK
+    try:
+        permissions = set(APK(apk_path).get_permissions())
+    except Exception:
+        permissions = set()
+    boot = BOOT_MARKER.encode() in data or BOOT_MARKER.encode("utf-16-le") in data
+    return sorted(permissions, key=_permission_sort_key), boot
+
+# =========================
+# FEATURES
+# =========================
+def extract_features(apk_path: str, size: int = None) -> dict:
+    """Bir APK için SIZE..int_BOOT sütunları (SHA256, MARKET, LABEL hariç); size verilirse stat edilmez."""
+    row = {"SIZE": os.path.getsize(apk_path) if size is None else size}
+    found = set()
+    permissions, boot = [], False
+    try:
+        with zipfile.ZipFile(apk_path) as z:
+            try:
+                manifest = z.read(MANIFEST_NAME)
+            except KeyError:
+                manifest = None
+            if manifest is not None:
+                try:
+                    permissions, boot = manifest_features(manifest)
+                except ValueError:
+                    permissions, boot = _fallback_manifest(apk_path, manifest)
+
+            for info in z.infolist():
+                if DEX_NAME.match(info.filename):
+                    try:
+                        with z.open(info) as stream:
+                            scan_dex_stream(stream, found)
+                    except (zipfile.BadZipFile, OSError, EOFError, NotImplementedError):
+                        continue                        #Bozuk dex girdisi: unzip -p gibi sessizce geçilir
+                if len(found) == len(DEX_PATTERNS):
+                    break
+    except (zipfile.BadZipFile, OSError):
+        pass                                            #.sh: aapt/unzip hata verince sütunlar 0 kalır
+
+    row["PERMISSIONS_LIST"] = "|".join(permissions) or "NO_PERMISSIONS"
+    for column in DEX_PATTERNS:
+        row[column] = int(column in found)
+    row["int_BOOT"] = int(boot)
+    return row
+
+
+def _extract_task(task):
+    sha256, apk_path, size, market, label = task
+    try:
+        row = extract_features(apk_path, size)
+    except Exception as e:                          #Bozuk ZIP/DEX (zlib.error, BadZipFile, ...) yalnızca bu APK’yi atlar
+        return None, f"{sha256}: {type(e).__name__}: {e}"
+    row.update({"SHA256": sha256, "MARKET": market, "LABEL": label})
+    return row, None
+
+# =========================
+# LABELLED LIST
+# =========================
+def processed_hashes(output_csv: str) -> set:
+    """Çıktıda zaten bulunan SHA256’lar (tek okuma). Yarım kalmış satırlar sayılmaz."""
+    done = set()
+    try:
+        with open(output_csv, newline="", encoding="utf-8") as f:
+            for row in csv.reader(f):
+                if len(row) == len(COLUMNS) and row[0] != "SHA256":
+                    done.add(row[0])
+    except OSError:
+        pass
+    return done
+
+
+def _drop_partial_line(output_csv: str):
+    #Kesilen bir çalıştırmadan kalan, satır sonu olmayan son satır silinir (yeni satırla birleşmesin).
+    with open(output_csv, "rb+") as f:
+        f.seek(0, os.SEEK_END)
+        size = f.tell()
+        if size == 0:
+            return
+        f.seek(max(0, size - (1 << 16)))
+        data = f.read()
+        if data.endswith(b"\n"):
+            return
+        f.truncate(size - len(data) + data.rfind(b"\n") + 1)
+
+
+def list_tasks(list_file: str, label: int, done: set, repository):
+    """Listedeki, çıktıda olmayan ve depoda bulunan APK’ler için (sha256, yol, boyut, market, etiket)."""
+    tasks = []
+    with open(list_file, newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            sha256 = (row.get("sha256") or "").strip()
+            if not sha256 or sha256 in done:
+                continue
+            found = repository.lookup(sha256)
+            if found is None:
+                continue
+            done.add(sha256)
+            _, apk_path, size, _ = found
+            tasks.append((sha256, apk_path, size, (row.get("markets") or "").replace(",", " "), label))
+    return tasks
+
+
+def build(output_csv: str, lists, base_repo: str = BASE_REPO, workers: int = 1, batch_size: int = BATCH_SIZE):
+    if not os.path.exists(output_csv):
+        with open(output_csv, "w", newline="", encoding="utf-8") as f:
+            csv.writer(f, lineterminator="\n").writerow(COLUMNS)
+    _drop_partial_line(output_csv)
+    done = processed_hashes(output_csv)
+    print(f"[*] Daha önce işlenmiş: {len(done)} APK")
+    repository = open_repository(base_repo, folders=APK_FOLDERS)
+    print(f"[*] Depo index’i: {len(repository)} APK ({repository.index_path})")
+    written = 0
+
+    for list_file, label, type_name in lists:
+        if not os.path.exists(list_file):
+            print(f"[!] {list_file} bulunamadı, bu liste atlanıyor.")
+            continue
+        tasks = list_tasks(list_file, label, done, repository)
+        print(f"[*] {type_name} listesi işleniyor (Etiket: {label}): {len(tasks)} yeni APK")
+        if not tasks:
+            continue
+
+        start = time.time()
+        with open(output_csv, "a", newline="", encoding="utf-8") as f, \
+                ProcessPoolExecutor(max_workers=workers) as pool:
+            writer = csv.DictWriter(f, fieldnames=COLUMNS, lineterminator="\n")
+            batch = []
+            try:
+                for row, error in pool.map(_extract_task, tasks, chunksize=CHUNKSIZE):
+                    if error:
+                        print(f"[!] {error}")
+                        continue
+                    batch.append(row)
+                    if len(batch) >= batch_size:
+                        writer.writerows(batch)
+                        f.flush()
+                        written += len(batch)
+                        batch = []
+            finally:
+                writer.writerows(batch)             #Havuz çökse de (ör. BrokenProcessPool) biriken satırlar kaybolmaz
+                written += len(batch)
+        print(f"[✓] {type_name} tamamlandı ({time.time() - start:.1f} sn)")
+    return written
+
+# =========================
+# MAIN
+# =========================
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Etiketli APK listesi (final_dataset_full.csv) — aapt/strings yerine süreç içi çıkarım")
+    parser.add_argument("-o", "--output", default=OUTPUT_CSV, help="Çıktı CSV")
+    parser.add_argument("--base-repo", default=BASE_REPO, help="Benign/Malware/Military/Popular klasörlerinin kökü")
+    parser.add_argument("--list", nargs=3, action="append", metavar=("CSV", "ETIKET", "AD"),
+                        help="Girdi listesi (varsayılan: 3_kriterlerle... altındaki dört liste)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE, help="Diske toplu yazılan satır sayısı")
+    args = parser.parse_args(argv)
+
+    lists = [(path, int(label), name) for path, label, name in args.list] if args.list else LISTS
+    written = build(args.output, lists, args.base_repo, max(1, args.workers), max(1, args.batch_size))
+    print(f"[✓] {written} satır eklendi: {args.output}")
+
+if __name__ == "__main__":
+    main()
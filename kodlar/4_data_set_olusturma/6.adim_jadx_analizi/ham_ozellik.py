@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+import os
+import json
+import gzip
+import argparse
+
+from sonuc_deposu import atomic_path
+
+# =========================
+# COMPACT RAW FEATURES
+# raw_features.json’un kayıpsız, sıkıştırılmış karşılığı (raw_features.json.gz):
+#   paths           : java_files (+ yalnızca hit listesinde geçen yollar), ön ek kodlamalı
+#                     {"prefix_lens": [...], "suffixes": [...]} — her yol bir öncekiyle
+#                     ortak ön ekinin uzunluğu + kalan kısım olarak saklanır
+#   java_file_count : paths’in ilk kaç elemanının java_files olduğu
+#   ast_hits_by_file: {kategori: [yol_no, tekrar, yol_no, tekrar, ...]} (ardışık tekrarlar birleşik)
+# Diğer alanlar (native_libs, dex_files_count, exported_components) olduğu gibi saklanır.
+# =========================
+RAW_FILE = "raw_features.json"
+COMPACT_FILE = "raw_features.json.gz"
+COMPACT_FORMAT = "compact-1"
+
+
+def _front_encode(paths):
+    prefix_lens, suffixes = [], []
+    prev = ""
+    for path in paths:
+        n = 0
+        limit = min(len(prev), len(path))
+        while n < limit and prev[n] == path[n]:
+            n += 1
+        prefix_lens.append(n)
+        suffixes.append(path[n:])
+        prev = path
+    return {"prefix_lens": prefix_lens, "suffixes": suffixes}
+
+
+def _front_decode(table):
+    paths = []
+    prev = ""
+    for n, suffix in zip(table["prefix_lens"], table["suffixes"]):
+        prev = prev[:n] + suffix
+        paths.append(prev)
+    return paths
+
+
+def encode(raw: dict) -> dict:
+    """raw_features sözlüğü -> kompakt sözlük."""
+    paths = list(raw.get("java_files", []))
+    java_file_count = len(paths)
+    index = {}
+    for i, path in enumerate(paths):
+        index.setdefault(path, i)
+
+    hits = {}
+    for cat, files in (raw.get("ast_hits_by_file") or {}).items():
+        runs = []
+        for path in files:
+            if path not in index:
+                index[path] = len(paths)
+                paths.append(path)
+            i = index[path]
+            if runs and runs[-2] == i:
+                runs[-1] += 1
+            else:
+                runs.extend((i, 1))
+        hits[cat] = runs
+
+    compact = {"format": COMPACT_FORMAT, "paths": _front_encode(paths),
+               "java_file_count": java_file_count, "ast_hits_by_file": hits}
+    for key, value in raw.items():
+        if key not in ("java_files", "ast_hits_by_file"):
+            compact[key] = value
+    return compact
+
+
+def decode(compact: dict) -> dict:
+    """Kompakt sözlük -> raw_features.json ile aynı şekil (anahtar sırası dahil)."""
+    paths = _front_decode(compact["paths"])
+    hits = {}
+    for cat, runs in compact["ast_hits_by_file"].items():
+        files = []
+        for i in range(0, len(runs), 2):
+            files.extend([paths[runs[i]]] * runs[i + 1])
+        hits[cat] = files
+
+    raw = {"java_files": paths[:compact["java_file_count"]], "ast_hits_by_file": hits}
+    for key, value in compact.items():
+        if key not in ("format", "paths", "java_file_count", "ast_hits_by_file"):
+            raw[key] = value
+    return raw
+
+# =========================
+# READ / WRITE
+# =========================
+def load_raw_features(apk_dir: str) -> dict:
+    """APK klasöründeki raw_features’ı (kompakt veya JSON) okur."""
+    compact_path = os.path.join(apk_dir, COMPACT_FILE)
+    if os.path.exists(compact_path):
+        with gzip.open(compact_path, "rt", encoding="utf-8") as f:
+            return decode(json.load(f))
+    with open(os.path.join(apk_dir, RAW_FILE), encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _remove(path: str):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def _write_compact(path: str, raw: dict):
+    with atomic_path(path) as tmp_path, gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+        json.dump(encode(raw), f, separators=(",", ":"), ensure_ascii=False)
+
+
+def write_raw_features(apk_dir: str, raw: dict, compact: bool = None):
+    """raw_features’ı yazar; compact=None ise klasördeki mevcut biçim korunur.
+
+    Diğer biçimdeki eski dosya silinir. load_raw_features .gz’yi tercih ettiği için sıra önemlidir:
+    kompakt yazımda JSON, .gz yerine konduktan sonra; JSON yazımında .gz, JSON yerine konmadan
+    önce silinir. Böylece yarıda kalan bir yazım eski .gz’nin yeni JSON’u gölgelemesine yol açmaz.
+    """
+    compact_path = os.path.join(apk_dir, COMPACT_FILE)
+    raw_path = os.path.join(apk_dir, RAW_FILE)
+    if compact is None:
+        compact = os.path.exists(compact_path)
+    if compact:
+        _write_compact(compact_path, raw)
+        _remove(raw_path)
+    else:
+        with atomic_path(raw_path) as tmp_path:
+            with open(tmp_path, "w") as f:
+                json.dump(raw, f, indent=4, ensure_ascii=False)
+            _remove(compact_path)
+
+
+def has_raw_features(apk_dir: str) -> bool:
+    return (os.path.exists(os.path.join(apk_dir, COMPACT_FILE))
+            or os.path.exists(os.path.join(apk_dir, RAW_FILE)))
+
+# =========================
+# CONVERTER
+# Mevcut klasörleri dönüştürür; yeni dosya geri okunup birebir aynı çıkmadıkça orijinal silinmez.
+# =========================
+def convert_dir(apk_dir: str, keep: bool = False):
+    raw_path = os.path.join(apk_dir, RAW_FILE)
+    with open(raw_path, encoding="utf-8") as f:
+        raw = json.load(f)
+
+    _write_compact(os.path.join(apk_dir, COMPACT_FILE), raw)       #Orijinal doğrulamadan önce silinmez
+    with gzip.open(os.path.join(apk_dir, COMPACT_FILE), "rt", encoding="utf-8") as f:
+        if decode(json.load(f)) != raw:
+            os.remove(os.path.join(apk_dir, COMPACT_FILE))
+            raise ValueError("round-trip farkı")
+
+    before = os.path.getsize(raw_path)
+    if not keep:
+        os.remove(raw_path)
+    return before, os.path.getsize(os.path.join(apk_dir, COMPACT_FILE))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="raw_features.json dosyalarını kompakt biçime dönüştürür")
+    parser.add_argument("results_roots", nargs="+", help="Sonuç dizinleri (alt klasörlerde raw_features.json aranır)")
+    parser.add_argument("--keep", action="store_true", help="Orijinal raw_features.json dosyalarını silme")
+    args = parser.parse_args(argv)
+
+    converted = failed = before = after = 0
+    for results_root in args.results_roots:
+        for root, _, files in os.walk(results_root):
+            if RAW_FILE not in files:
+                continue
+            try:
+                b, a = convert_dir(root, args.keep)
+                converted += 1
+                before += b
+                after += a
+            except (OSError, ValueError) as e:
+                print(f"[!] {root}: {e}")
+                failed += 1
+
+    print(f"[✓] {converted} klasör dönüştürüldü, {failed} hatalı: "
+          f"{before / 1024 ** 2:.1f} MB -> {after / 1024 ** 2:.1f} MB")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+import os
+import sys
+import time
+import argparse
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+from APK_inceleme_aciklamali import (
+    SCHEDULER_POLL_SEC,
+    add_analysis_args,
+    analysis_options,
+    analysis_pool,
+    available_memory,
+    job_memory,
+    submit_analysis,
+)
+from maliyet_tahmini import SELECTION_DIR, CostModel, history_samples, load_size_hints
+from sonuc_deposu import completed_apks, read_json
+
+sys.path.insert(0, SELECTION_DIR)
+from androzoo_indirici import (API_KEY_ENV, BASE_URL, RATE, BURST, WORKERS as DOWNLOAD_WORKERS,   #AndroZoo indirici (3. adım)
+                               Downloader, RateLimiter, log_error, read_list)
+
+# =========================
+# CONFIG
+# İndirme ve analiz aynı anda yürür: doğrulanan her APK beklemeden analiz havuzuna verilir.
+# APK’ler <download_root>/<Etiket>/ altına (apk_deposu düzeni), sonuçlar <results_root>/<Etiket>_result
+# altına yazılır (azure_calisan ile aynı yerleşim).
+# =========================
+DOWNLOAD_ROOT = "/home/azureuser/dataset"
+RESULTS_ROOT = "/home/azureuser/dataset"
+LISTS = [
+    (os.path.join(SELECTION_DIR, "3_3_balanced_benign.csv"), "Benign"),
+    (os.path.join(SELECTION_DIR, "3_3_balanced_malware.csv"), "Malware"),
+    (os.path.join(SELECTION_DIR, "3_4_popular_uygulamalar.csv"), "Popular"),
+    (os.path.join(SELECTION_DIR, "3_5_4_askeri_uygulama_APKları.csv"), "Military"),
+]
+MAX_PENDING = 32                                #Diskte aynı anda bulunabilecek analiz edilmemiş APK (indirilmekte olanlar dahil)
+MAX_PENDING_GB = 20                             #Aynı sınırın bayt karşılığı (listedeki apk_size ile)
+FINAL_STATES = {"complete", "invalid_apk"}      #delete_after yalnızca bu sonuçlarda APK’yi siler (partial/timeout yeniden denenebilir)
+
+# =========================
+# PIPELINE
+# Tek bir ana döngü iki havuzu besler:
+#   indirme havuzu (iş parçacıkları) -> hazır kuyruğu -> analiz havuzu (süreçler)
+# Bir APK indirme başladığı andan analizi bitene kadar "bekleyen" sayılır. Bekleyen APK sayısı
+# MAX_PENDING’i veya tahmini boyut toplamı MAX_PENDING_GB’yi aşacaksa yeni indirme başlatılmaz;
+# böylece analiz geride kalınca indirme durur ve disk kullanımı sınırlı kalır. delete_after ile
+# bu çalıştırmada indirilen APK, summary.json kesin bir sonuçla (FINAL_STATES) yazıldıktan sonra silinir;
+# partial sonuçlar daha büyük profil / zaman aşımıyla yeniden analiz edilebilsin diye APK diskte kalır.
+# =========================
+def pipeline_tasks(lists, download_root: str, results_root: str):
+    """(sha256, apk_size, etiket, apk_dir, out_dir) — sonuç manifest’inde olanlar atlanır."""
+    tasks, seen = [], set()
+    for list_file, label in lists:
+        if not os.path.exists(list_file):
+            print(f"[!] {list_file} bulunamadı, bu liste atlanıyor.")
+            continue
+        apk_dir = os.path.join(download_root, label)
+        out_dir = os.path.join(results_root, f"{label}_result")
+        os.makedirs(apk_dir, exist_ok=True)
+        os.makedirs(out_dir, exist_ok=True)
+        done = completed_apks(out_dir)
+        skipped = 0
+        for sha256, size in read_list(list_file):
+            if sha256 in seen:
+                continue
+            seen.add(sha256)
+            if sha256 in done:
+                skipped += 1
+                continue
+            tasks.append((sha256, size, label, apk_dir, out_dir))
+        print(f"[*] {label}: {skipped} APK zaten analiz edilmiş ({list_file})")
+    return tasks
+
+
+def run_pipeline(tasks, downloaders: dict, work_dir: str, workers: int, options: dict,
+                 download_workers: int = DOWNLOAD_WORKERS, max_pending: int = MAX_PENDING,
+                 max_pending_bytes: int = MAX_PENDING_GB * 1024 ** 3, delete_after: bool = False,
+                 jadx_timeout: int = 0, size_csvs=(), error_log: str = None):
+    tasks = deque(tasks)
+    total = len(tasks)
+    hints = load_size_hints(size_csvs)
+    model = CostModel(hints, history_samples(sorted({task[4] for task in tasks}), hints))
+    mem_needed = job_memory(options)
+
+    downloading, analyzing = {}, {}                 #future -> görev
+    ready = deque()                                 #(görev, apk_path, yeni indirildi mi)
+    pending = pending_bytes = 0
+    counts = {"ok": 0, "exists": 0, "failed": 0, "analyzed": 0, "deleted": 0}
+    start = time.time()
+
+    def release(task):
+        nonlocal pending, pending_bytes
+        pending -= 1
+        pending_bytes -= task[1] or 0
+
+    with ThreadPoolExecutor(max_workers=download_workers) as download_pool, \
+            analysis_pool(work_dir, workers, options) as pool:
+        while tasks or downloading or ready or analyzing:
+            # ---------- İNDİRME BAŞLAT (disk sınırı) ----------
+            while tasks and len(downloading) < download_workers and pending < max_pending:
+                size = tasks[0][1] or 0
+                if pending and pending_bytes + size > max_pending_bytes:
+                    break
+                task = tasks.popleft()
+                pending += 1
+                pending_bytes += size
+                downloading[download_pool.submit(downloaders[task[2]].fetch, task[0], task[1])] = task
+
+            # ---------- ANALİZ BAŞLAT (RAM sınırı) ----------
+            while ready and len(analyzing) < workers:
+                if analyzing and available_memory() < mem_needed:
+                    break
+                task, apk_path, downloaded = ready.popleft()
+                timeout = jadx_timeout or model.timeout(apk_path)
+                analyzing[submit_analysis(pool, apk_path, task[4], timeout)] = (task, apk_path, downloaded)
+
+            done, _ = wait(list(downloading) + list(analyzing), timeout=SCHEDULER_POLL_SEC,
+                           return_when=FIRST_COMPLETED)
+            for fut in done:
+                if fut in downloading:
+                    task = downloading.pop(fut)
+                    try:
+                        status, _, error = fut.result()
+                    except Exception as e:
+                        status, error = "failed", str(e)
+                    counts[status] += 1
+                    if status == "failed":
+                        release(task)
+                        print(f"[!] İndirme başarısız: {task[0]} ({error})")
+                        if error_log:
+                            log_error(error_log, task[0], error)
+                        continue
+                    ready.append((task, downloaders[task[2]].paths(task[0])[0], status == "ok"))
+                    continue
+
+                task, apk_path, downloaded = analyzing.pop(fut)
+                release(task)
+                try:
+                    fut.result()
+                except Exception as e:
+                    print(f"[!] Worker error: {e}")
+                    continue                        #APK silinmez: sonraki çalıştırmada yeniden denenir
+                counts["analyzed"] += 1
+                summary = read_json(os.path.join(task[4], task[0], "summary.json"))
+                state = summary.get("analysis_state") if isinstance(summary, dict) else None
+                if delete_after and downloaded and state in FINAL_STATES:
+                    try:
+                        os.remove(apk_path)
+                        counts["deleted"] += 1
+                    except OSError as e:
+                        print(f"[!] {apk_path} silinemedi: {e}")
+
+            print(f"[*] {total - len(tasks) - len(downloading)}/{total} indirildi "
+                  f"(yeni: {counts['ok']}, mevcut: {counts['exists']}, hatalı: {counts['failed']}), "
+                  f"analiz: {counts['analyzed']}, kuyrukta: {len(ready)}, "
+                  f"diskte bekleyen: {pending} ({pending_bytes / 1024 ** 3:.1f} GB) \r", end="", flush=True)
+
+    print(f"\n[✓] {counts['analyzed']} APK analiz edildi, {counts['deleted']} APK silindi "
+          f"({time.time() - start:.1f} sn)")
+    return counts
+
+# =========================
+# MAIN
+# =========================
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="AndroZoo indirme + JADX/AST analizini aynı anda yürütür (disk kullanımı sınırlı)")
+    parser.add_argument("--list", nargs=2, action="append", metavar=("CSV", "ETIKET"),
+                        help="Girdi listesi ve etiket klasörü (varsayılan: 3. adımdaki dört liste)")
+    parser.add_argument("--download-root", default=DOWNLOAD_ROOT, help="APK’lerin indirileceği kök (<kök>/<Etiket>/)")
+    parser.add_argument("--results-root", default=RESULTS_ROOT, help="Sonuç kökü (<kök>/<Etiket>_result/)")
+    parser.add_argument("--api-key", default=os.environ.get(API_KEY_ENV), help=f"AndroZoo API anahtarı (varsayılan: ${API_KEY_ENV})")
+    parser.add_argument("--base-url", default=BASE_URL)
+    parser.add_argument("--download-workers", type=int, default=DOWNLOAD_WORKERS, help="Eşzamanlı indirme")
+    parser.add_argument("--rate", type=float, default=RATE, help="Saniyede en fazla indirme isteği")
+    parser.add_argument("--burst", type=int, default=BURST)
+    parser.add_argument("--max-pending", type=int, default=MAX_PENDING,
+                        help="Diskte bekleyebilecek analiz edilmemiş APK sayısı")
+    parser.add_argument("--max-pending-gb", type=float, default=MAX_PENDING_GB,
+                        help="Bekleyen APK’lerin toplam boyut sınırı (GB)")
+    parser.add_argument("--delete-after", action="store_true",
+                        help="Bu çalıştırmada indirilen APK’yi analiz tamamlandıktan sonra sil (partial sonuçlarda saklanır)")
+    parser.add_argument("--error-log", default="errors.log")
+    add_analysis_args(parser, default_workers=0)
+    args = parser.parse_args(argv)
+
+    lists = [(path, label) for path, label in args.list] if args.list else LISTS
+    limiter = RateLimiter(args.rate, args.burst)
+    try:
+        downloaders = {label: Downloader(args.api_key, os.path.join(args.download_root, label), args.base_url, limiter)
+                       for _, label in lists}
+    except ValueError as e:
+        print(f"[!] {e}")
+        sys.exit(1)
+
+    tasks = pipeline_tasks(lists, args.download_root, args.results_root)
+    workers, options = analysis_options(args)
+    print(f"[*] {len(tasks)} APK: {args.download_workers} indirme, {workers} analiz worker’ı, "
+          f"en fazla {args.max_pending} APK / {args.max_pending_gb:g} GB bekleyebilir")
+    run_pipeline(tasks, downloaders, args.work_dir, workers, options, max(1, args.download_workers),
+                 max(1, args.max_pending), int(args.max_pending_gb * 1024 ** 3), args.delete_after,
+                 args.jadx_timeout, args.size_csv or [path for path, _ in lists], args.error_log)
+
+if __name__ == "__main__":
+    main()
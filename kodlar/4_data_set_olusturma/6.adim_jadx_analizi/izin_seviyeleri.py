@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+import os
+import re
+import csv
+import sys
+import argparse
+
+from sonuc_deposu import read_json, write_json_atomic
+
+# =========================
+# CONFIG
+# =========================
+PERMISSION_CSV = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..",
+                              "1_tum_android_izinleri_aciklamali", "1_2_Resmi_Android_Izin_Sozlugu.csv")
+LEVELS = ["dangerous", "normal", "signature", "internal", "unknown"]   #risk_counts anahtarları (sabit sıra)
+FALLBACK_API_LEVEL = 36                         #Sözlükte olmayan izinler için androguard’ın izin tablosu
+
+CONSTANT_VALUE = re.compile(r'Constant Value: "([^"]+)"')
+PROTECTION_LEVEL = re.compile(r"Protection level: ([\w|]+)")
+
+# =========================
+# PROTECTION LEVEL TABLE
+# Sözlükteki bazı satırlarda Aciklama başka bir izne aittir (ör. ACCEPT_HANDOVER satırında
+# WRITE_VOICEMAIL açıklaması). Bu yüzden:
+#   1) Aciklama içindeki Constant Value, Tam_Deger ile aynıysa Koruma_Seviyesi doğrudur (öncelikli).
+#   2) Değilse açıklamanın ait olduğu izin (Constant Value) için "Protection level:" metni kullanılır.
+#   3) Hiçbiri yoksa (kesilmiş açıklama) Koruma_Seviyesi, daha iyi bir kayıt yoksa kullanılır.
+# Seviye, "signature|privileged" gibi bayraklardan yalnızca temel seviyeye indirgenir.
+# =========================
+def base_level(level: str) -> str:
+    level = (level or "").split("|")[0].strip().lower()
+    return level if level in LEVELS else "unknown"
+
+
+def load_protection_levels(csv_path: str = PERMISSION_CSV) -> dict:
+    """{tam izin adı: temel koruma seviyesi}"""
+    table = {}
+    priority = {}
+
+    def put(name, level, rank):
+        if rank > priority.get(name, -1):
+            table[name] = base_level(level)
+            priority[name] = rank
+
+    with open(csv_path, encoding="utf-8-sig", newline="") as f:
+        for row in csv.DictReader(f):
+            name = row["Tam_Deger"].strip()
+            constant = CONSTANT_VALUE.search(row["Aciklama"])
+            if constant and constant.group(1) == name:
+                put(name, row["Koruma_Seviyesi"], 2)
+                continue
+            if constant:
+                level = PROTECTION_LEVEL.search(row["Aciklama"])
+                put(constant.group(1), level.group(1) if level else "unknown", 1)
+            put(name, row["Koruma_Seviyesi"], 0)
+    return table
+
+
+def load_fallback_levels(api_level: int = FALLBACK_API_LEVEL) -> dict:
+    """androguard ile gelen AOSP izin tablosu (APK açılmaz); androguard kurulu değilse boş döner."""
+    try:
+        from androguard.core.api_specific_resources import load_permissions
+    except ImportError:
+        return {}
+    permissions = load_permissions(api_level)
+    return {name: base_level(info.get("protectionLevel")) for name, info in permissions.items()}
+
+
+def build_table(csv_path: str = PERMISSION_CSV, fallback: bool = True) -> dict:
+    """Resmi sözlük önceliklidir; sözlükte olmayan veya "unknown" kalan izinler yedek tablodan tamamlanır.
+
+    Yedek tablo istenip yüklenemezse ValueError: eksik tabloyla summary.json yazılmamalı.
+    """
+    table = load_protection_levels(csv_path)
+    if fallback:
+        fallback_levels = load_fallback_levels()
+        if not fallback_levels:
+            raise ValueError("androguard izin tablosu yüklenemedi (androguard kurulu mu?)")
+        for name, level in fallback_levels.items():
+            if table.get(name, "unknown") == "unknown":
+                table[name] = level
+    return table
+
+
+_TABLE = None
+
+
+def protection_levels() -> dict:
+    """Tablo süreç başına bir kez kurulur."""
+    global _TABLE
+    if _TABLE is None:
+        _TABLE = build_table()
+    return _TABLE
+
+
+def permission_details(permissions, table: dict = None) -> dict:
+    table = protection_levels() if table is None else table
+    return {perm: table.get(perm, "unknown") for perm in permissions}
+
+
+def risk_counts(details: dict) -> dict:
+    counts = dict.fromkeys(LEVELS, 0)
+    for level in details.values():
+        counts[level] = counts.get(level, 0) + 1
+    return counts
+
+
+def add_permission_levels(metadata: dict, table: dict = None):
+    """metadata’ya permission_details ve risk_counts alanlarını ekler (yerinde)."""
+    if "permissions" not in metadata:
+        return metadata
+    details = permission_details(metadata["permissions"], table)
+    metadata["permission_details"] = details
+    metadata["risk_counts"] = risk_counts(details)
+    return metadata
+
+# =========================
+# BACKFILL
+# Mevcut sonuç klasörlerinde APK yeniden açılmadan metadata.permissions üzerinden doldurulur;
+# tablo bir kez yüklenir, değeri değişmeyen summary.json dosyaları yeniden yazılmaz.
+# =========================
+def summary_files(results_root: str):
+    for root, dirs, files in os.walk(results_root):
+        if "summary.json" in files:
+            dirs.clear()
+            yield os.path.join(root, "summary.json")
+
+
+def backfill(summary_file: str, table: dict, write: bool = True) -> bool:
+    summary = read_json(summary_file)
+    if not isinstance(summary, dict):
+        raise ValueError("summary.json okunamadı")
+    metadata = summary.get("metadata")
+    if not isinstance(metadata, dict) or "permissions" not in metadata:
+        return False
+
+    before = (metadata.get("permission_details"), metadata.get("risk_counts"))
+    add_permission_levels(metadata, table)
+    if (metadata["permission_details"], metadata["risk_counts"]) == before:
+        return False
+    if write:
+        write_json_atomic(summary_file, summary)
+    return True
+
+# =========================
+# MAIN
+# =========================
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Mevcut summary.json dosyalarına izin koruma seviyelerini (permission_details, risk_counts) ekler")
+    parser.add_argument("results_roots", nargs="+", help="Sonuç dizinleri (alt klasörlerde summary.json aranır)")
+    parser.add_argument("--csv", default=PERMISSION_CSV, help="Resmi Android izin sözlüğü")
+    parser.add_argument("--no-fallback", action="store_true", help="Yalnızca sözlüğü kullan, androguard tablosuyla tamamlama")
+    parser.add_argument("--dry-run", action="store_true", help="Dosya yazmadan değişecek klasörleri say")
+    args = parser.parse_args(argv)
+
+    try:
+        table = build_table(args.csv, not args.no_fallback)
+    except (OSError, ValueError) as e:
+        print(f"[!] {e} — yalnızca sözlükle çalışmak için --no-fallback kullanın")
+        sys.exit(1)
+    print(f"[*] {len(table)} izin için koruma seviyesi yüklendi")
+
+    updated = unchanged = failed = 0
+    for results_root in args.results_roots:
+        for summary_file in summary_files(results_root):
+            try:
+                changed = backfill(summary_file, table, write=not args.dry_run)
+            except (OSError, ValueError) as e:
+                print(f"[!] {summary_file}: {e}")
+                failed += 1
+                continue
+            if changed:
+                updated += 1
+            else:
+                unchanged += 1
+
+    print(f"[✓] Güncellenen: {updated}, değişmeyen: {unchanged}, hatalı: {failed}")
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,6 @@
 #!/usr/bin/env python3
 import os, hashlib, zipfile, json, shutil, subprocess
-from androguard.misc import AnalyzeAPK
+from manifest_okuyucu import MANIFEST_NAME, manifest_metadata   # AndroidManifest.xml only (androguard APK fallback)
 
 # =========================
 # CONFIGURATION
@@ -24,29 +24,32 @@ def analyze_apk(apk_path):
     # --- SHA256 ---
     sha256 = hashlib.sha256(open(apk_path, "rb").read()).hexdigest()
 
-    # --- Manifest parsing with androguard ---
-    a, d, dx = AnalyzeAPK(apk_path)
-    permissions = a.get_permissions()
-    activities  = a.get_activities()
-    services    = a.get_services()
-    receivers   = a.get_receivers()
-
-    # --- Version info (correct methods for androguard 4.x) ---
-    package_name = a.get_package()
-    version_code = a.get_androidversion_code()
-    version_name = a.get_androidversion_name()
-    min_sdk      = a.get_min_sdk_version()
-    target_sdk   = a.get_target_sdk_version()
-
-    # --- Native libs (.so) + dex count ---
+    # --- Native libs (.so) + dex count + manifest bytes (single ZIP open) ---
     dex_count = 0
     native_libs = []
+    manifest_data = None
     with zipfile.ZipFile(apk_path, "r") as z:
         for name in z.namelist():
             if name.endswith(".dex"):
                 dex_count += 1
             if name.endswith(".so"):
                 native_libs.append(name)
+        if MANIFEST_NAME in z.NameToInfo:
+            manifest_data = z.read(MANIFEST_NAME)
+
+    # --- Manifest parsing (binary AXML only; AnalyzeAPK's dex analysis was never used) ---
+    metadata = manifest_metadata(apk_path, manifest_data)
+    permissions = metadata["permissions"]
+    activities  = metadata["activities"]
+    services    = metadata["services"]
+    receivers   = metadata["receivers"]
+
+    # --- Version info ---
+    package_name = metadata["package_name"]
+    version_code = metadata["version_code"]
+    version_name = metadata["version_name"]
+    min_sdk      = metadata["min_sdk"]
+    target_sdk   = metadata["target_sdk"]
 
     # --- TEMP_WORK_DIR for JADX ---
     if os.path.exists(TEMP_WORK_DIR):
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+import os
+import time
+import queue            #queue: servis çıktısının zaman aşımıyla okunması
+import shutil
+import atexit
+import threading
+import subprocess
+
+# =========================
+# CONFIG
+# =========================
+SERVICE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "jadx_servisi")
+JADX_LIB_ENV = "JADX_LIB_DIR"                   #jadx-core jar’larının dizini; verilmezse jadx kurulumundan bulunur
+JAVA_BIN = "java"
+
+SERVICE_MAX_JOBS = 200                          #Bu kadar APK’den sonra JVM tazelenir (sızıntılara karşı)
+SERVICE_START_TIMEOUT = 60
+
+# =========================
+# JADX SERVICE CLIENT
+# Her analiz süreci kendi JadxServisi JVM’ini açar ve APK’leri ona birer birer gönderir; JVM
+# açılışı ve JIT ısınması APK başına değil servis başına bir kez ödenir. APK içindeki sınıflar
+# servis tarafında `threads` iş parçacığıyla paralel decompile edilir.
+# =========================
+def jadx_lib_dir(jadx_bin: str) -> str:
+    """$JADX_LIB_DIR veya jadx betiğinin gerçek konumundan <kurulum>/lib (jadx sürüm arşivi düzeni).
+
+    /usr/local/bin/jadx -> /opt/jadx/bin/jadx bağlantısı için /opt/jadx/lib döner.
+    """
+    if os.environ.get(JADX_LIB_ENV):
+        return os.environ[JADX_LIB_ENV]
+    script = os.path.realpath(shutil.which(jadx_bin) or jadx_bin)
+    return os.path.join(os.path.dirname(os.path.dirname(script)), "lib")
+
+
+def _rss_bytes(pid: int) -> int:
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return 0
+
+
+class JadxService:
+    """JadxServisi sürecini yönetir; çökme, zaman aşımı ve bellek şişmesinde yeniden başlatır."""
+
+    def __init__(self, heap_mb: int, options=(), max_rss: int = 0, jadx_bin: str = "jadx",
+                 max_jobs: int = SERVICE_MAX_JOBS, classpath: str = None):
+        self.heap_mb = heap_mb
+        self.options = list(options)
+        self.max_rss = max_rss
+        self.max_jobs = max_jobs
+        self.lib_dir = jadx_lib_dir(jadx_bin)
+        self.classpath = classpath or os.pathsep.join([os.path.join(self.lib_dir, "*"), SERVICE_DIR])
+        self.proc = None
+        self.lines = None
+        self.jobs = 0
+        self.restarts = 0
+
+    # ---------- süreç yönetimi ----------
+    def start(self):
+        if not os.path.isdir(self.lib_dir):
+            raise RuntimeError(f"jadx kütüphane dizini bulunamadı: {self.lib_dir} (${JADX_LIB_ENV} ile verin)")
+        cmd = [JAVA_BIN, f"-Xmx{self.heap_mb}m", "-cp", self.classpath, "JadxServisi"] + self.options
+        self.proc = subprocess.Popen(cmd, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                     stderr=subprocess.DEVNULL, text=True, encoding="utf-8", bufsize=1)
+        self.lines = queue.Queue()
+        threading.Thread(target=self._pump, args=(self.proc, self.lines), daemon=True).start()
+        self.jobs = 0
+
+        if self._next_line(time.time() + SERVICE_START_TIMEOUT) != "READY":
+            self.stop(force=True)
+            raise RuntimeError("JadxServisi başlatılamadı")
+
+    @staticmethod
+    def _pump(proc, lines):
+        #stdout satırlarını kuyruğa aktarır; EOF None ile bildirilir.
+        for line in proc.stdout:
+            lines.put(line.rstrip("\n"))
+        lines.put(None)
+
+    def _next_line(self, deadline: float):
+        try:
+            return self.lines.get(timeout=max(0.0, deadline - time.time()))
+        except queue.Empty:
+            return TimeoutError
+
+    def stop(self, force: bool = False):
+        if self.proc is None:
+            return
+        try:
+            if not force:
+                self.proc.stdin.write("QUIT\n")
+                self.proc.stdin.flush()
+                self.proc.wait(timeout=10)
+        except (OSError, subprocess.TimeoutExpired):
+            pass
+        if self.proc.poll() is None:
+            self.proc.kill()
+            self.proc.wait()
+        self.proc = None
+
+    def restart(self):
+        self.stop(force=True)
+        self.restarts += 1
+        self.start()
+
+    # ---------- istekler ----------
+    def decompile(self, apk_path: str, out_dir: str, threads: int = 0, timeout: float = 600,
+                  on_class=None) -> str:
+        """APK’yi out_dir/sources altına decompile eder; "ok" / "timeout" / "error" döner.
+
+        on_class(rel_path) her sınıf diske yazıldığında çağrılır.
+        """
+        if self.proc is None or self.proc.poll() is not None:
+            self.start()
+
+        deadline = time.time() + timeout
+        status = "error"
+        self.proc.stdin.write(f"{self.jobs}\t{apk_path}\t{out_dir}\t{threads}\n")
+        self.proc.stdin.flush()
+
+        line = self._next_line(deadline)
+        while True:
+            if line is TimeoutError:
+                #Takılan APK servisi kilitlemesin: JVM öldürülür, sonraki istekte yeniden açılır.
+                self.stop(force=True)
+                self.restarts += 1
+                return "timeout"
+            if line is None:
+                self.proc = None                #JVM çöktü (ör. OOM killer)
+                self.restarts += 1
+                return "error"
+
+            kind, _, rest = line.partition("\t")
+            if kind == "CLASS" and on_class is not None:
+                on_class(rest.split("\t", 1)[1])
+            elif kind == "DONE":
+                status = "ok"
+                break
+            elif kind == "ERROR":
+                break
+            line = self._next_line(deadline)
+
+        self.jobs += 1
+        if self.jobs >= self.max_jobs or (self.max_rss and _rss_bytes(self.proc.pid) > self.max_rss):
+            self.stop()                         #Bir sonraki istek temiz bir JVM ile başlar.
+        return status
+
+
+_SERVICE = None
+
+def get_service(heap_mb: int, options=(), max_rss: int = 0, jadx_bin: str = "jadx") -> JadxService:
+    """Süreç başına tek servis örneği (worker’lar arasında paylaşılmaz)."""
+    global _SERVICE
+    if _SERVICE is None:
+        _SERVICE = JadxService(heap_mb, options, max_rss, jadx_bin)
+        atexit.register(_SERVICE.stop)
+    return _SERVICE
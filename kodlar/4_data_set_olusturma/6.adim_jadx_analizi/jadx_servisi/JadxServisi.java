@@ -0,0 +1,141 @@
+import java.io.BufferedReader;
+import java.io.File;
+import java.io.InputStreamReader;
+import java.io.PrintStream;
+import java.nio.charset.StandardCharsets;
+import java.nio.file.Files;
+import java.nio.file.Path;
+import java.util.ArrayList;
+import java.util.Arrays;
+import java.util.List;
+import java.util.concurrent.ExecutionException;
+import java.util.concurrent.ExecutorService;
+import java.util.concurrent.Executors;
+import java.util.concurrent.Future;
+import java.util.concurrent.TimeUnit;
+import java.util.concurrent.atomic.AtomicInteger;
+
+import jadx.api.JadxArgs;
+import jadx.api.JadxDecompiler;
+import jadx.api.JavaClass;
+
+/**
+ * Kalıcı JADX servisi: JVM bir kez açılır, APK’ler stdin üzerinden birer birer işlenir.
+ *
+ * Kullanım: java -Xmx4g -cp "jadx/lib/*:." JadxServisi [jadx seçenekleri...]
+ *
+ * İstek  (stdin):  <id>\t<apk_yolu>\t<çıktı_dizini>\t<thread_sayısı>   veya   QUIT
+ * Yanıt (stdout): READY
+ *                 CLASS\t<id>\t<sources/ altına göreli yol>     (sınıf diske yazıldıkça)
+ *                 DONE\t<id>\t<sınıf_sayısı>\t<hatalı_sınıf>\t<heap_kullanımı_mb>
+ *                 ERROR\t<id>\t<mesaj>
+ *
+ * Her analiz süreci kendi servisini açar ve bir APK bitmeden yenisini göndermez; paralellik
+ * APK içindedir: sınıflar <thread_sayısı> iş parçacığıyla (jadx CLI’daki gibi) decompile edilir.
+ * Çıktı dizin yapısı jadx CLI ile aynıdır (<çıktı_dizini>/sources/...).
+ */
+public class JadxServisi {
+    private static PrintStream out;
+    private static List<String> options;
+
+    public static void main(String[] argv) throws Exception {
+        options = Arrays.asList(argv);
+        out = new PrintStream(System.out, true, "UTF-8");
+        send("READY");
+
+        BufferedReader in = new BufferedReader(new InputStreamReader(System.in, StandardCharsets.UTF_8));
+        String line;
+        while ((line = in.readLine()) != null) {
+            if (line.equals("QUIT")) {
+                break;
+            }
+            run(line.split("\t", -1));
+        }
+    }
+
+    private static synchronized void send(String line) {
+        out.println(line);
+    }
+
+    private static JadxArgs buildArgs(File apk, File outDir, int threads) {
+        JadxArgs args = new JadxArgs();
+        args.getInputFiles().add(apk);
+        args.setOutDir(outDir);
+        args.setSkipResources(true);
+        if (threads > 0) {
+            args.setThreadsCount(threads);
+        }
+        for (String opt : options) {
+            switch (opt) {
+                case "--no-res":
+                    args.setSkipResources(true);
+                    break;
+                case "--no-debug-info":
+                    args.setDebugInfo(false);
+                    break;
+                case "--no-inline-methods":
+                    args.setInlineMethods(false);
+                    break;
+                case "--no-inline-anonymous":
+                    args.setInlineAnonymousClasses(false);
+                    break;
+                case "--no-move-inner-classes":
+                    args.setMoveInnerClasses(false);
+                    break;
+                default:
+                    System.err.println("[!] Bilinmeyen seçenek yok sayıldı: " + opt);
+            }
+        }
+        return args;
+    }
+
+    private static void run(String[] job) {
+        String id = job[0];
+        try {
+            File outDir = new File(job[2]);
+            Path sources = outDir.toPath().resolve("sources");
+            int threads = job.length > 3 && !job[3].isEmpty() ? Integer.parseInt(job[3]) : 0;
+
+            AtomicInteger count = new AtomicInteger();
+            AtomicInteger failed = new AtomicInteger();
+            JadxArgs args = buildArgs(new File(job[1]), outDir, threads);
+            try (JadxDecompiler jadx = new JadxDecompiler(args)) {
+                jadx.load();
+                ExecutorService pool = Executors.newFixedThreadPool(Math.max(1, args.getThreadsCount()));
+                try {
+                    List<Future<?>> tasks = new ArrayList<>();
+                    for (JavaClass cls : jadx.getClasses()) {
+                        //Sınıflar paralel decompile edilip hemen yazılır; bellekte tüm APK’nin kodu tutulmaz.
+                        tasks.add(pool.submit(() -> {
+                            try {
+                                String relPath = cls.getClassNode().getClassInfo().getAliasFullPath() + ".java";
+                                Path target = sources.resolve(relPath);
+                                Files.createDirectories(target.getParent());
+                                Files.write(target, cls.getCode().getBytes(StandardCharsets.UTF_8));
+                                cls.unload();
+                                send("CLASS\t" + id + "\t" + relPath);
+                                count.incrementAndGet();
+                            } catch (Exception | StackOverflowError e) {
+                                failed.incrementAndGet();
+                            }
+                        }));
+                    }
+                    for (Future<?> task : tasks) {
+                        task.get();             //OutOfMemoryError burada ExecutionException olarak gelir
+                    }
+                } finally {
+                    pool.shutdownNow();     //Hata olursa kalan sınıflar beklenmez; iş parçacıkları decompiler kapanmadan durur
+                    pool.awaitTermination(1, TimeUnit.MINUTES);
+                }
+            }
+
+            Runtime rt = Runtime.getRuntime();
+            long usedMb = (rt.totalMemory() - rt.freeMemory()) / (1024 * 1024);
+            send("DONE\t" + id + "\t" + count.get() + "\t" + failed.get() + "\t" + usedMb);
+        } catch (Throwable e) {
+            //OutOfMemoryError dahil: yanıt verilir, yeniden başlatma kararı istemciye aittir.
+            Throwable cause = e instanceof ExecutionException ? e.getCause() : e;
+            send("ERROR\t" + id + "\t" + String.valueOf(cause).replace('\t', ' ').replace('\n', ' '));
+        }
+    }
+}
@@ -0,0 +1,18 @@
+#!/bin/bash
+# JadxServisi.java’yı kurulu jadx kütüphanelerine karşı derler.
+# Kullanım: ./derle.sh [jadx_lib_dizini]
+# Dizin verilmezse $JADX_LIB_DIR, o da yoksa PATH’teki jadx betiğinin kurulumu (<kurulum>/lib)
+# kullanılır; jadx_istemcisi.py aynı sırayla arar.
+
+if [ -n "$1" ]; then
+    JADX_LIB="$1"
+elif [ -n "$JADX_LIB_DIR" ]; then
+    JADX_LIB="$JADX_LIB_DIR"
+else
+    JADX_SCRIPT="$(command -v "${JADX_BIN:-jadx}")" || { echo "[!] jadx bulunamadı; lib dizinini argüman olarak verin"; exit 1; }
+    JADX_LIB="$(dirname "$(dirname "$(readlink -f "$JADX_SCRIPT")")")/lib"
+fi
+[ -d "$JADX_LIB" ] || { echo "[!] $JADX_LIB bulunamadı"; exit 1; }
+cd "$(dirname "$0")" || exit 1
+
+javac -cp "$JADX_LIB/*" -d . JadxServisi.java && echo "[✓] JadxServisi derlendi (classpath: $JADX_LIB/*:$(pwd))"
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+import os
+import mmap             #mmap: arşivi belleğe eşleyerek kopyasız okuma
+import zipfile          #zipfile: sıkıştırılmış, rastgele erişimli kaynak arşivi
+
+# =========================
+# SOURCE ARCHIVE
+# JADX’in ürettiği sources/ dizini sha256 anahtarıyla tek bir ZIP olarak saklanır:
+#   <arşiv_dizini>/<sha256[:2]>/<sha256>.zip
+# Sonraki analizler arşivi yeniden decompile etmeden, diske açmadan üye üye okur.
+# =========================
+ARCHIVE_COMPRESSLEVEL = 6
+
+
+def archive_path(archive_dir: str, sha256: str) -> str:
+    return os.path.join(archive_dir, sha256[:2], f"{sha256}.zip")
+
+
+def write_archive(sources_dir: str, path: str) -> int:
+    """sources/ altındaki .java dosyalarını arşive yazar, yazılan dosya sayısını döndürür.
+
+    Arşiv önce geçici dosyaya yazılır; yarım kalan arşiv hiçbir zaman
+    nihai yolda görünmez.
+    """
+    java_files = []
+    for root, _, files in os.walk(sources_dir):
+        for fname in files:
+            if fname.endswith(".java"):
+                java_files.append(os.path.relpath(os.path.join(root, fname), sources_dir))
+    java_files.sort()
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with zipfile.ZipFile(tmp_path, "w", zipfile.ZIP_DEFLATED,
+                         compresslevel=ARCHIVE_COMPRESSLEVEL) as z:
+        for rel_path in java_files:
+            z.write(os.path.join(sources_dir, rel_path), rel_path.replace(os.sep, "/"))
+    os.replace(tmp_path, path)
+    return len(java_files)
+
+
+class _MappedFile:
+    """mmap üzerinde zipfile’ın beklediği okunabilir/konumlanabilir dosya arayüzü."""
+
+    def __init__(self, mapped):
+        self._map = mapped
+
+    def read(self, n=-1):
+        return self._map.read(n)
+
+    def seek(self, offset, whence=os.SEEK_SET):
+        self._map.seek(offset, whence)
+        return self._map.tell()
+
+    def tell(self):
+        return self._map.tell()
+
+    def seekable(self):
+        return True
+
+
+class SourceArchive:
+    """Kaynak arşivi okuyucu.
+
+    Dosya mmap ile eşlenir; üyeler istek üzerine açılır ve yalnızca
+    okunan sınıfın içeriği belleğe alınır.
+
+        with SourceArchive(path) as arc:
+            for rel_path, source in arc.iter_java():
+                ...
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._zip = zipfile.ZipFile(_MappedFile(self._map))
+
+    def names(self):
+        """Arşivdeki .java üyeleri (sıralı, '/' ayraçlı göreli yollar)."""
+        return sorted(n for n in self._zip.namelist() if n.endswith(".java"))
+
+    def read_bytes(self, name: str) -> bytes:
+        return self._zip.read(name)
+
+    def read(self, name: str) -> str:
+        return self.read_bytes(name).decode("utf-8", errors="ignore")
+
+    def open(self, name: str):
+        """Üyeyi akış olarak açar (büyük sınıflar için parça parça okuma)."""
+        return self._zip.open(name)
+
+    def iter_java(self):
+        for name in self.names():
+            yield name, self.read(name)
+
+    def close(self):
+        self._zip.close()
+        self._map.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+import os
+import re
+import json
+import gzip
+import time
+import argparse
+from bisect import bisect_left
+
+from ham_ozellik import has_raw_features, load_raw_features
+from sonuc_deposu import result_dirs
+
+# =========================
+# CONFIG
+# =========================
+INDEX_FORMAT = 1
+PACKAGE_DEPTH = 3                               #pkg: terimleri için en fazla paket derinliği
+PERMISSION_NS = "android.permission."           #perm:RECORD_AUDIO -> perm:android.permission.RECORD_AUDIO
+
+# =========================
+# CORPUS INDEX
+# Her terim (ör. perm:android.permission.RECORD_AUDIO, lib:libjiagu.so, ast:camera) için
+# APK’lerin bit kümesi tutulur; bit i, docs[i] APK’sinin terimi içerdiğini gösterir.
+# Bit kümeleri Python int’leridir: AND/OR/NOT tek bir tam sayı işlemidir.
+#
+# Terim türleri: set, state, app, perm, level, activity, service, receiver, lib, abi, ast, pkg
+# =========================
+def apk_terms(label: str, summary: dict, raw: dict = None):
+    metadata = summary.get("metadata") or {}
+    terms = {f"set:{label}", f"state:{summary.get('analysis_state')}"}
+    if metadata.get("package_name"):
+        terms.add(f"app:{metadata['package_name']}")
+    terms.update(f"perm:{p}" for p in metadata.get("permissions", []))
+    terms.update(f"level:{lvl}" for lvl in (metadata.get("permission_details") or {}).values())
+    for kind, key in (("activity", "activities"), ("service", "services"), ("receiver", "receivers")):
+        terms.update(f"{kind}:{c}" for c in metadata.get(key, []))
+    terms.update(f"ast:{cat}" for cat, count in (summary.get("ast_analysis") or {}).items() if count)
+
+    if raw is not None:
+        for lib in raw.get("native_libs", []):
+            parts = lib.split("/")
+            terms.add(f"lib:{parts[-1]}")
+            if len(parts) >= 3 and parts[0] == "lib":
+                terms.add(f"abi:{parts[1]}")
+        for rel_path in raw.get("java_files", []):
+            parts = rel_path.split("/")[:-1]
+            for d in range(1, min(len(parts), PACKAGE_DEPTH) + 1):
+                terms.add("pkg:" + ".".join(parts[:d]))
+    return terms
+
+
+def build_index(results_roots, with_raw: bool = True) -> dict:
+    docs = []
+    postings = {}
+    seen = set()                                    #(set, apk_name): iç içe / çakışan sonuç köklerinde APK bir kez sayılır
+    for results_root in results_roots:
+        for label, apk_dir in result_dirs(results_root):
+            key = (label, os.path.basename(apk_dir))
+            if key in seen:
+                continue
+            try:
+                with open(os.path.join(apk_dir, "summary.json"), encoding="utf-8") as f:
+                    summary = json.load(f)
+                raw = load_raw_features(apk_dir) if with_raw and has_raw_features(apk_dir) else None
+            except (OSError, ValueError) as e:
+                print(f"[!] {apk_dir}: {e}")
+                continue
+
+            seen.add(key)
+            bit = 1 << len(docs)
+            docs.append({"set": label, "apk_name": os.path.basename(apk_dir), "sha256": summary.get("sha256")})
+            for term in apk_terms(label, summary, raw):
+                postings[term] = postings.get(term, 0) | bit
+
+    return {"format": INDEX_FORMAT, "docs": docs, "terms": postings}
+
+
+def write_index(index: dict, path: str):
+    data = dict(index, terms={t: format(b, "x") for t, b in sorted(index["terms"].items())})
+    with gzip.open(path, "wt", encoding="utf-8") as f:
+        json.dump(data, f, separators=(",", ":"), ensure_ascii=False)
+
+
+def load_index(path: str) -> dict:
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        data = json.load(f)
+    data["terms"] = {t: int(b, 16) for t, b in data["terms"].items()}
+    return data
+
+# =========================
+# QUERY
+# Sözdizimi: terimler AND / OR / NOT (veya & | !) ve parantezlerle birleştirilir;
+# yan yana yazılan terimler AND sayılır. Sonu * ile biten terim önek eşleşmesidir.
+#   perm:RECORD_AUDIO AND lib:libjiagu.so AND set:Military
+#   (ast:camera | ast:microphone) !pkg:com.google.android.gms
+# =========================
+TOKEN = re.compile(r"\(|\)|&|\||!|[^\s()&|!]+")
+OPERATORS = {"&", "|", "!", ")", "AND", "OR", "NOT"}     #Terim olarak kullanılamaz
+
+
+class Query:
+    def __init__(self, index: dict):
+        self.index = index
+        self.terms = index["terms"]
+        self.universe = (1 << len(index["docs"])) - 1
+        self._sorted_terms = None                  #Önek sorguları için (ilk kullanımda sıralanır)
+
+    def term(self, token: str) -> int:
+        if token.endswith("*"):
+            prefix = token[:-1]
+            if self._sorted_terms is None:
+                self._sorted_terms = sorted(self.terms)
+            bits = 0
+            for i in range(bisect_left(self._sorted_terms, prefix), len(self._sorted_terms)):
+                term = self._sorted_terms[i]
+                if not term.startswith(prefix):
+                    break
+                bits |= self.terms[term]
+            return bits
+        if token in self.terms:
+            return self.terms[token]
+        kind, _, value = token.partition(":")
+        if kind == "perm" and "." not in value:
+            return self.terms.get(f"perm:{PERMISSION_NS}{value}", 0)
+        return 0
+
+    def evaluate(self, expression: str) -> int:
+        self.tokens = TOKEN.findall(expression)
+        self.pos = 0
+        bits = self._or()
+        if self.pos != len(self.tokens):
+            raise ValueError(f"Beklenmeyen ifade: {' '.join(self.tokens[self.pos:])}")
+        return bits
+
+    def _peek(self):
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else None
+
+    def _or(self) -> int:
+        bits = self._and()
+        while self._peek() in ("|", "OR"):
+            self.pos += 1
+            bits |= self._and()
+        return bits
+
+    def _and(self) -> int:
+        bits = self._not()
+        while self._peek() not in (None, ")", "|", "OR"):
+            if self._peek() in ("&", "AND"):
+                self.pos += 1
+            bits &= self._not()
+        return bits
+
+    def _not(self) -> int:
+        if self._peek() in ("!", "NOT"):
+            self.pos += 1
+            return self.universe & ~self._not()
+        return self._atom()
+
+    def _atom(self) -> int:
+        token = self._peek()
+        if token is None:
+            raise ValueError("İfade eksik")
+        if token in OPERATORS:
+            raise ValueError(f"Terim bekleniyordu, '{token}' bulundu")
+        self.pos += 1
+        if token == "(":
+            bits = self._or()
+            if self._peek() != ")":
+                raise ValueError("Kapanmayan parantez")
+            self.pos += 1
+            return bits
+        return self.term(token)
+
+    def docs(self, bits: int):
+        """Bit kümesindeki APK kayıtları (docs sırasıyla)."""
+        found = []
+        while bits:
+            low = bits & -bits
+            found.append(self.index["docs"][low.bit_length() - 1])
+            bits ^= low
+        return found
+
+# =========================
+# MAIN
+# =========================
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Veriseti için izin / bileşen / native kütüphane ters indeksi")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_build = sub.add_parser("build", help="İndeksi sonuç dizinlerinden üretir")
+    p_build.add_argument("results_roots", nargs="+")
+    p_build.add_argument("-o", "--output", required=True, help="İndeks dosyası (.json.gz)")
+    p_build.add_argument("--no-raw", action="store_true", help="lib/abi/pkg terimlerini üretme")
+
+    p_query = sub.add_parser("query", help="Boolean sorgu")
+    p_query.add_argument("index")
+    p_query.add_argument("expression")
+    p_query.add_argument("--count", action="store_true", help="Yalnızca eşleşen APK sayısını yaz")
+
+    p_terms = sub.add_parser("terms", help="Terimleri ve APK sayılarını listeler")
+    p_terms.add_argument("index")
+    p_terms.add_argument("prefix", nargs="?", default="")
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        index = build_index(args.results_roots, not args.no_raw)
+        write_index(index, args.output)
+        print(f"[✓] {len(index['docs'])} APK, {len(index['terms'])} terim: {args.output}")
+        return
+
+    index = load_index(args.index)
+    if args.command == "terms":
+        for term, bits in sorted(index["terms"].items()):
+            if term.startswith(args.prefix):
+                print(f"{bin(bits).count('1')}\t{term}")
+        return
+
+    query = Query(index)
+    start = time.perf_counter()
+    try:
+        bits = query.evaluate(args.expression)
+    except ValueError as e:
+        parser.error(str(e))
+    elapsed = (time.perf_counter() - start) * 1000
+    if not args.count:
+        for doc in query.docs(bits):
+            print(f"{doc['set']}\t{doc['apk_name']}")
+    print(f"[✓] {bin(bits).count('1')} APK ({elapsed:.3f} ms)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+import os
+import json
+import argparse
+from collections import Counter
+
+from ham_ozellik import load_raw_features
+from sonuc_deposu import result_dirs
+
+# =========================
+# CONFIG
+# =========================
+PREFIX_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "kutuphane_onekleri.txt")
+SEED_DEPTH = 3                                  #En fazla kaç paket seviyesine kadar önek aranır
+SEED_MIN_APPS = 10                              #Bir önekin kütüphane sayılması için geçtiği farklı uygulama sayısı
+
+# Tek başına kütüphane sayılamayacak kadar genel kök paketler (2 harfli ülke kökleri ayrıca elenir)
+GENERIC_ROOTS = {"com", "org", "net", "edu", "gov", "app", "dev", "info"}
+# Ülke kökü altındaki ikinci düzey alan adları (jp.co, uk.co, ac.uk ...): o ülkedeki her şirketin kendi
+# kodunu kapsar, kütüphane sayılmak için bir segment daha gerekir (jp.co.cyberagent gibi).
+GENERIC_SECOND_LEVEL = {"co", "ac", "or", "ne", "com", "org", "net", "gov", "edu"}
+# Çok sayıda uygulamada geçse de uygulamanın kendi kodu olan ad alanları (alt paketleri dahil):
+# com.example Android Studio’nun varsayılan paketi, atakplugin Military’deki ATAK eklentilerinin kendi kodu.
+APP_NAMESPACES = {("com", "example"), ("atakplugin",)}
+
+# =========================
+# LIBRARY INDEX
+# =========================
+def package_parts(rel_path: str):
+    """'com/google/gson/Gson.java' -> ('com', 'google', 'gson')"""
+    return tuple(rel_path.replace(os.sep, "/").split("/")[:-1])
+
+
+class LibraryIndex:
+    """Paket öneki kümesi; bir kaynak dosyanın kütüphane koduna ait olup olmadığını söyler."""
+
+    def __init__(self, prefixes):
+        self.prefixes = {tuple(p.split(".")) for p in prefixes}
+        self.max_depth = max((len(p) for p in self.prefixes), default=0)
+
+    def is_library(self, rel_path: str) -> bool:
+        parts = package_parts(rel_path)
+        for depth in range(1, min(len(parts), self.max_depth) + 1):
+            if parts[:depth] in self.prefixes:
+                return True
+        return False
+
+
+def load_prefixes(path: str = PREFIX_FILE):
+    """Önek dosyasını okur (satır başına bir paket, '#' ile başlayan satırlar yorumdur)."""
+    prefixes = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.split("#", 1)[0].strip()
+            if line:
+                prefixes.append(line)
+    return prefixes
+
+# =========================
+# SEEDING
+# Mevcut sonuç klasörlerindeki java_files listelerinden, çok sayıda farklı uygulamada
+# (uygulamanın kendi paketi dışında) görülen paket öneklerini çıkarır.
+# =========================
+def _is_obfuscated(parts) -> bool:
+    #R8/ProGuard kökleri (a, a0, Z1 ...) farklı uygulamalarda tesadüfen çakışır.
+    root = parts[0]
+    short_root = len(root) <= 2 and not (root.isalpha() and root.islower())
+    return any(len(p) <= 1 for p in parts) or short_root or root == "defpackage"
+
+
+def _is_generic(prefix) -> bool:
+    if len(prefix) == 1:
+        return prefix[0] in GENERIC_ROOTS or len(prefix[0]) <= 2
+    return len(prefix) == 2 and len(prefix[0]) == 2 and prefix[1] in GENERIC_SECOND_LEVEL
+
+
+def seed_prefixes(results_root: str, depth: int = SEED_DEPTH, min_apps: int = SEED_MIN_APPS):
+    counts = Counter()
+    apps = 0
+    seen_apks = set()
+
+    for _, apk_dir in result_dirs(results_root):    #Veriseti/3_davranisli_sonuclar altındaki tüm APK klasörleri
+        #Aynı APK’nin ikinci analiz klasörü (ör. Popular_result/<SHA>) uygulama sayısını şişirmesin.
+        if os.path.basename(apk_dir) in seen_apks:
+            continue
+        seen_apks.add(os.path.basename(apk_dir))
+        try:
+            java_files = load_raw_features(apk_dir).get("java_files", [])
+            with open(os.path.join(apk_dir, "summary.json"), encoding="utf-8") as f:
+                package = json.load(f).get("metadata", {}).get("package_name") or ""
+        except (OSError, ValueError):
+            continue
+
+        own = tuple(package.split("."))
+        seen = set()
+        for rel_path in java_files:
+            parts = package_parts(rel_path)
+            for d in range(1, min(len(parts), depth) + 1):
+                prefix = parts[:d]
+                #Uygulamanın kendi paketi (veya onu kapsayan önek) kütüphane sayılmaz.
+                if own[:d] == prefix:
+                    continue
+                seen.add(prefix)
+        counts.update(seen)
+        apps += 1
+
+    selected = set()
+    #Sıralı gezinmede üst önekler alt öneklerden önce gelir.
+    for prefix, n in sorted(counts.items()):
+        if _is_generic(prefix) or any(prefix[:d] in APP_NAMESPACES for d in range(1, len(prefix) + 1)):
+            continue
+        if n < min_apps or _is_obfuscated(prefix):
+            continue
+        #Daha kısa bir üst önek zaten seçildiyse alt önek gereksizdir.
+        if any(prefix[:d] in selected for d in range(1, len(prefix))):
+            continue
+        selected.add(prefix)
+
+    return [".".join(p) for p in sorted(selected)], apps
+
+
+def write_prefixes(prefixes, path: str, apps: int, min_apps: int):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("# Kütüphane paket önekleri (kutuphane_onekleri.py seed ile üretildi, elle düzenlenebilir)\n")
+        f.write(f"# Kaynak: {apps} APK, en az {min_apps} farklı uygulamada görülen önekler\n")
+        for prefix in prefixes:
+            f.write(prefix + "\n")
+
+# =========================
+# MAIN
+# =========================
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Kütüphane paket öneki indeksini üretir")
+    parser.add_argument("results_root", help="Veriseti/3_davranisli_sonuclar dizini")
+    parser.add_argument("-o", "--output", default=PREFIX_FILE, help="Önek dosyası")
+    parser.add_argument("--depth", type=int, default=SEED_DEPTH)
+    parser.add_argument("--min-apps", type=int, default=SEED_MIN_APPS)
+    args = parser.parse_args(argv)
+
+    prefixes, apps = seed_prefixes(args.results_root, args.depth, args.min_apps)
+    write_prefixes(prefixes, args.output, apps, args.min_apps)
+    print(f"[✓] {len(prefixes)} önek yazıldı ({apps} APK tarandı): {args.output}")
+
+if __name__ == "__main__":
+    main()
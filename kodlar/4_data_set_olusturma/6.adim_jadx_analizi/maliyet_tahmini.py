@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+import os
+import csv
+from statistics import median
+
+from sonuc_deposu import load_manifest
+
+# =========================
+# CONFIG
+# =========================
+SELECTION_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                             "..", "..", "3_kriterlerle_apk_secimi_ve_indirme")
+SIZE_CSVS = [                                   #AndroZoo satırları (sha256, apk_size, dex_size)
+    os.path.join(SELECTION_DIR, "3_3_balanced_benign.csv"),
+    os.path.join(SELECTION_DIR, "3_3_balanced_malware.csv"),
+    os.path.join(SELECTION_DIR, "3_4_popular_uygulamalar.csv"),
+    os.path.join(SELECTION_DIR, "3_5_4_askeri_uygulama_APKları.csv"),
+]
+
+JADX_TIMEOUT = 600                              #Geçmiş veri yokken kullanılan sabit JADX zaman aşımı (sn)
+TIMEOUT_FACTOR = 3.0                            #Zaman aşımı = tahmin × katsayı + pay
+TIMEOUT_MARGIN = 60
+TIMEOUT_MIN = 120
+TIMEOUT_MAX = 3600
+MIN_HISTORY = 20                                #Modelin kullanılması için gereken başarılı JADX örneği
+DEX_RATIO_DEFAULT = 0.4                         #dex_size bilinmiyorsa dex_size ≈ apk_size × oran
+
+# =========================
+# COST MODEL
+# JADX süresi dex boyutuyla yaklaşık doğrusal artar: süre ≈ a + b × dex_size.
+# Katsayılar manifest.jsonl’deki önceki JADX süreleri (duration_sec) ve boyutlarından öğrenilir.
+# =========================
+def load_size_hints(csv_paths):
+    """{sha256 (küçük harf): (apk_size, dex_size)} — AndroZoo CSV’lerinden."""
+    hints = {}
+    for path in csv_paths:
+        try:
+            with open(path, newline="", encoding="utf-8") as f:
+                for row in csv.DictReader(f):
+                    try:
+                        hints[row["sha256"].lower()] = (int(row["apk_size"]), int(row["dex_size"]))
+                    except (KeyError, ValueError, AttributeError):
+                        continue
+        except OSError:
+            continue
+    return hints
+
+
+def history_samples(out_dirs, hints=None):
+    """Başarılı JADX çalıştırmalarından (dex_size, duration_sec) örnekleri — manifest.jsonl’den.
+    Boyutu olmayan eski kayıtlar için: sonuc_deposu.py <dizin> --rebuild."""
+    hints = hints or {}
+    samples = []
+    for out_dir in out_dirs:
+        for record in load_manifest(out_dir).values():
+            if record.get("jadx_status") != "ok" or record.get("archive_reused") or not record.get("duration_sec"):
+                continue
+            dex_size = record.get("dex_size")
+            if dex_size is None:
+                dex_size = hints.get((record.get("sha256") or "").lower(), (0, None))[1]
+            if not dex_size and record.get("apk_size"):
+                dex_size = int(record["apk_size"] * DEX_RATIO_DEFAULT)
+            if dex_size:
+                samples.append((dex_size, record["duration_sec"]))
+    return samples
+
+
+class CostModel:
+    """APK başına JADX süresi tahmini ve buna göre zaman aşımı."""
+
+    def __init__(self, hints: dict, samples):
+        self.hints = hints
+        ratios = [dex / apk for apk, dex in hints.values() if apk > 0 and dex > 0]
+        self.dex_ratio = median(ratios) if ratios else DEX_RATIO_DEFAULT
+
+        self.samples = len(samples)
+        self.intercept = self.slope = None
+        if len(samples) >= MIN_HISTORY:
+            #En küçük kareler (tek değişkenli doğrusal regresyon)
+            xs = [x for x, _ in samples]
+            ys = [y for _, y in samples]
+            mx, my = sum(xs) / len(xs), sum(ys) / len(ys)
+            var = sum((x - mx) ** 2 for x in xs)
+            if var > 0:
+                self.slope = max(0.0, sum((x - mx) * (y - my) for x, y in samples) / var)
+                self.intercept = max(0.0, my - self.slope * mx)
+
+    def dex_size(self, apk_path: str) -> int:
+        apk_name = os.path.basename(apk_path).replace(".apk", "").lower()
+        dex_size = self.hints.get(apk_name, (0, 0))[1]
+        if dex_size:
+            return dex_size
+        try:
+            return int(os.path.getsize(apk_path) * self.dex_ratio)
+        except OSError:
+            return 0
+
+    def predict(self, apk_path: str):
+        """Tahmini JADX süresi (sn); yeterli geçmiş yoksa None."""
+        if self.slope is None:
+            return None
+        return self.intercept + self.slope * self.dex_size(apk_path)
+
+    def timeout(self, apk_path: str) -> int:
+        predicted = self.predict(apk_path)
+        if predicted is None:
+            return JADX_TIMEOUT
+        return int(min(TIMEOUT_MAX, max(TIMEOUT_MIN, predicted * TIMEOUT_FACTOR + TIMEOUT_MARGIN)))
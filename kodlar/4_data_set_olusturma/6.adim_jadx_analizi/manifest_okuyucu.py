@@ -0,0 +1,370 @@
+#!/usr/bin/env python3
+import os
+import re
+import time
+import struct
+import zipfile
+import argparse
+
+# =========================
+# CONFIG
+# =========================
+MANIFEST_NAME = "AndroidManifest.xml"
+ANDROID_NS = "{http://schemas.android.com/apk/res/android}"
+
+RES_STRING_POOL_TYPE = 0x0001
+RES_XML_FIRST_CHUNK_TYPE = 0x0100
+RES_XML_START_ELEMENT_TYPE = 0x0102
+RES_XML_END_ELEMENT_TYPE = 0x0103
+RES_XML_LAST_CHUNK_TYPE = 0x017F
+RES_XML_RESOURCE_MAP_TYPE = 0x0180
+UTF8_FLAG = 1 << 8
+NO_INDEX = 0xFFFFFFFF
+
+TYPE_REFERENCE, TYPE_ATTRIBUTE, TYPE_STRING, TYPE_FLOAT = 0x01, 0x02, 0x03, 0x04
+TYPE_INT_DEC, TYPE_INT_HEX, TYPE_INT_BOOLEAN = 0x10, 0x11, 0x12
+TYPE_FIRST_COLOR_INT, TYPE_LAST_COLOR_INT, TYPE_LAST_INT = 0x1C, 0x1F, 0x1F
+
+# Okunan android: öznitelikleri (kaynak haritasındaki sistem kimlikleri)
+SYSTEM_ATTRS = {
+    0x01010003: "name",
+    0x0101020C: "minSdkVersion",
+    0x0101021B: "versionCode",
+    0x0101021C: "versionName",
+    0x01010270: "targetSdkVersion",
+}
+COMPONENT_TAGS = {"uses-permission": "permissions", "activity": "activities",
+                  "service": "services", "receiver": "receivers"}
+
+VALID_NAME = re.compile(r"^[A-Za-z_][A-Za-z0-9._-]*$")
+INVALID_CHARS = re.compile("[^\u0020-\uD7FF\u0009\u000A\u000D\uE000-\uFFFD\U00010000-\U0010FFFF]")
+
+# =========================
+# BINARY AXML
+# APK’den yalnızca AndroidManifest.xml okunur ve ikili XML doğrudan çözülür; XML ağacı,
+# kaynak tablosu (resources.arsc) ve dex hiç kurulmaz. Alan değerleri androguard APK ile
+# aynı biçimde üretilir (ör. versionCode "35", referanslar "@7F0F0001").
+# Paketleyici izleri (kaynak haritasıyla çelişen öznitelik adı, ":" içeren veya geçersiz
+# adlar, sıkıştırılmış/bozuk başlıklar) ValueError verir; çağıran androguard’a düşer.
+# =========================
+class _StringPool:
+    def __init__(self, data: bytes, start: int):
+        header_size, size = struct.unpack_from("<HI", data, start + 2)
+        count, style_count, flags, strings_start, styles_start = struct.unpack_from("<5I", data, start + 8)
+        if header_size != 0x1C or strings_start != 28 + 4 * (count + style_count):
+            raise ValueError("String pool başlığı beklenmedik")
+        self.data = data
+        self.offsets = struct.unpack_from(f"<{count}I", data, start + 28)
+        self.base = start + strings_start
+        self.end = start + (styles_start if styles_start and style_count else size)
+        self.utf8 = bool(flags & UTF8_FLAG)
+        self.cache = {}
+
+    def __getitem__(self, idx: int) -> str:
+        if idx in self.cache:
+            return self.cache[idx]
+        if idx >= len(self.offsets):
+            return ""
+        value = self._decode8(self.base + self.offsets[idx]) if self.utf8 else self._decode16(self.base + self.offsets[idx])
+        self.cache[idx] = value
+        return value
+
+    def _decode8(self, pos: int) -> str:
+        data = self.data
+        pos += 2 if data[pos] & 0x80 else 1                     #UTF-16 uzunluğu (kullanılmaz)
+        n = data[pos]
+        if n & 0x80:
+            n = ((n & 0x7F) << 8) | data[pos + 1]
+            pos += 2
+        else:
+            pos += 1
+        if pos + n >= self.end or data[pos + n] != 0:
+            return ""                                           #androguard ile aynı: geçersiz dizge boş sayılır
+        return data[pos:pos + n].decode("utf-8", "replace")
+
+    def _decode16(self, pos: int) -> str:
+        (n,) = struct.unpack_from("<H", self.data, pos)
+        if n & 0x8000:
+            n = ((n & 0x7FFF) << 16) | struct.unpack_from("<H", self.data, pos + 2)[0]
+            pos += 4
+        else:
+            pos += 2
+        end = pos + 2 * n
+        if end > self.end:
+            return ""
+        if self.data[end:end + 2] != b"\x00\x00":
+            raise ValueError("UTF-16 dizge sonlandırılmamış")
+        return self.data[pos:end].decode("utf-16", "replace")
+
+
+def _format_value(value_type: int, data: int, raw: int, strings: _StringPool) -> str:
+    if value_type == TYPE_STRING:
+        value = strings[raw]
+        if "\x00" in value:
+            raise ValueError("Öznitelik değerinde boş bayt")
+        return INVALID_CHARS.sub("_", value)
+    if value_type in (TYPE_REFERENCE, TYPE_ATTRIBUTE):
+        prefix = "@" if value_type == TYPE_REFERENCE else "?"
+        return f"{prefix}{'android:' if data >> 24 == 1 else ''}{data:08X}"
+    if value_type == TYPE_FLOAT:
+        return "%f" % struct.unpack("=f", struct.pack("=L", data))[0]
+    if value_type == TYPE_INT_HEX:
+        return "0x%08X" % data
+    if value_type == TYPE_INT_BOOLEAN:
+        return "false" if data == 0 else "true"
+    if TYPE_FIRST_COLOR_INT <= value_type <= TYPE_LAST_COLOR_INT:
+        return "#%08X" % data
+    if TYPE_INT_DEC <= value_type <= TYPE_LAST_INT:
+        return "%d" % (data - 0x100000000 if data > 0x7FFFFFFF else data)
+    raise ValueError(f"Desteklenmeyen değer tipi 0x{value_type:02X}")
+
+
+def _qualified(uri: str, name: str) -> str:
+    if not VALID_NAME.match(name):
+        raise ValueError(f"Geçersiz ad: {name!r}")
+    return f"{{{uri}}}{name}" if uri else name
+
+
+def iter_elements(data: bytes):
+    """(derinlik, etiket, {öznitelik: değer}) üçlüleri; ad alanlı adlar {uri}ad biçimindedir."""
+    if len(data) < 8:
+        raise ValueError("AXML çok kısa")
+    header_size, file_size = struct.unpack_from("<HI", data, 2)
+    if header_size != 8 or file_size > len(data):
+        raise ValueError("AXML başlığı geçersiz")
+    if struct.unpack_from("<H", data, 8)[0] != RES_STRING_POOL_TYPE:
+        raise ValueError("String pool bulunamadı")
+    strings = _StringPool(data, 8)
+    resource_ids = ()
+
+    pos = 8 + struct.unpack_from("<I", data, 12)[0]
+    depth = 0
+    seen_root = False
+    while pos < file_size:
+        chunk_type, header_size, size = struct.unpack_from("<HHI", data, pos)
+        if header_size < 8 or size < header_size or pos + size > file_size:
+            raise ValueError(f"Bozuk chunk (0x{pos:x})")
+
+        if chunk_type == RES_XML_RESOURCE_MAP_TYPE:
+            if header_size != 8 or size % 4:
+                raise ValueError("Kaynak haritası geçersiz")
+            resource_ids += struct.unpack_from(f"<{(size - 8) // 4}I", data, pos + 8)
+        elif RES_XML_FIRST_CHUNK_TYPE <= chunk_type <= RES_XML_LAST_CHUNK_TYPE and header_size == 0x10:
+            if chunk_type == RES_XML_START_ELEMENT_TYPE:
+                ns, name, attr_start, attr_size, attr_count = struct.unpack_from("<IIHHH", data, pos + 16)
+                tag = strings[name]
+                if tag:
+                    if seen_root and depth == 0:
+                        break                                   #Kökten sonra ikinci kök: androguard da burada durur
+                    if attr_start != 20 or attr_size < 20:
+                        raise ValueError("Öznitelik düzeni beklenmedik")
+                    attrs = {}
+                    for i in range(attr_count):
+                        a_ns, a_name, a_raw, a_type, a_data = struct.unpack_from(
+                            "<IIIxxxBI", data, pos + 36 + i * attr_size)
+                        attr = strings[a_name]
+                        resource_id = resource_ids[a_name] if a_name < len(resource_ids) else None
+                        system_name = SYSTEM_ATTRS.get(resource_id)
+                        if system_name is not None and system_name != attr:
+                            raise ValueError("Öznitelik adı kaynak haritasıyla çelişiyor")
+                        if system_name is None and resource_id is not None and resource_id >> 16 == 0x0101 \
+                                and attr in SYSTEM_ATTRS.values():
+                            raise ValueError("Öznitelik adı kaynak haritasıyla çelişiyor")
+                        if not attr:
+                            continue
+                        key = _qualified(strings[a_ns] if a_ns != NO_INDEX else "", attr)
+                        attrs[key] = _format_value(a_type, a_data, a_raw, strings)
+                    yield depth, _qualified(strings[ns] if ns != NO_INDEX else "", tag), attrs
+                    seen_root = True
+                    depth += 1
+            elif chunk_type == RES_XML_END_ELEMENT_TYPE:
+                if depth == 0:
+                    raise ValueError("Fazla kapanış etiketi")
+                if strings[struct.unpack_from("<I", data, pos + 20)[0]]:
+                    depth -= 1
+        pos += size
+    if pos > file_size:
+        raise ValueError("Chunk dosya sonunu aşıyor")
+
+# =========================
+# METADATA
+# APK_inceleme_aciklamali.py’deki metadata sözlüğünün aynısı (androguard APK kurallarıyla):
+#   - android:ad yoksa (veya boşsa) ad alanısız ad kullanılır
+#   - izin / bileşen adları ".Ad" veya "Ad" ise paket adıyla tamamlanır
+#   - uses-sdk gibi tekil alanlarda ilk bulunan değer alınır
+# =========================
+def _attr(attrs: dict, name: str):
+    return attrs.get(ANDROID_NS + name) or attrs.get(name)
+
+
+def _with_package(value: str, package: str) -> str:
+    if value and package:
+        if value.startswith("."):
+            return package + value
+        if "." not in value:
+            return f"{package}.{value}"
+    return value
+
+
+def parse_manifest(data: bytes) -> dict:
+    elements = iter_elements(data)
+    try:
+        _, root_tag, root = next(elements)
+    except StopIteration:
+        raise ValueError("Manifest boş")
+    if root_tag != "manifest":
+        raise ValueError("Kök etiket <manifest> değil")
+
+    package = root.get(ANDROID_NS + "package") or root.get("package")
+    sdk = {"minSdkVersion": None, "targetSdkVersion": None}
+    names = {key: [] for key in COMPONENT_TAGS.values()}
+    for _, tag, attrs in elements:
+        if tag.startswith(ANDROID_NS):
+            tag = tag[len(ANDROID_NS):]
+        if tag == "uses-sdk":
+            for key in sdk:
+                if sdk[key] is None:
+                    sdk[key] = _attr(attrs, key)
+        elif tag in COMPONENT_TAGS:
+            value = _attr(attrs, "name")
+            if value is not None:
+                names[COMPONENT_TAGS[tag]].append(_with_package(value, package))
+
+    return {
+        "package_name": package,
+        "version_code": _attr(root, "versionCode"),
+        "version_name": _attr(root, "versionName"),
+        "min_sdk": sdk["minSdkVersion"],
+        "target_sdk": sdk["targetSdkVersion"],
+        "permissions": sorted(set(names["permissions"])),
+        "activities": sorted(names["activities"]),
+        "services": sorted(names["services"]),
+        "receivers": sorted(names["receivers"]),
+    }
+
+
+def decode_manifest(data: bytes) -> dict:
+    """Önceden okunmuş AndroidManifest.xml baytlarından metadata; çözülemezse ValueError."""
+    try:
+        return parse_manifest(data)
+    except (struct.error, IndexError) as e:
+        raise ValueError(f"AXML kesik: {e}")
+
+
+def read_manifest(apk_path: str) -> dict:
+    """Yalnızca AndroidManifest.xml okunarak metadata; çözülemeyen manifestlerde ValueError."""
+    try:
+        with zipfile.ZipFile(apk_path) as z:
+            data = z.read(MANIFEST_NAME)
+    except KeyError:
+        raise ValueError("AndroidManifest.xml yok")
+    except zipfile.BadZipFile as e:
+        raise ValueError(str(e))
+    return decode_manifest(data)
+
+
+def androguard_metadata(apk_path: str) -> dict:
+    """Aynı sözlük, androguard APK ile (yavaş yol)."""
+    try:
+        from androguard.core.apk import APK
+    except ImportError:
+        from androguard.core.bytecodes.apk import APK
+
+    a = APK(apk_path)
+    return {
+        "package_name": a.get_package(),
+        "version_code": a.get_androidversion_code(),
+        "version_name": a.get_androidversion_name(),
+        "min_sdk": a.get_min_sdk_version(),
+        "target_sdk": a.get_target_sdk_version(),
+        "permissions": sorted(a.get_permissions()),
+        "activities": sorted(a.get_activities()),
+        "services": sorted(a.get_services()),
+        "receivers": sorted(a.get_receivers())
+    }
+
+
+def manifest_metadata(apk_path: str, data: bytes = None) -> dict:
+    """Hızlı yol; manifest çözülemezse androguard’a düşer.
+
+    data: APK’nin zaten açık ZipFile’ından okunmuş manifest baytları (verilirse APK yeniden açılmaz).
+    """
+    try:
+        return read_manifest(apk_path) if data is None else decode_manifest(data)
+    except ValueError:
+        return androguard_metadata(apk_path)
+
+# =========================
+# BENCHMARK
+# Aynı APK’ler üzerinde hızlı çözücü, androguard APK ve (istenirse) AnalyzeAPK süreleri;
+# hızlı yolun sonucu androguard APK ile alan alan karşılaştırılır.
+# =========================
+def _timed(func, *args):
+    start = time.perf_counter()
+    try:
+        result = func(*args)
+    except Exception as e:
+        result = e
+    return result, time.perf_counter() - start
+
+
+def _analyze_apk_metadata(apk_path: str) -> dict:
+    from androguard.misc import AnalyzeAPK
+    a, _, _ = AnalyzeAPK(apk_path)
+    return {"package_name": a.get_package()}
+
+
+def benchmark(apk_paths, with_analyze: bool = False) -> dict:
+    totals = {"fast": 0.0, "apk": 0.0, "analyze": 0.0}
+    counts = {"apk": 0, "fast_ok": 0, "fallback": 0, "mismatch": 0}
+    for apk_path in apk_paths:
+        fast, t_fast = _timed(read_manifest, apk_path)
+        slow, t_apk = _timed(androguard_metadata, apk_path)
+        totals["fast"] += t_fast
+        totals["apk"] += t_apk
+        if with_analyze:
+            totals["analyze"] += _timed(_analyze_apk_metadata, apk_path)[1]
+        counts["apk"] += 1
+
+        if isinstance(fast, Exception):
+            counts["fallback"] += 1
+            print(f"[-] {os.path.basename(apk_path)}: hızlı yol kullanılamadı ({fast})")
+        elif isinstance(slow, Exception) or fast != slow:
+            counts["mismatch"] += 1
+            diff = [k for k in fast if isinstance(slow, Exception) or fast[k] != slow.get(k)]
+            print(f"[!] {os.path.basename(apk_path)}: androguard ile fark: {diff or slow}")
+        else:
+            counts["fast_ok"] += 1
+    return {"totals": totals, "counts": counts}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="AndroidManifest.xml hızlı çözücü: androguard APK / AnalyzeAPK karşılaştırması")
+    parser.add_argument("apk_dirs", nargs="+", help="APK dizinleri (alt dizinler dahil)")
+    parser.add_argument("--limit", type=int, default=0, help="En fazla bu kadar APK (0 = tümü)")
+    parser.add_argument("--analyze", action="store_true", help="AnalyzeAPK (dex analizi dahil) süresini de ölç")
+    args = parser.parse_args(argv)
+
+    apk_paths = []
+    for apk_dir in args.apk_dirs:
+        for root, _, files in os.walk(apk_dir):
+            apk_paths.extend(os.path.join(root, f) for f in sorted(files) if f.endswith(".apk"))
+    apk_paths.sort()
+    if args.limit:
+        apk_paths = apk_paths[:args.limit]
+    if not apk_paths:
+        parser.error("APK bulunamadı")
+
+    result = benchmark(apk_paths, args.analyze)
+    n = result["counts"]["apk"]
+    print(f"[*] {n} APK | aynı: {result['counts']['fast_ok']}, "
+          f"androguard’a düşen: {result['counts']['fallback']}, farklı: {result['counts']['mismatch']}")
+    for key, label in (("fast", "manifest_okuyucu"), ("apk", "androguard APK"), ("analyze", "AnalyzeAPK")):
+        if key == "analyze" and not args.analyze:
+            continue
+        total = result["totals"][key]
+        print(f"[✓] {label:<17}: toplam {total:.2f} sn, APK başına {total / n * 1000:.1f} ms "
+              f"(x{total / max(result['totals']['fast'], 1e-9):.0f})")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+import os
+import gzip             #gzip: indeks dosyası sıkıştırılmış saklanır
+import json
+
+from sonuc_deposu import atomic_path
+
+# =========================
+# METHOD INDEX
+# APK başına çağrılan tüm metot adlarının dosya bazlı sayımı. AST_TARGETS değiştiğinde
+# ast_analysis, JADX tekrar çalıştırılmadan bu indeksten yeniden hesaplanır.
+#
+# Biçim (method_index.json.gz):
+#   {"format": 1, "engine": "jadx", "files": [rel_path, ...],
+#    "methods": {metot_adı: [dosya_no, sayı, dosya_no, sayı, ...]}}
+# =========================
+INDEX_FILE = "method_index.json.gz"
+INDEX_FORMAT = 1
+
+
+def build_method_index(java_files, methods_per_file, engine: str) -> dict:
+    """Dosya sırasına göre {metot: [dosya_no, sayı, ...]} ters indeksini üretir."""
+    methods = {}
+    for file_no, counts in enumerate(methods_per_file):
+        for name, count in counts.items():
+            methods.setdefault(name, []).extend((file_no, count))
+    return {"format": INDEX_FORMAT, "engine": engine, "files": list(java_files), "methods": methods}
+
+
+def write_method_index(output_dir: str, index: dict):
+    with atomic_path(os.path.join(output_dir, INDEX_FILE)) as tmp_path, \
+            gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+        json.dump(index, f, separators=(",", ":"), ensure_ascii=False)
+
+
+def load_method_index(output_dir: str) -> dict:
+    with gzip.open(os.path.join(output_dir, INDEX_FILE), "rt", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def hits_from_index(index: dict, ast_index: dict):
+    """İndeksten dosya bazlı {kategori: sayı} listesini (files sırasıyla) üretir."""
+    results = [{} for _ in index["files"]]
+    for name, cats in ast_index.items():
+        postings = index["methods"].get(name)
+        if not postings:
+            continue
+        for i in range(0, len(postings), 2):
+            hits = results[postings[i]]
+            for cat in cats:
+                hits[cat] = hits.get(cat, 0) + postings[i + 1]
+    return results
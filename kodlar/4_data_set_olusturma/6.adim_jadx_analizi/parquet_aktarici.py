@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+import os
+import json
+import glob
+import time
+import argparse
+
+import pyarrow as pa            #pyarrow: kolon bazlı tablo ve Parquet yazımı
+import pyarrow.parquet as pq
+
+from ham_ozellik import has_raw_features, load_raw_features
+from sonuc_deposu import result_dirs
+
+# =========================
+# CONFIG
+# =========================
+PART_PATTERN = "part-{:05d}.parquet"
+KEY_COLUMNS = ["set", "apk_name"]               #Ekleme modunda tekrar yazılmaması gereken satır anahtarı
+
+# Düz sütunlara açılacak summary.json blokları
+FLAT_BLOCKS = ["metadata", "stats", "jadx", "ast_analysis", "ast_analysis_by_origin",
+               "behavioral_structural_data"]
+
+# =========================
+# FLATTEN
+# İç içe sözlükler "blok.alt.anahtar" sütunlarına açılır; listeler liste sütunu olarak kalır.
+# =========================
+def _flatten(prefix: str, value, row: dict):
+    if isinstance(value, dict):
+        for key, sub in value.items():
+            _flatten(f"{prefix}.{key}", sub, row)
+    else:
+        row[prefix] = value
+
+
+def flatten_result(apk_dir: str, label: str, with_raw: bool = True) -> dict:
+    """Bir APK klasörünü (summary.json + raw_features.json) tek satıra çevirir."""
+    with open(os.path.join(apk_dir, "summary.json"), encoding="utf-8") as f:
+        summary = json.load(f)
+
+    row = {"set": label}
+    metadata = summary.get("metadata") or {}
+    #permission_details sözlüğü izin başına sütun üretmesin: permissions ile hizalı liste olur.
+    details = metadata.pop("permission_details", None)
+    if details is not None:
+        metadata["permission_levels"] = [details.get(p, "unknown") for p in metadata.get("permissions", [])]
+
+    for key, value in summary.items():
+        if key in FLAT_BLOCKS:
+            _flatten(key, value, row)
+        elif not isinstance(value, dict):
+            row[key] = value
+
+    if with_raw and has_raw_features(apk_dir):
+        raw = load_raw_features(apk_dir)
+        row["raw.java_files"] = raw.get("java_files", [])
+        row["raw.native_libs"] = raw.get("native_libs", [])
+        row["raw.dex_files_count"] = raw.get("dex_files_count")
+        for cat, files in (raw.get("ast_hits_by_file") or {}).items():
+            row[f"raw.ast_hits_by_file.{cat}"] = files
+    return row
+
+
+# =========================
+# ARROW TABLE
+# =========================
+def _dictionary_list(values) -> pa.Array:
+    """list<string> sütununu list<dictionary<int32, string>> olarak kurar (tekrarlayan yollar/izinler tek kez saklanır)."""
+    offsets = [0]
+    flat = []
+    for items in values:
+        flat.extend(items or [])
+        offsets.append(len(flat))
+    mask = pa.array([items is None for items in values])
+    return pa.ListArray.from_arrays(pa.array(offsets, pa.int32()),
+                                    pa.array(flat, pa.string()).dictionary_encode(), mask=mask)
+
+
+def build_table(rows) -> pa.Table:
+    columns = []
+    for row in rows:
+        for key in row:
+            if key not in columns:
+                columns.append(key)
+
+    arrays = {}
+    for name in columns:
+        values = [row.get(name) for row in rows]
+        if any(isinstance(v, list) for v in values):
+            arrays[name] = _dictionary_list([[str(x) for x in v] if isinstance(v, list) else None
+                                             for v in values])
+            continue
+        try:
+            arrays[name] = pa.array(values)
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            #Karışık tipler (ör. sürüm kodu bazen sayı bazen metin) metne indirgenir.
+            arrays[name] = pa.array([None if v is None else str(v) for v in values], pa.string())
+        if pa.types.is_string(arrays[name].type):
+            arrays[name] = arrays[name].dictionary_encode()
+    return pa.table(arrays)
+
+# =========================
+# EXPORT / LOAD
+# Çıktı bir dizindir (part-00000.parquet, part-00001.parquet ...); ekleme modu yalnızca
+# yeni APK’leri yeni bir parça olarak yazar.
+# =========================
+def _parts(out_dir: str):
+    return sorted(glob.glob(os.path.join(out_dir, "part-*.parquet")))
+
+
+def exported_keys(out_dir: str) -> set:
+    keys = set()
+    for part in _parts(out_dir):
+        table = pq.read_table(part, columns=KEY_COLUMNS)
+        keys.update(zip(*(table.column(c).to_pylist() for c in KEY_COLUMNS)))
+    return keys
+
+
+def export(results_roots, out_dir: str, append: bool = False, with_raw: bool = True):
+    os.makedirs(out_dir, exist_ok=True)
+    if not append:
+        for part in _parts(out_dir):
+            os.remove(part)
+    done = exported_keys(out_dir) if append else set()
+
+    rows = []
+    for results_root in results_roots:
+        for label, apk_dir in result_dirs(results_root):
+            key = (label, os.path.basename(apk_dir))
+            if key in done:
+                continue                            #Daha önce yazılmış ya da başka bir sonuç kökünde zaten alınmış
+            try:
+                rows.append(flatten_result(apk_dir, label, with_raw))
+            except (OSError, ValueError) as e:
+                print(f"[!] {apk_dir}: {e}")
+                continue
+            done.add(key)
+
+    if not rows:
+        return None, 0
+    path = os.path.join(out_dir, PART_PATTERN.format(len(_parts(out_dir))))
+    pq.write_table(build_table(rows), path, compression="zstd")
+    return path, len(rows)
+
+
+def load_corpus(out_dir: str, columns=None) -> pa.Table:
+    """Tüm parçaları tek tabloda birleştirir (parçalar arasında eksik sütunlar null olur)."""
+    tables = [pq.read_table(part, columns=columns) for part in _parts(out_dir)]
+    if not tables:
+        return pa.table({})
+    return pa.concat_tables(tables, promote_options="permissive")
+
+# =========================
+# MAIN
+# =========================
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="summary.json / raw_features.json klasörlerini Parquet’e aktarır")
+    parser.add_argument("results_roots", nargs="+", help="Veriseti/3_davranisli_sonuclar gibi sonuç dizinleri")
+    parser.add_argument("-o", "--output", required=True, help="Parquet çıktı dizini")
+    parser.add_argument("--append", action="store_true", help="Yalnızca henüz aktarılmamış APK’leri ekle")
+    parser.add_argument("--no-raw", action="store_true", help="raw_features.json sütunlarını alma")
+    args = parser.parse_args(argv)
+
+    start = time.time()
+    path, count = export(args.results_roots, args.output, args.append, not args.no_raw)
+    if path is None:
+        print("[-] Eklenecek yeni APK yok.")
+    else:
+        print(f"[✓] {count} APK yazıldı: {path} ({time.time() - start:.1f} sn)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+import os
+import json
+import time
+import argparse
+from contextlib import contextmanager
+
+# =========================
+# CONFIG
+# =========================
+MANIFEST_FILE = "manifest.jsonl"               #Çıktı dizini kökünde, APK başına bir satır (yalnızca ekleme)
+SCHEMA_VERSION = 3                              #summary.json şema sürümü (manifest kayıtlarına yazılır)
+                                                #3: metadata.permission_details; risk_counts her zaman 5 anahtar (izin_seviyeleri.LEVELS)
+
+# =========================
+# ATOMIC WRITES
+# Dosya önce aynı dizinde geçici adla yazılır, diske alınır ve os.replace ile yerine konur;
+# çökme anında hedefte ya eski dosya ya da tam yeni dosya bulunur, yarım JSON kalmaz.
+# =========================
+@contextmanager
+def atomic_path(path: str):
+    """Yazılacak geçici yolu verir; blok hatasız biterse hedefe taşır."""
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        yield tmp_path
+        with open(tmp_path, "rb") as f:
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def write_json_atomic(path: str, data, indent: int = 4):
+    with atomic_path(path) as tmp_path:
+        with open(tmp_path, "w") as f:
+            json.dump(data, f, indent=indent, ensure_ascii=False)
+
+
+def read_json(path: str):
+    """JSON’u okur; dosya yoksa veya bozuksa None döner."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+# =========================
+# MANIFEST
+# Her tamamlanan APK için tek satırlık JSON kaydı eklenir. Resume, binlerce klasörü
+# stat etmek yerine bu dosyayı bir kez okur; aynı APK’nin son kaydı geçerlidir.
+# =========================
+def manifest_record(summary: dict) -> dict:
+    #jadx_status/archive_reused ve boyutlar maliyet modelinin geçmişi için (summary.json okunmadan)
+    jadx = summary.get("jadx") or {}
+    stats = summary.get("stats") or {}
+    return {
+        "apk_name": summary.get("apk_name"),
+        "sha256": summary.get("sha256"),
+        "state": summary.get("analysis_state"),
+        "duration_sec": jadx.get("duration_sec"),
+        "jadx_status": jadx.get("status"),
+        "archive_reused": bool(jadx.get("archive_reused")),
+        "apk_size": stats.get("apk_size"),
+        "dex_size": stats.get("dex_size"),
+        "schema": SCHEMA_VERSION,
+        "time": round(time.time(), 3),
+    }
+
+
+def append_manifest(out_dir: str, record: dict):
+    #O_APPEND + tek write çağrısı: eşzamanlı worker’ların satırları birbirine karışmaz.
+    line = (json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8")
+    fd = os.open(os.path.join(out_dir, MANIFEST_FILE), os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+    try:
+        os.write(fd, line)
+    finally:
+        os.close(fd)
+
+
+def load_manifest(out_dir: str) -> dict:
+    """{apk_name: son kayıt}; yarım kalmış son satır yok sayılır."""
+    records = {}
+    try:
+        with open(os.path.join(out_dir, MANIFEST_FILE), encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                records[record["apk_name"]] = record
+    except OSError:
+        pass
+    return records
+
+
+def rebuild_manifest(out_dir: str) -> int:
+    """Manifest’i mevcut klasörlerden yeniden üretir (okunamayan summary.json’lar dahil edilmez)."""
+    records = []
+    for apk_name in sorted(os.listdir(out_dir)):
+        summary = read_json(os.path.join(out_dir, apk_name, "summary.json"))
+        if isinstance(summary, dict):
+            summary.setdefault("apk_name", apk_name)
+            records.append(manifest_record(summary))
+
+    with atomic_path(os.path.join(out_dir, MANIFEST_FILE)) as tmp_path:
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            for record in records:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+    return len(records)
+
+
+def completed_apks(out_dir: str) -> set:
+    """Tamamlanmış APK adları; manifest yoksa klasörlerden bir kez üretilir."""
+    if not os.path.exists(os.path.join(out_dir, MANIFEST_FILE)) and os.path.isdir(out_dir):
+        rebuild_manifest(out_dir)
+    return set(load_manifest(out_dir))
+
+# =========================
+# RESULT DIRECTORIES
+# APK klasörleri summary.json aranarak bulunur (sabit derinlik varsayılmaz; ör. Popular_result_davranisli/
+# Popular_result/<SHA>/). Etiket, en yakın <Etiket>_result_davranisli üst klasöründen alınır;
+# aynı etiketteki yinelenen APK klasörlerinden yalnızca biri verilir (result_dirs).
+# =========================
+RESULT_SUFFIX = "_result_davranisli"
+
+
+def apk_dirs(results_root: str):
+    """summary.json içeren klasörler (deterministik sıra); bulunan klasörün altına inilmez."""
+    for root, dirs, files in os.walk(results_root):
+        dirs.sort()
+        if "summary.json" in files:
+            dirs.clear()
+            yield root
+
+
+def result_label(apk_dir: str) -> str:
+    parent = os.path.dirname(os.path.abspath(apk_dir))
+    path = parent
+    while True:
+        name = os.path.basename(path)
+        if name.endswith(RESULT_SUFFIX):
+            return name[:-len(RESULT_SUFFIX)]
+        upper = os.path.dirname(path)
+        if upper == path:
+            return os.path.basename(parent)     #Davranışlı sonuç kökü yoksa üst klasör adı
+        path = upper
+
+
+def _summary_mtime(apk_dir: str) -> float:
+    try:
+        return os.path.getmtime(os.path.join(apk_dir, "summary.json"))
+    except OSError:
+        return 0.0
+
+
+def result_dirs(results_root: str):
+    """(etiket, apk_klasörü) çiftleri; her (etiket, APK adı) için tek klasör.
+
+    Aynı APK bir etiketin altında birden fazla klasördeyse (ör. Popular_result_davranisli/Popular_result/
+    altındaki eski yeniden analizler) en üst düzeydeki, eşitlikte summary.json’u en yeni olan seçilir.
+    """
+    chosen = {}
+    for apk_dir in apk_dirs(results_root):
+        key = (result_label(apk_dir), os.path.basename(apk_dir))
+        rank = (-os.path.normpath(apk_dir).count(os.sep), _summary_mtime(apk_dir))
+        if key not in chosen or rank > chosen[key][0]:
+            chosen[key] = (rank, apk_dir)
+    for (label, _), (_, apk_dir) in chosen.items():
+        yield label, apk_dir
+
+# =========================
+# MAIN
+# =========================
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Sonuç dizinleri için manifest.jsonl üretir / özetler")
+    parser.add_argument("out_dirs", nargs="+", help="Analiz çıktı dizinleri")
+    parser.add_argument("--rebuild", action="store_true", help="Manifest’i klasörlerden yeniden üret")
+    args = parser.parse_args(argv)
+
+    for out_dir in args.out_dirs:
+        if args.rebuild:
+            print(f"[✓] {out_dir}: {rebuild_manifest(out_dir)} kayıt yazıldı")
+            continue
+        states = {}
+        for record in load_manifest(out_dir).values():
+            states[record.get("state")] = states.get(record.get("state"), 0) + 1
+        print(f"[*] {out_dir}: {states}")
+
+if __name__ == "__main__":
+    main()
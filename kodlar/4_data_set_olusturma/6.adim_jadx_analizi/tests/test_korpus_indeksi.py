@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from korpus_indeksi import Query, build_index
+from test_sonuc_deposu import SHA, write_summary
+
+
+class IndexDuplicateTest(unittest.TestCase):
+    """Popular_result_davranisli/Popular_result/<SHA>/ eski kopyası ayrı doc olmamalı."""
+
+    def test_nested_copy_is_one_doc(self):
+        with tempfile.TemporaryDirectory() as root:
+            label_root = os.path.join(root, "Popular_result_davranisli")
+            write_summary(os.path.join(label_root, SHA), analysis_state="complete")
+            write_summary(os.path.join(label_root, "Popular_result", SHA), analysis_state="complete")
+            write_summary(os.path.join(root, "Malware_result_davranisli", "B" * 64), analysis_state="complete")
+            index = build_index([root, os.path.join(label_root, "Popular_result")], with_raw=False)
+        self.assertEqual(len(index["docs"]), 2)
+        self.assertEqual(bin(Query(index).evaluate("set:Popular")).count("1"), 1)
+
+
+class QuerySyntaxTest(unittest.TestCase):
+    def setUp(self):
+        self.query = Query({"docs": [{}, {}], "terms": {"set:A": 0b01, "set:B": 0b10}})
+
+    def test_operators(self):
+        self.assertEqual(self.query.evaluate("set:A | set:B"), 0b11)
+        self.assertEqual(self.query.evaluate("NOT set:A"), 0b10)
+        self.assertEqual(self.query.evaluate("set:A set:B"), 0)
+
+    def test_operator_is_not_a_term(self):
+        for expression in ("AND", "set:A AND", "set:A OR", "NOT", "set:A AND AND set:B", "()"):
+            with self.assertRaises(ValueError, msg=expression):
+                self.query.evaluate(expression)
+
+if __name__ == "__main__":
+    unittest.main()
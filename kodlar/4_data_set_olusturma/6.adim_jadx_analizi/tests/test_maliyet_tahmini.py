@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from maliyet_tahmini import DEX_RATIO_DEFAULT, history_samples
+from sonuc_deposu import append_manifest, manifest_record, rebuild_manifest
+from test_sonuc_deposu import write_summary
+
+
+def summary(apk_name, status="ok", duration=10.0, apk_size=1000, dex_size=400, **jadx):
+    return {"apk_name": apk_name, "sha256": apk_name, "analysis_state": "complete",
+            "stats": {"apk_size": apk_size, "dex_size": dex_size},
+            "jadx": {"status": status, "duration_sec": duration, **jadx}}
+
+
+class HistoryFromManifestTest(unittest.TestCase):
+    """Geçmiş örnekleri summary.json yerine manifest.jsonl’den okunmalı."""
+
+    def test_only_fresh_jadx_runs(self):
+        with tempfile.TemporaryDirectory() as out_dir:
+            for record in (summary("a" * 64), summary("b" * 64, status="timeout"),
+                           summary("c" * 64, archive_reused=True), summary("d" * 64, dex_size=None),
+                           summary("e" * 64, status="skipped", duration=0.5)):
+                append_manifest(out_dir, manifest_record(record))
+            #Manifest yeterli olmalı: APK klasörleri/summary.json yok
+            samples = history_samples([out_dir])
+        self.assertEqual(sorted(samples), sorted([(400, 10.0), (int(1000 * DEX_RATIO_DEFAULT), 10.0)]))
+
+    def test_size_hint_fallback(self):
+        with tempfile.TemporaryDirectory() as out_dir:
+            append_manifest(out_dir, manifest_record(summary("a" * 64, dex_size=None)))
+            self.assertEqual(history_samples([out_dir], {"a" * 64: (1000, 123)}), [(123, 10.0)])
+
+    def test_rebuilt_manifest_has_sizes(self):
+        with tempfile.TemporaryDirectory() as out_dir:
+            write_summary(os.path.join(out_dir, "a" * 64), **summary("a" * 64))
+            rebuild_manifest(out_dir)
+            self.assertEqual(history_samples([out_dir]), [(400, 10.0)])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+import os
+import sys
+import json
+import time
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from sonuc_deposu import result_dirs
+
+try:
+    import parquet_aktarici
+except ImportError:                             #pyarrow yoksa yalnızca dizin testleri çalışır
+    parquet_aktarici = None
+
+SHA = "A" * 64
+
+# =========================
+# NESTED DUPLICATES
+# Veriseti düzeni: Popular_result_davranisli/<SHA>/ (güncel) ve
+# Popular_result_davranisli/Popular_result/<SHA>/ (aynı APK’nin eski analizi).
+# =========================
+def write_summary(apk_dir: str, **fields):
+    os.makedirs(apk_dir, exist_ok=True)
+    with open(os.path.join(apk_dir, "summary.json"), "w", encoding="utf-8") as f:
+        json.dump(dict({"apk_name": os.path.basename(apk_dir), "sha256": SHA}, **fields), f)
+
+
+class NestedDuplicateTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = self.tmp.name
+        label_root = os.path.join(self.root, "Popular_result_davranisli")
+        self.top = os.path.join(label_root, SHA)
+        self.nested = os.path.join(label_root, "Popular_result", SHA)
+        write_summary(self.top, analysis_state="complete", source="top")
+        write_summary(self.nested, analysis_state="complete", source="nested")
+        later = time.time() + 60                #Eski kopyanın dosyası daha yeni olsa da üst düzey seçilir
+        os.utime(os.path.join(self.nested, "summary.json"), (later, later))
+        write_summary(os.path.join(self.root, "Malware_result_davranisli", "B" * 64), analysis_state="complete")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_result_dirs_keeps_top_level_copy(self):
+        found = list(result_dirs(self.root))
+        self.assertEqual(sorted(label for label, _ in found), ["Malware", "Popular"])
+        self.assertIn(("Popular", self.top), found)
+
+    def test_result_dirs_prefers_newest_at_same_depth(self):
+        label_root = os.path.join(self.root, "Military_result_davranisli")
+        old, new = os.path.join(label_root, "eski", SHA), os.path.join(label_root, "yeni", SHA)
+        write_summary(old, analysis_state="complete")
+        write_summary(new, analysis_state="complete")
+        os.utime(os.path.join(old, "summary.json"), (time.time() - 3600,) * 2)
+        self.assertEqual(dict(result_dirs(label_root)), {"Military": new})
+
+    @unittest.skipIf(parquet_aktarici is None, "pyarrow kurulu değil")
+    def test_export_has_one_row_per_apk(self):
+        out_dir = os.path.join(self.root, "parquet")
+        _, count = parquet_aktarici.export([self.root], out_dir, with_raw=False)
+        self.assertEqual(count, 2)
+        table = parquet_aktarici.load_corpus(out_dir, ["set", "apk_name", "source"])
+        popular = [s for s, name in zip(table.column("source").to_pylist(), table.column("set").to_pylist())
+                   if name == "Popular"]
+        self.assertEqual(popular, ["top"])
+
+        nested_root = os.path.join(self.root, "Popular_result_davranisli", "Popular_result")
+        self.assertEqual(parquet_aktarici.export([nested_root], out_dir, append=True, with_raw=False), (None, 0))
+
+if __name__ == "__main__":
+    unittest.main()
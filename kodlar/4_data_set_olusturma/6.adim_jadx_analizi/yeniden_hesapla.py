@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+import os
+import json
+import argparse
+
+from APK_inceleme_aciklamali import AST_INDEX, AST_TARGETS_VERSION, merge_hits
+from kutuphane_onekleri import PREFIX_FILE, LibraryIndex, load_prefixes
+from metot_indeksi import INDEX_FILE, load_method_index, hits_from_index
+from ham_ozellik import load_raw_features, write_raw_features
+from sonuc_deposu import write_json_atomic
+
+# =========================
+# RECOMPUTE
+# AST_TARGETS değiştiğinde, --method-index ile analiz edilmiş APK klasörlerinde
+# ast_analysis ve ast_hits_by_file alanlarını JADX çalıştırmadan yeniden üretir.
+# =========================
+def index_dirs(results_root: str):
+    """method_index.json.gz içeren APK klasörlerini döndürür."""
+    for root, dirs, files in os.walk(results_root):
+        if INDEX_FILE in files and "summary.json" in files:
+            dirs.clear()
+            yield root
+
+
+def recompute(apk_dir: str, library_index: LibraryIndex = None, force: bool = False) -> bool:
+    summary_file = os.path.join(apk_dir, "summary.json")
+
+    with open(summary_file, encoding="utf-8") as f:
+        summary = json.load(f)
+    if not force and summary.get("ast_targets_version") == AST_TARGETS_VERSION:
+        return False
+
+    index = load_method_index(apk_dir)
+    java_files = index["files"]
+    results = hits_from_index(index, AST_INDEX)
+
+    #Kütüphane ayrımı yalnızca ilk analizde istenmişse yeniden üretilir.
+    by_origin = summary.get("ast_analysis_by_origin")
+    is_library = None
+    skip_library = False
+    if by_origin is not None and library_index is not None:
+        is_library = [library_index.is_library(p) for p in java_files]
+        skip_library = by_origin.get("library_skipped", False)
+
+    _, ast_summary, ast_files, by_origin = merge_hits(java_files, results, is_library, skip_library)
+
+    raw_features = load_raw_features(apk_dir)
+    raw_features["ast_hits_by_file"] = ast_files
+    write_raw_features(apk_dir, raw_features)
+
+    summary["ast_analysis"] = ast_summary
+    summary["ast_targets_version"] = AST_TARGETS_VERSION
+    if by_origin is not None:
+        summary["ast_analysis_by_origin"] = by_origin
+    write_json_atomic(summary_file, summary)
+    return True
+
+# =========================
+# MAIN
+# =========================
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="AST_TARGETS değişikliğinden sonra ast_analysis alanlarını metot indeksinden yeniden hesaplar")
+    parser.add_argument("results_roots", nargs="+", help="Sonuç dizinleri (ör. Veriseti/3_davranisli_sonuclar)")
+    parser.add_argument("--library-prefixes", default=PREFIX_FILE,
+                        help="ast_analysis_by_origin için kullanılacak önek dosyası")
+    parser.add_argument("--force", action="store_true", help="Güncel sürümdeki klasörleri de yeniden yaz")
+    args = parser.parse_args(argv)
+
+    library_index = LibraryIndex(load_prefixes(args.library_prefixes))
+    updated = skipped = failed = 0
+
+    for results_root in args.results_roots:
+        for apk_dir in index_dirs(results_root):
+            try:
+                if recompute(apk_dir, library_index, args.force):
+                    updated += 1
+                else:
+                    skipped += 1
+            except (OSError, ValueError, KeyError) as e:
+                print(f"[!] {apk_dir}: {e}")
+                failed += 1
+
+    print(f"[✓] Güncellenen: {updated}, güncel: {skipped}, hatalı: {failed} (sürüm {AST_TARGETS_VERSION})")
+
+if __name__ == "__main__":
+    main()